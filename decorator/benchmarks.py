@@ -0,0 +1,227 @@
+# benchmarks.py
+# Micro-benchmarks de las rutas calientes del menú de Starbuzz.
+# Uso: python benchmarks.py [nombre ...]  (sin argumentos corre todos)
+
+import sys
+import time
+import timeit
+import tracemalloc
+
+from beverages import Espresso, Size
+from builder import SIZE_MAP, build_beverage, price_orders
+from condiments import CondimentDecorator, Mocha
+from utils import CONDIMENT_PRICES, calculate_size_based_cost
+
+
+def _report(label: str, seconds: float, number: int) -> float:
+    per_call = seconds / number * 1e9
+    print(f"  {label:<40} {per_call:10.1f} ns/llamada")
+    return per_call
+
+
+def bench_price_catalog(number: int = 500_000) -> None:
+    """
+    Compara el parseo de strings de calculate_size_based_cost contra la
+    búsqueda en el catálogo precalculado CONDIMENT_PRICES.
+    """
+    print("Precio de un condimento (Mocha Venti):")
+    parsed = timeit.timeit(
+        lambda: calculate_size_based_cost(Size.VENTI, "0.20", "0.25", "0.30"),
+        number=number,
+    )
+    catalog = timeit.timeit(
+        lambda: CONDIMENT_PRICES[("mocha", Size.VENTI)], number=number
+    )
+    before = _report("calculate_size_based_cost", parsed, number)
+    after = _report("CONDIMENT_PRICES[(condimento, Size)]", catalog, number)
+    print(f"  ahorro por llamada: {before - after:.1f} ns ({before / after:.1f}x)")
+
+
+def bench_compiled_cost(number: int = 100_000) -> None:
+    """
+    Compara cost() de la cadena de decoradores contra la bebida compilada.
+    """
+    condiments = ["soy", "mocha", "caramel", "mocha", "whip"]
+    chained = build_beverage("darkroast", "grande", condiments)
+    compiled = build_beverage("darkroast", "grande", condiments, compiled=True)
+    print(f"cost() con {len(condiments)} condimentos:")
+    _report("cadena de decoradores", timeit.timeit(chained.cost, number=number), number)
+    _report("CompiledBeverage", timeit.timeit(compiled.cost, number=number), number)
+
+
+def bench_batch_pricing(count: int = 50_000) -> None:
+    """
+    Compara build_beverage + cost() por pedido contra price_orders en lote.
+    """
+    menu = [
+        ("espresso", "tall", []),
+        ("darkroast", "grande", ["mocha", "mocha", "whip"]),
+        ("houseblend", "venti", ["soy", "mocha", "whip"]),
+        ("decaf", "grande", ["milk", "mocha", "soy", "whip", "caramel"]),
+    ]
+    orders = [menu[i % len(menu)] for i in range(count)]
+    print(f"Precio de {count} pedidos:")
+
+    start = time.perf_counter()
+    one_by_one = [build_beverage(*order).cost() for order in orders]
+    _report("build_beverage + cost()", time.perf_counter() - start, count)
+
+    start = time.perf_counter()
+    totals, _ = price_orders(orders)
+    _report("price_orders", time.perf_counter() - start, count)
+    assert totals == one_by_one
+
+
+def _retained(build, orders) -> tuple:
+    """
+    Construye y conserva todos los pedidos (como tickets abiertos) y
+    devuelve (bloques, bytes) que siguen asignados al final.
+    """
+    tracemalloc.start()
+    kept = [build(*order) for order in orders]
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    del kept
+    return sum(s.count for s in stats), sum(s.size for s in stats)
+
+
+def bench_interned(count: int = 100_000) -> None:
+    """
+    Compara objetos y memoria retenidos por 100k pedidos abiertos construidos
+    con build_beverage normal contra el modo internado (flyweight).
+    """
+    menu = [
+        ("espresso", "tall", ["mocha"]),
+        ("darkroast", "grande", ["mocha", "mocha", "whip"]),
+        ("houseblend", "venti", ["soy", "mocha", "whip"]),
+        ("decaf", "grande", ["milk", "mocha", "soy", "whip", "caramel"]),
+    ]
+    orders = [menu[i % len(menu)] for i in range(count)]
+    print(f"Memoria retenida por {count} pedidos abiertos:")
+    for label, build in (
+        ("build_beverage", build_beverage),
+        ("build_beverage(interned=True)", lambda *o: build_beverage(*o, interned=True)),
+    ):
+        blocks, size = _retained(build, orders)
+        print(f"  {label:<40} {blocks:>9} bloques {size / count:8.1f} bytes/pedido")
+
+
+class _UnslottedBeverage:
+    """
+    Bebida como era antes de __slots__: descripción y tamaño en el __dict__
+    de cada instancia.
+    """
+
+    def __init__(self, description: str, size: Size):
+        self.description = description
+        self._size = size
+
+
+class _UnslottedDecorator:
+    """
+    Decorador como era antes de __slots__: la bebida envuelta en el __dict__.
+    """
+
+    def __init__(self, beverage):
+        self._beverage = beverage
+
+
+def _build_unslotted(base: str, size: str, condiments: list):
+    """
+    Misma cadena que build_beverage (base, condimentos y decorador de
+    descripción) con objetos sin __slots__, como referencia del "antes".
+    """
+    beverage = _UnslottedBeverage(base, SIZE_MAP[size])
+    for _ in condiments:
+        beverage = _UnslottedDecorator(beverage)
+    return _UnslottedDecorator(beverage)
+
+
+def bench_memory(count: int = 100_000) -> None:
+    """
+    Bytes retenidos por bebida construida (base sola y con tres condimentos),
+    sin __slots__ (antes) y con __slots__ (build_beverage actual).
+    """
+    print(f"Memoria por bebida construida ({count} bebidas):")
+    for condiments in ([], ["soy", "mocha", "whip"]):
+        orders = [("houseblend", "grande", condiments)] * count
+        label = f"{1 + len(condiments) + 1} objetos por bebida"
+        _, before = _retained(_build_unslotted, orders)
+        _, after = _retained(build_beverage, orders)
+        print(f"  {label:<40} sin slots {before / count:8.1f}   con slots {after / count:8.1f} bytes/bebida")
+
+
+class _RecursiveMocha(CondimentDecorator):
+    """
+    Mocha con el recorrido recursivo de antes de _chain (cada capa llama a
+    la de adentro), como referencia para cadenas cortas.
+    """
+
+    __slots__ = ()
+
+    price_key = "mocha"
+    label = "Mocha"
+
+    def set_size(self, size: Size) -> None:
+        self._beverage.set_size(size)
+
+    def get_size(self) -> Size:
+        return self._beverage.get_size()
+
+    def cost(self):
+        return self._beverage.cost() + self.condiment_cost(self._beverage.get_size())
+
+    def get_description(self) -> str:
+        return self._beverage.get_description() + ", " + self.label
+
+
+def _mocha_chain(mocha_cls, depth: int):
+    beverage = Espresso()
+    for _ in range(depth):
+        beverage = mocha_cls(beverage)
+    return beverage
+
+
+def _per_call(method, number: int) -> float:
+    return min(timeit.repeat(method, number=number, repeat=5)) / number
+
+
+def bench_chain_depth(depths: tuple = (1, 5, 10, 100, 1_000, 10_000), recursive_limit: int = 100) -> None:
+    """
+    Tiempo de cost() y get_description() según la profundidad de la cadena,
+    recorrida con _chain y (hasta recursive_limit capas) recursivamente.
+    """
+    print("Cadena de N condimentos (Mocha), iterativa / recursiva:")
+    for depth in depths:
+        number = max(1, 20_000 // depth)
+        beverage = _mocha_chain(Mocha, depth)
+        cost = _per_call(beverage.cost, number)
+        description = _per_call(beverage.get_description, number)
+        line = f"  N={depth:<6} cost() {cost * 1e6:9.2f} us   get_description() {description * 1e6:9.2f} us"
+        if depth <= recursive_limit:
+            recursive = _mocha_chain(_RecursiveMocha, depth)
+            cost = _per_call(recursive.cost, number)
+            description = _per_call(recursive.get_description, number)
+            line += f"   | recursiva: cost() {cost * 1e6:9.2f} us   get_description() {description * 1e6:9.2f} us"
+        print(line)
+
+
+BENCHMARKS = {
+    "price_catalog": bench_price_catalog,
+    "compiled_cost": bench_compiled_cost,
+    "batch_pricing": bench_batch_pricing,
+    "interned": bench_interned,
+    "memory": bench_memory,
+    "chain_depth": bench_chain_depth,
+}
+
+
+def main(names: list) -> None:
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
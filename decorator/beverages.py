@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 from decimal import Decimal
 from enum import Enum
 
+import menu
+
 
 # --- Enumeración de Tamaños ---
 class Size(Enum):
@@ -17,6 +19,20 @@ class Size(Enum):
     VENTI = "Venti"
 
 
+# --- Precios de las bebidas base ---
+# Se llenan desde el menú (menu.json) y se actualizan en el lugar al recargarlo.
+BASE_PRICES = {}
+
+
+def _load_base_prices(catalog: dict) -> None:
+    prices = {name: Decimal(price) for name, (_, price) in catalog["bases"].items()}
+    BASE_PRICES.clear()
+    BASE_PRICES.update(prices)
+
+
+menu.subscribe(_load_base_prices)
+
+
 # --- Componente Abstracto ---
 class Beverage(ABC):
     """
@@ -24,9 +40,18 @@ class Beverage(ABC):
     definir que es una clase abstracta.
     """
 
+    # Usa __slots__ en lugar de un __dict__ por instancia: la descripción
+    # es una constante de clase y sólo el tamaño vive en cada bebida.
+    __slots__ = ("_size",)
+
+    description = "Bebida Desconocida"
+    DEFAULT_SIZE = Size.TALL  # Tamaño por defecto
+    # Métodos que un decorador resuelve recorriendo la cadena (ninguno en
+    # una bebida base); ver CondimentDecorator._chain
+    _generic = frozenset()
+
     def __init__(self):
-        self.description = "Bebida Desconocida"
-        self._size = Size.TALL  # Tamaño por defecto
+        self._size = self.DEFAULT_SIZE
 
     def get_description(self) -> str:
         """
@@ -55,54 +80,59 @@ class Beverage(ABC):
         pass
 
 
+class MenuBeverage(Beverage):
+    """
+    Bebida base cuyo precio sale del menú: BASE_PRICES[price_key].
+    """
+
+    __slots__ = ()
+
+    price_key = None
+
+    def cost(self) -> Decimal:
+        return BASE_PRICES[self.price_key]
+
+
 # --- Componentes Concretos ---
-class HouseBlend(Beverage):
+class HouseBlend(MenuBeverage):
     """
     Café de la casa, un tipo específico de bebida.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.description = "Café de la Casa"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        return Decimal("0.89")
+    description = "Café de la Casa"
+    price_key = "houseblend"
 
 
-class DarkRoast(Beverage):
+class DarkRoast(MenuBeverage):
     """
     Café Dark Roast, un tipo específico de bebida.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.description = "Café Dark Roast"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        return Decimal("0.99")
+    description = "Café Dark Roast"
+    price_key = "darkroast"
 
 
-class Decaf(Beverage):
+class Decaf(MenuBeverage):
     """
     Café Descafeinado, un tipo específico de bebida.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.description = "Café Descafeinado"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        return Decimal("1.05")
+    description = "Café Descafeinado"
+    price_key = "decaf"
 
 
-class Espresso(Beverage):
+class Espresso(MenuBeverage):
     """
     Café Espresso, un tipo específico de bebida.
     """
 
-    def __init__(self):
-        super().__init__()
-        self.description = "Espresso"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        return Decimal("1.99")
+    description = "Espresso"
+    price_key = "espresso"
@@ -1,48 +1,299 @@
 # builder.py
 # Implementa una función builder/factory para armar bebidas decoradas fácilmente.
 
-from beverages import Beverage, Size, Espresso, DarkRoast, HouseBlend, Decaf
-from condiments import Milk, Mocha, Soy, Whip, Caramel, PrettyDescriptionDecorator
-
-# Mapeo de nombres de base y condimentos a clases
-BASES = {
-    "espresso": Espresso,
-    "darkroast": DarkRoast,
-    "houseblend": HouseBlend,
-    "decaf": Decaf,
-}
-
-CONDIMENTS = {
-    "milk": Milk,
-    "mocha": Mocha,
-    "soy": Soy,
-    "whip": Whip,
-    "caramel": Caramel,
-}
-
-SIZE_MAP = {
-    "tall": Size.TALL,
-    "grande": Size.GRANDE,
-    "venti": Size.VENTI,
-}
-
-
-def build_beverage(base: str, size: str = "tall", condiments: list = None) -> Beverage:
+import weakref
+from array import array
+from collections.abc import Mapping
+from decimal import Decimal
+from operator import mul
+
+import menu
+from beverages import BASE_PRICES, Beverage, DarkRoast, Decaf, Espresso, HouseBlend, MenuBeverage, Size
+from condiments import (
+    Caramel,
+    CondimentDecorator,
+    Milk,
+    Mocha,
+    PrettyDescriptionDecorator,
+    Soy,
+    Whip,
+    compile_beverage,
+)
+from utils import CONDIMENT_PRICES
+
+
+class MenuClasses(Mapping):
+    """
+    Mapeo nombre -> clase para una sección del menú (bases o condimentos).
+    Las clases se generan recién la primera vez que se piden, así el
+    arranque no crea clases para todo el menú.
+    """
+
+    def __init__(self, make_class):
+        self._make_class = make_class
+        self._entries = {}
+        self._classes = {}
+
+    def load(self, entries: dict) -> None:
+        """
+        Reemplaza las entradas del menú y descarta las clases ya generadas.
+        """
+        self._entries = entries
+        self._classes = {}
+
+    def __getitem__(self, name: str) -> type:
+        cls = self._classes.get(name)
+        if cls is None:
+            cls = self._make_class(name, self._entries[name])
+            self._classes[name] = cls
+        return cls
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _class_name(name: str) -> str:
+    return "".join(part.capitalize() for part in name.replace("-", "_").split("_"))
+
+
+# Clases escritas a mano, por price_key: el menú las reutiliza si coinciden
+_KNOWN_BASES = {cls.price_key: cls for cls in (HouseBlend, DarkRoast, Decaf, Espresso)}
+_KNOWN_CONDIMENTS = {cls.price_key: cls for cls in (Milk, Mocha, Soy, Whip, Caramel)}
+
+
+def _menu_class(resolve, name: str, parent: type, attrs: dict) -> type:
+    """
+    Genera la clase de una entrada del menú. La clase no existe como nombre
+    de módulo, así que sus instancias se pickean por entrada del menú:
+    al cargarlas se usa la clase de esa entrada en el menú activo.
+    """
+    def __reduce_ex__(self, protocol):
+        return (_menu_instance, (resolve, name), self.__getstate__())
+
+    return type(
+        _class_name(name),
+        (parent,),
+        {"__slots__": (), "__module__": __name__, "price_key": name, "__reduce_ex__": __reduce_ex__, **attrs},
+    )
+
+
+def _menu_instance(resolve, name: str):
+    cls = resolve(name)
+    return cls.__new__(cls)
+
+
+def _make_base_class(name: str, entry: tuple) -> type:
+    """
+    Clase para una bebida base del menú: la escrita a mano si la hay y su
+    descripción coincide; si no, una subclase generada (de la escrita a mano
+    si existe, para que isinstance siga valiendo).
+    """
+    description, _ = entry
+    known = _KNOWN_BASES.get(name)
+    if known is not None and known.description == description:
+        return known
+    return _menu_class(_resolve_base, name, known or MenuBeverage, {"description": description})
+
+
+def _make_condiment_class(name: str, entry: tuple) -> type:
+    """
+    Igual que _make_base_class, para condimentos (compara la etiqueta).
+    """
+    label, _ = entry
+    known = _KNOWN_CONDIMENTS.get(name)
+    if known is not None and known.label == label:
+        return known
+    return _menu_class(_resolve_condiment, name, known or CondimentDecorator, {"label": label})
+
+
+# Mapeo de nombres de base y condimentos a clases (según el menú activo)
+BASES = MenuClasses(_make_base_class)
+CONDIMENTS = MenuClasses(_make_condiment_class)
+
+SIZE_MAP = {size.value.lower(): size for size in Size}
+
+
+def _resolve_base(base: str):
+    base_cls = BASES.get(base.lower())
+    if not base_cls:
+        raise ValueError(f"Bebida base desconocida: {base}")
+    return base_cls
+
+
+def _resolve_condiment(cond: str):
+    cond_cls = CONDIMENTS.get(cond.lower())
+    if not cond_cls:
+        raise ValueError(f"Condimento desconocido: {cond}")
+    return cond_cls
+
+
+def build_beverage(
+    base: str,
+    size: str = "tall",
+    condiments: list = None,
+    compiled: bool = False,
+    interned: bool = False,
+) -> Beverage:
     """
     Construye una bebida decorada a partir de los parámetros.
     base: nombre de la bebida base (str)
     size: tamaño (str: 'tall', 'grande', 'venti')
     condiments: lista de nombres de condimentos (str)
+    compiled: si es True, devuelve la cadena aplanada en una CompiledBeverage
+    interned: si es True, devuelve una FrozenBeverage compartida por todos
+        los pedidos con la misma configuración
     """
-    base_cls = BASES.get(base.lower())
-    if not base_cls:
-        raise ValueError(f"Bebida base desconocida: {base}")
-    beverage = base_cls()
+    if interned:
+        return _interned_beverage(base, size, condiments)
+    beverage = _resolve_base(base)()
     beverage.set_size(SIZE_MAP.get(size.lower(), Size.TALL))
     if condiments:
         for cond in condiments:
-            cond_cls = CONDIMENTS.get(cond.lower())
-            if not cond_cls:
-                raise ValueError(f"Condimento desconocido: {cond}")
-            beverage = cond_cls(beverage)
-    return PrettyDescriptionDecorator(beverage)
+            beverage = _resolve_condiment(cond)(beverage)
+    beverage = PrettyDescriptionDecorator(beverage)
+    if compiled:
+        return compile_beverage(beverage)
+    return beverage
+
+
+# --- Bebidas internadas (flyweight) ---
+# Registro débil: una configuración que ya nadie usa se libera sola.
+_INTERNED = weakref.WeakValueDictionary()
+
+
+def _interned_beverage(base: str, size: str, condiments: list) -> Beverage:
+    """
+    Devuelve la instancia compartida para (base, tamaño, condimentos).
+    Los condimentos se cuentan en orden de primera aparición: ese orden
+    junto con las cantidades determina tanto el costo como la descripción
+    agrupada, así que "mocha, soy, mocha" y "mocha, mocha, soy" comparten
+    la misma bebida.
+    """
+    _resolve_base(base)
+    counts = {}
+    for cond in condiments or ():
+        _resolve_condiment(cond)
+        counts[cond.lower()] = counts.get(cond.lower(), 0) + 1
+    key = (base.lower(), SIZE_MAP.get(size.lower(), Size.TALL), tuple(counts.items()))
+
+    beverage = _INTERNED.get(key)
+    if beverage is None:
+        canonical = [name for name, count in counts.items() for _ in range(count)]
+        chain = build_beverage(key[0], key[1].value, canonical)
+        beverage = compile_beverage(chain, frozen=True)
+        _INTERNED[key] = beverage
+    return beverage
+
+
+# --- Precios por lote ---
+# Tablas en centavos enteros para sumar sin crear objetos Decimal por pedido.
+_SIZES = list(Size)
+_SIZE_INDEX = {size: i for i, size in enumerate(_SIZES)}
+_CONDIMENT_NAMES = []
+_BASE_CENTS = {}
+# Fila por tamaño, columna por condimento: [size_idx * n + cond_idx]
+_CONDIMENT_CENTS = array("q")
+
+
+def _load_menu(catalog: dict) -> None:
+    """
+    Rearma las clases y tablas derivadas del menú (al importar y al recargar).
+    Las tablas nuevas se calculan completas antes de reemplazar las activas.
+    """
+    names = list(catalog["condiments"])
+    base_cents = {name: int(BASE_PRICES[name] * 100) for name in catalog["bases"]}
+    condiment_cents = array(
+        "q",
+        [
+            int(CONDIMENT_PRICES[(name, size)] * 100)
+            for size in _SIZES
+            for name in names
+        ],
+    )
+    BASES.load(catalog["bases"])
+    CONDIMENTS.load(catalog["condiments"])
+    _INTERNED.clear()
+    _CONDIMENT_NAMES[:] = names
+    _BASE_CENTS.clear()
+    _BASE_CENTS.update(base_cents)
+    _CONDIMENT_CENTS[:] = condiment_cents
+
+
+menu.subscribe(_load_menu)
+
+
+def check_order(base, size, condiments) -> tuple:
+    """
+    Verifica los tipos de un pedido: base y tamaño texto, condimentos una
+    lista (o tupla) de textos. Lanza ValueError si alguno no lo es.
+    """
+    if not isinstance(base, str):
+        raise ValueError(f"base debe ser texto, no {type(base).__name__}")
+    if not isinstance(size, str):
+        raise ValueError(f"size debe ser texto, no {type(size).__name__}")
+    if not isinstance(condiments, (list, tuple)) or not all(isinstance(c, str) for c in condiments):
+        raise ValueError("condiments debe ser una lista de textos")
+    return base, size, condiments
+
+
+def price_orders(orders) -> tuple:
+    """
+    Calcula el total de muchos pedidos de una sola vez.
+    orders: iterable de tuplas (base, size, condiments) como en build_beverage
+
+    Los pedidos se codifican en arreglos de centavos (base, tamaño y
+    cantidad de cada condimento) y los totales se calculan en una única
+    pasada, sin armar la cadena de decoradores.
+
+    Devuelve (totals, errors): totals tiene un Decimal por pedido (None si
+    el pedido es inválido) y errors mapea el índice del pedido al ValueError
+    que hubiera lanzado build_beverage. Las filas mal formadas (otro largo,
+    campos de tipo incorrecto) también se reportan en errors.
+    """
+    n = len(_CONDIMENT_NAMES)
+    column = {name: j for j, name in enumerate(_CONDIMENT_NAMES)}
+    base_cents = array("q")
+    size_idx = array("q")
+    counts = array("q")
+    errors = {}
+
+    # Codificación: una fila por pedido
+    for i, order in enumerate(orders):
+        row = [0] * n
+        try:
+            try:
+                base, size, condiments = order
+            except (TypeError, ValueError):
+                raise ValueError(f"Pedido ilegible: {order!r}") from None
+            base, size, condiments = check_order(base, size, condiments or [])
+            cents = _BASE_CENTS.get(base.lower())
+            if cents is None:
+                _resolve_base(base)  # lanza el mismo error que build_beverage
+            for cond in condiments or ():
+                j = column.get(cond.lower())
+                if j is None:
+                    _resolve_condiment(cond)
+                row[j] += 1
+        except ValueError as exc:
+            errors[i] = exc
+            base_cents.append(0)
+            size_idx.append(0)
+            counts.extend([0] * n)
+            continue
+        base_cents.append(cents)
+        size_idx.append(_SIZE_INDEX[SIZE_MAP.get(size.lower(), Size.TALL)])
+        counts.extend(row)
+
+    # Totales: base + producto escalar (cantidades x precios del tamaño)
+    totals = []
+    for i, cents in enumerate(base_cents):
+        if i in errors:
+            totals.append(None)
+            continue
+        prices = _CONDIMENT_CENTS[size_idx[i] * n : (size_idx[i] + 1) * n]
+        cents += sum(map(mul, counts[i * n : (i + 1) * n], prices))
+        totals.append(Decimal(cents).scaleb(-2))
+    return totals, errors
@@ -1,11 +1,14 @@
 # condiments.py
 # Contiene el Decorador Abstracto y los Decoradores Concretos.
 
-from abc import ABC, abstractmethod
+from abc import ABC
 from decimal import Decimal
+from functools import lru_cache
 
 from beverages import Beverage, Size
-from utils import calculate_size_based_cost
+from utils import CONDIMENT_PRICES
+
+_NO_COST = Decimal("0")
 
 
 # --- Decorador Abstracto ---
@@ -16,24 +19,100 @@ class CondimentDecorator(Beverage, ABC):
     Mantiene una referencia a la bebida que está envolviendo.
     """
 
+    __slots__ = ("_beverage",)
+
+    # Clave del condimento en el catálogo de precios (None = no agrega costo)
+    price_key = None
+    # Texto que el condimento agrega a la descripción (None = no agrega texto)
+    label = None
+
     def __init__(self, beverage: Beverage):
         self._beverage = beverage
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._generic = _generic_methods(cls)
+
+    def _chain(self, method: str) -> tuple:
+        """
+        Punto de entrada único para recorrer la cadena sin recursión.
+        Avanza desde este decorador hacia adentro mientras las capas usen la
+        implementación genérica de `method` y devuelve (capas, componente):
+        las capas de afuera hacia adentro y el primer componente que tiene
+        su propia implementación (la bebida base u otro decorador, p. ej. el
+        de presentación). Así la profundidad sólo está limitada por memoria.
+        Qué métodos son genéricos se calcula una vez por clase (_generic).
+        """
+        layers = [self]
+        append = layers.append
+        component = self._beverage
+        while method in component._generic:
+            append(component)
+            component = component._beverage
+        return layers, component
+
     def set_size(self, size: Size) -> None:
         """
         Propaga la operación de establecer tamaño al componente envuelto.
         """
-        self._beverage.set_size(size)
+        self._chain("set_size")[1].set_size(size)
 
     def get_size(self) -> Size:
         """
         Delega la consulta de tamaño al componente envuelto.
         """
-        return self._beverage.get_size()
+        return self._chain("get_size")[1].get_size()
+
+    def condiment_cost(self, size: Size) -> Decimal:
+        """
+        Devuelve el costo que este decorador agrega para el tamaño dado,
+        tomado del catálogo de precios. Los decoradores sin price_key
+        (p. ej. los de presentación) no agregan costo.
+        """
+        if self.price_key is None:
+            return _NO_COST
+        return CONDIMENT_PRICES[(self.price_key, size)]
+
+    def cost(self) -> Decimal:
+        """
+        Costo del componente envuelto más el aporte de cada condimento,
+        sumado de adentro hacia afuera como en la cadena original.
+        """
+        layers, component = self._chain("cost")
+        total = component.cost()
+        size = component.get_size()
+        for layer in reversed(layers):
+            total += layer.condiment_cost(size)
+        return total
 
-    @abstractmethod
     def get_description(self) -> str:
-        pass
+        """
+        Descripción del componente envuelto seguida de las etiquetas de
+        cada condimento, de adentro hacia afuera.
+        """
+        layers, component = self._chain("get_description")
+        items = [component.get_description()]
+        for layer in reversed(layers):
+            if layer.label:
+                items.append(layer.label)
+        return ", ".join(items)
+
+
+# Métodos que CondimentDecorator resuelve recorriendo la cadena con _chain
+_CHAIN_METHODS = ("set_size", "get_size", "cost", "get_description")
+
+
+def _generic_methods(cls) -> frozenset:
+    """
+    Métodos de la cadena que `cls` hereda sin redefinir de CondimentDecorator.
+    """
+    return frozenset(
+        name for name in _CHAIN_METHODS
+        if getattr(cls, name) is getattr(CondimentDecorator, name)
+    )
+
+
+CondimentDecorator._generic = _generic_methods(CondimentDecorator)
 
 
 # --- Decoradores Concretos ---
@@ -42,13 +121,10 @@ class Milk(CondimentDecorator):
     Decorador para añadir Leche a una bebida.
     """
 
-    def get_description(self) -> str:
-        return self._beverage.get_description() + ", Leche"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        size = self._beverage.get_size()
-        milk_cost = calculate_size_based_cost(size, "0.10", "0.15", "0.20")
-        return self._beverage.cost() + milk_cost
+    price_key = "milk"
+    label = "Leche"
 
 
 class Mocha(CondimentDecorator):
@@ -56,13 +132,10 @@ class Mocha(CondimentDecorator):
     Decorador para añadir Mocha a una bebida.
     """
 
-    def get_description(self) -> str:
-        return self._beverage.get_description() + ", Mocha"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        size = self._beverage.get_size()
-        mocha_cost = calculate_size_based_cost(size, "0.20", "0.25", "0.30")
-        return self._beverage.cost() + mocha_cost
+    price_key = "mocha"
+    label = "Mocha"
 
 
 class Soy(CondimentDecorator):
@@ -71,13 +144,10 @@ class Soy(CondimentDecorator):
     El costo depende del tamaño de la bebida.
     """
 
-    def get_description(self) -> str:
-        return self._beverage.get_description() + ", Soja"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        size = self._beverage.get_size()
-        soy_cost = calculate_size_based_cost(size, "0.10", "0.15", "0.20")
-        return self._beverage.cost() + soy_cost
+    price_key = "soy"
+    label = "Soja"
 
 
 class Whip(CondimentDecorator):
@@ -85,13 +155,10 @@ class Whip(CondimentDecorator):
     Decorador para añadir Crema a una bebida.
     """
 
-    def get_description(self) -> str:
-        return self._beverage.get_description() + ", Crema"
+    __slots__ = ()
 
-    def cost(self) -> Decimal:
-        size = self._beverage.get_size()
-        whip_cost = calculate_size_based_cost(size, "0.10", "0.15", "0.20")
-        return self._beverage.cost() + whip_cost
+    price_key = "whip"
+    label = "Crema"
 
 
 class Caramel(CondimentDecorator):
@@ -99,13 +166,42 @@ class Caramel(CondimentDecorator):
     Decorador para añadir Caramelo a una bebida.
     """
 
-    def get_description(self) -> str:
-        return self._beverage.get_description() + ", Caramelo"
+    __slots__ = ()
+
+    price_key = "caramel"
+    label = "Caramelo"
 
-    def cost(self) -> Decimal:
-        size = self._beverage.get_size()
-        caramel_cost = calculate_size_based_cost(size, "0.20", "0.25", "0.30")
-        return self._beverage.cost() + caramel_cost
+
+@lru_cache(maxsize=1024)
+def _group_description(base_description: str, labels: tuple) -> str:
+    """
+    Agrupa los condimentos repetidos de una descripción, p. ej.
+    ("Café", ("Mocha", "Mocha", "Crema")) -> "Café, Double Mocha, Crema".
+    El resultado depende sólo de la base y de la secuencia de condimentos,
+    así que se comparte entre todas las bebidas en un LRU acotado.
+    """
+    # Divide los condimentos en una lista
+    items = base_description.split(", ") + list(labels)
+
+    # Cuenta las repeticiones de cada condimento
+    counts = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+
+    # Reconstruye la descripción agrupando repeticiones
+    grouped_description = []
+    for item, count in counts.items():
+        if count == 1:
+            grouped_description.append(item)
+        elif count == 2:
+            grouped_description.append(f"Double {item}")
+        elif count == 3:
+            grouped_description.append(f"Triple {item}")
+        else:
+            grouped_description.append(f"{count}x {item}")
+
+    # Une los elementos agrupados en una nueva descripción
+    return ", ".join(grouped_description)
 
 
 class PrettyDescriptionDecorator(CondimentDecorator):
@@ -114,33 +210,88 @@ class PrettyDescriptionDecorator(CondimentDecorator):
     Por ejemplo, convierte "Mocha, Mocha, Whip" en "Double Mocha, Whip".
     """
 
+    __slots__ = ()
+
     def get_description(self) -> str:
-        # Obtén la descripción original
-        original_description = self._beverage.get_description()
-
-        # Divide los condimentos en una lista
-        items = original_description.split(", ")
-
-        # Cuenta las repeticiones de cada condimento
-        counts = {}
-        for item in items:
-            counts[item] = counts.get(item, 0) + 1
-
-        # Reconstruye la descripción agrupando repeticiones
-        grouped_description = []
-        for item, count in counts.items():
-            if count == 1:
-                grouped_description.append(item)
-            elif count == 2:
-                grouped_description.append(f"Double {item}")
-            elif count == 3:
-                grouped_description.append(f"Triple {item}")
-            else:
-                grouped_description.append(f"{count}x {item}")
-
-        # Une los elementos agrupados en una nueva descripción
-        return ", ".join(grouped_description)
+        # Junta las etiquetas de los condimentos hasta llegar a un componente
+        # con descripción propia (la bebida base u otro decorador de
+        # presentación), del que se usa su descripción.
+        layers, component = self._chain("get_description")
+        labels = []
+        for layer in reversed(layers):
+            if layer.label:
+                labels.append(layer.label)
+        return _group_description(component.get_description(), tuple(labels))
+
+    @staticmethod
+    def cache_info():
+        """
+        Devuelve los aciertos/fallos del caché de descripciones agrupadas.
+        """
+        return _group_description.cache_info()
+
+    @staticmethod
+    def cache_clear() -> None:
+        """
+        Vacía el caché de descripciones agrupadas.
+        """
+        _group_description.cache_clear()
+
+
+# --- Bebida compilada ---
+class CompiledBeverage(Beverage):
+    """
+    Versión "aplanada" de una cadena de decoradores.
+    Guarda la descripción ya resuelta y el precio total por tamaño, de modo
+    que cost() es una única búsqueda en lugar de recorrer toda la cadena.
+    """
+
+    # La descripción es por instancia; __weakref__ permite internarla.
+    __slots__ = ("description", "_prices", "__weakref__")
+
+    def __init__(self, description: str, size: Size, prices: dict):
+        super().__init__()
+        self.description = description
+        self._size = size
+        self._prices = prices  # Size -> Decimal (base + condimentos)
 
     def cost(self) -> Decimal:
-        # No modifica el costo; delega al componente envuelto
-        return self._beverage.cost()
+        return self._prices[self._size]
+
+
+class FrozenBeverage(CompiledBeverage):
+    """
+    Bebida compilada inmutable. Se puede compartir entre varios pedidos
+    (flyweight) porque nadie puede cambiarle el tamaño.
+    """
+
+    __slots__ = ()
+
+    def set_size(self, size: Size) -> None:
+        raise TypeError("Una bebida internada es inmutable; no se puede cambiar su tamaño")
+
+
+def compile_beverage(beverage: Beverage, frozen: bool = False) -> CompiledBeverage:
+    """
+    Recorre la cadena de decoradores una sola vez y la reduce a un precio
+    base más un vector de condimentos por tamaño.
+    Las sumas se hacen en el mismo orden que la cadena (de adentro hacia
+    afuera), así el resultado es idéntico al de los decoradores encadenados.
+    Con frozen=True devuelve una FrozenBeverage inmutable.
+    """
+    layers = []
+    component = beverage
+    while isinstance(component, CondimentDecorator):
+        layers.append(component)
+        component = component._beverage
+
+    base_cost = component.cost()
+    prices = {}
+    for size in Size:
+        total = base_cost
+        for layer in reversed(layers):
+            total += layer.condiment_cost(size)
+        prices[size] = total
+
+    compiled_cls = FrozenBeverage if frozen else CompiledBeverage
+    return compiled_cls(beverage.get_description(), beverage.get_size(), prices)
@@ -1,11 +1,113 @@
 # main.py
 # Script principal para probar el patrón Decorator.
+# Sin argumentos corre la demo; con un archivo de pedidos (o "-" para stdin)
+# procesa el flujo de pedidos y escribe un ticket por línea:
+#   python main.py pedidos.jsonl
+#   python main.py pedidos.csv -o tickets.txt
+#   cat pedidos.jsonl | python main.py -
+# Con --summary escribe sólo el resumen (total y recaudación por condimento);
+# --workers N reparte el archivo entre N procesos con el mismo resultado:
+#   python main.py historial.jsonl --summary --workers 4
+# --menu usa otro catálogo de bebidas y precios (JSON o TOML) en vez de menu.json.
+
+import argparse
+import sys
+import time
+
+import menu
+
+try:
+    import resource
+except ImportError:  # Windows no tiene el módulo resource
+    resource = None
 
 from beverages import Size
 from builder import build_beverage
+from orders import read_orders, stream_orders
+from reprice import reprice_file, summarize_orders
 
 
-def main():
+def peak_rss_kb():
+    """
+    Pico de memoria residente del proceso en KiB (None si no se puede medir).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(description="Starbuzz Coffee")
+    parser.add_argument(
+        "orders", nargs="?", help="archivo de pedidos (.jsonl o .csv), '-' para stdin"
+    )
+    parser.add_argument("-o", "--output", help="archivo de tickets (por defecto stdout)")
+    parser.add_argument(
+        "-f", "--format", choices=("jsonl", "csv"), help="formato de los pedidos"
+    )
+    parser.add_argument("-m", "--menu", help="archivo del menú (JSON o TOML)")
+    parser.add_argument(
+        "--summary", action="store_true", help="escribir sólo el resumen de totales"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="procesos para --summary"
+    )
+    args = parser.parse_args(argv)
+    if args.workers > 1 and not args.summary:
+        parser.error("--workers sólo se puede usar con --summary")
+    if args.workers > 1 and args.orders == "-":
+        parser.error("--workers necesita un archivo, no stdin")
+    if args.menu:
+        menu.load_menu(args.menu)
+
+    if args.orders is None:
+        run_demo()
+        return
+
+    fmt = args.format or ("csv" if args.orders.endswith(".csv") else "jsonl")
+    out = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        if args.summary and args.orders != "-":
+            totals = reprice_file(args.orders, fmt, args.workers)
+            out.write(totals.render())
+            count = totals.orders
+        else:
+            source = (
+                sys.stdin
+                if args.orders == "-"
+                else open(args.orders, encoding="utf-8", newline="")
+            )
+            try:
+                if args.summary:
+                    totals = summarize_orders(read_orders(source, fmt))
+                    out.write(totals.render())
+                    count = totals.orders
+                else:
+                    count = stream_orders(source, out, fmt)
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    rss = peak_rss_kb()
+    rss_text = "N/A" if rss is None else f"{rss} KiB"
+    throughput = count / elapsed if elapsed else 0
+    print(
+        f"{count} pedidos en {elapsed:.2f} s ({throughput:.0f} pedidos/s), "
+        f"pico de RSS: {rss_text}",
+        file=sys.stderr,
+    )
+
+
+def run_demo():
     """
     Función principal que simula la preparación de cafés en Starbuzz.
     """
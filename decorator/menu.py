@@ -0,0 +1,172 @@
+# menu.py
+# Catálogo del menú (bebidas base, condimentos y precios por tamaño) leído
+# desde un archivo JSON o TOML en lugar de estar escrito en el código.
+#
+# Los módulos que arman tablas a partir del menú se suscriben con
+# subscribe(); cuando el archivo cambia, reload_menu() vuelve a leerlo y
+# les avisa, sin reiniciar el proceso.
+
+import json
+import marshal
+import os
+from decimal import Decimal, InvalidOperation
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+DEFAULT_MENU_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "menu.json")
+
+# Tamaños en el orden en que se guardan los precios de cada condimento
+SIZE_NAMES = ("tall", "grande", "venti")
+
+_CACHE_VERSION = 2
+
+_active = {"path": None, "stamp": None, "catalog": None}
+_listeners = []
+
+
+def _stamp(path: str) -> tuple:
+    info = os.stat(path)
+    return (info.st_mtime_ns, info.st_size)
+
+
+def _cache_path(path: str) -> str:
+    directory, name = os.path.split(path)
+    return os.path.join(directory, "__pycache__", name + ".marshal")
+
+
+def _price(value, where: str) -> str:
+    """
+    Valida un precio del menú: un monto no negativo con a lo sumo dos
+    decimales. Lo devuelve como string (para Decimal).
+    """
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(f"Menú inválido: precio de {where} no es un número: {value!r}")
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"Menú inválido: precio de {where} no es un número: {value!r}") from None
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"Menú inválido: precio de {where} fuera de rango: {value!r}")
+    if amount.as_tuple().exponent < -2:
+        raise ValueError(f"Menú inválido: precio de {where} con más de dos decimales: {value!r}")
+    return str(amount)
+
+
+def parse_catalog(raw: dict) -> dict:
+    """
+    Valida y normaliza un catálogo ya parseado:
+    {"bases": {nombre: (descripción, precio)},
+     "condiments": {nombre: (etiqueta, (tall, grande, venti))}}
+    Los nombres quedan en minúsculas y los precios como strings (para Decimal).
+    Un precio que no es un monto válido con centavos lanza ValueError.
+    """
+    try:
+        bases = {
+            name.lower(): (str(entry["description"]), _price(entry["price"], name))
+            for name, entry in raw["bases"].items()
+        }
+        condiments = {
+            name.lower(): (
+                str(entry["label"]),
+                tuple(_price(entry["prices"][size], f"{name} ({size})") for size in SIZE_NAMES),
+            )
+            for name, entry in raw["condiments"].items()
+        }
+    except (KeyError, TypeError, AttributeError) as exc:
+        raise ValueError(f"Menú inválido: falta {exc}") from exc
+    return {"bases": bases, "condiments": condiments}
+
+
+def load_catalog(path: str) -> dict:
+    """
+    Lee el catálogo de `path`. El resultado normalizado se guarda en binario
+    (marshal) en __pycache__ y se reutiliza mientras el archivo no cambie.
+    """
+    stamp = _stamp(path)
+    cache = _cache_path(path)
+    try:
+        with open(cache, "rb") as f:
+            version, cached_stamp, catalog = marshal.load(f)
+        if version == _CACHE_VERSION and tuple(cached_stamp) == stamp:
+            return catalog
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("Leer un menú TOML requiere Python 3.11 o superior")
+        with open(path, "rb") as f:
+            raw = tomllib.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    catalog = parse_catalog(raw)
+
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(cache, "wb") as f:
+            marshal.dump((_CACHE_VERSION, stamp, catalog), f)
+    except OSError:
+        pass  # Sin caché si el directorio no se puede escribir
+    return catalog
+
+
+def current_catalog() -> dict:
+    """
+    Devuelve el catálogo activo (carga el menú por defecto la primera vez).
+    """
+    if _active["catalog"] is None:
+        load_menu()
+    return _active["catalog"]
+
+
+def active_menu_path() -> str:
+    """
+    Ruta del archivo del menú activo.
+    """
+    return _active["path"] or DEFAULT_MENU_PATH
+
+
+def subscribe(callback) -> None:
+    """
+    Registra callback(catalog): se llama ahora con el catálogo activo y de
+    nuevo cada vez que el menú se carga o recarga.
+    """
+    _listeners.append(callback)
+    callback(current_catalog())
+
+
+def load_menu(path: str = None) -> dict:
+    """
+    Activa el menú de `path` (por defecto menu.json) y avisa a los suscriptos.
+    El menú queda activo sólo si todos los suscriptos lo aceptan; si alguno
+    falla, los que ya lo habían tomado vuelven al menú anterior.
+    """
+    path = path or DEFAULT_MENU_PATH
+    catalog = load_catalog(path)
+    previous = _active["catalog"]
+    for done, callback in enumerate(_listeners):
+        try:
+            callback(catalog)
+        except Exception:
+            if previous is not None:
+                for applied in _listeners[:done]:
+                    applied(previous)
+            raise
+    _active.update(path=path, stamp=_stamp(path), catalog=catalog)
+    return catalog
+
+
+def reload_menu(force: bool = False) -> bool:
+    """
+    Vuelve a leer el menú activo si el archivo cambió (o si force=True).
+    Devuelve True si hubo recarga.
+    """
+    path = active_menu_path()
+    if not force and _active["catalog"] is not None and _stamp(path) == _active["stamp"]:
+        return False
+    load_menu(path)
+    return True
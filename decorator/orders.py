@@ -0,0 +1,75 @@
+# orders.py
+# Etapas (generadores) para procesar flujos de pedidos en memoria constante.
+
+import csv
+import json
+
+from builder import build_beverage, check_order
+
+
+def read_orders(stream, fmt: str = "jsonl", fieldnames: list = None):
+    """
+    Lee pedidos de a uno desde un archivo abierto (generador).
+    jsonl: una línea por pedido, {"base": ..., "size": ..., "condiments": [...]}
+    csv: encabezado base,size,condiments con los condimentos separados por ";"
+        (fieldnames permite leer un fragmento sin encabezado)
+    Cada pedido es una tupla (base, size, condiments) o la excepción que
+    impidió leer la línea.
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(stream, fieldnames=fieldnames):
+            condiments = (row.get("condiments") or "").split(";")
+            yield (
+                row.get("base") or "",
+                row.get("size") or "tall",
+                [c.strip() for c in condiments if c.strip()],
+            )
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            order = json.loads(line)
+            order = check_order(
+                order["base"],
+                order.get("size", "tall"),
+                order.get("condiments") or [],
+            )
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            yield ValueError(f"Pedido ilegible: {exc}")
+            continue
+        yield order
+
+
+def price_orders_stream(orders):
+    """
+    Arma y cotiza cada pedido con build_beverage (generador).
+    Devuelve una línea de ticket por pedido; los pedidos inválidos (o con
+    campos de tipo incorrecto) generan una línea de error en lugar de cortar
+    el proceso.
+    """
+    for number, order in enumerate(orders, start=1):
+        try:
+            if isinstance(order, Exception):
+                raise order
+            beverage = build_beverage(*check_order(*order))
+        except ValueError as exc:
+            yield f"Pedido {number}: ERROR {exc}\n"
+            continue
+        yield (
+            f"Pedido {number}: {beverage.get_description()} "
+            f"({beverage.get_size().value}) ${beverage.cost():.2f}\n"
+        )
+
+
+def stream_orders(source, out, fmt: str) -> int:
+    """
+    Procesa los pedidos en memoria constante: lee, cotiza y escribe de a
+    una línea. Devuelve la cantidad de pedidos procesados.
+    """
+    count = 0
+    for receipt in price_orders_stream(read_orders(source, fmt)):
+        out.write(receipt)
+        count += 1
+    return count
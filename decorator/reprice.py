@@ -0,0 +1,152 @@
+# reprice.py
+# Recotización de historiales de pedidos: totales y recaudación por condimento.
+# Puede repartir el archivo en rangos de bytes y procesarlos en paralelo con
+# un ProcessPoolExecutor; el resumen resultante es idéntico al secuencial.
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+import menu
+from builder import CONDIMENTS, build_beverage
+from orders import check_order, read_orders
+from utils import CONDIMENT_PRICES
+
+_ZERO = Decimal("0")
+
+
+class PricingTotals:
+    """
+    Acumula la cantidad de pedidos, los errores, el total recaudado y la
+    recaudación de cada condimento. Los montos son Decimal, así que sumar
+    por partes y combinar en orden da exactamente el mismo resultado.
+    """
+
+    __slots__ = ("orders", "errors", "revenue", "condiment_revenue")
+
+    def __init__(self):
+        self.orders = 0
+        self.errors = 0
+        self.revenue = _ZERO
+        self.condiment_revenue = {name: _ZERO for name in CONDIMENTS}
+
+    def add(self, order) -> None:
+        """
+        Cotiza un pedido (base, size, condiments) con build_beverage y lo suma.
+        Los pedidos inválidos o con campos de tipo incorrecto cuentan como
+        errores.
+        """
+        self.orders += 1
+        try:
+            if isinstance(order, Exception):
+                raise order
+            order = check_order(*order)
+            beverage = build_beverage(*order)
+        except ValueError:
+            self.errors += 1
+            return
+        self.revenue += beverage.cost()
+        size = beverage.get_size()
+        for cond in order[2] or ():
+            name = cond.lower()
+            price = CONDIMENT_PRICES[(CONDIMENTS[name].price_key, size)]
+            self.condiment_revenue[name] += price
+
+    def merge(self, other: "PricingTotals") -> None:
+        """
+        Suma otro resumen (p. ej. el de un fragmento) a éste.
+        """
+        self.orders += other.orders
+        self.errors += other.errors
+        self.revenue += other.revenue
+        for name, amount in other.condiment_revenue.items():
+            self.condiment_revenue[name] += amount
+
+    def render(self) -> str:
+        """
+        Texto del resumen, con los condimentos en el orden del menú.
+        """
+        lines = [
+            f"Pedidos: {self.orders}",
+            f"Errores: {self.errors}",
+            f"Total: ${self.revenue:.2f}",
+        ]
+        for name, amount in self.condiment_revenue.items():
+            lines.append(f"  {name:<10} ${amount:.2f}")
+        return "\n".join(lines) + "\n"
+
+
+def summarize_orders(orders) -> PricingTotals:
+    """
+    Resume un iterable de pedidos en un solo proceso.
+    """
+    totals = PricingTotals()
+    for order in orders:
+        totals.add(order)
+    return totals
+
+
+def shard_ranges(path: str, shards: int) -> list:
+    """
+    Divide el archivo en `shards` rangos de bytes [inicio, fin) del mismo
+    tamaño aproximado. Cada línea pertenece al rango donde empieza.
+    """
+    size = os.path.getsize(path)
+    step = max(1, -(-size // shards))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _read_shard(path: str, start: int, end: int):
+    """
+    Genera las líneas (decodificadas) que empiezan dentro de [start, end).
+    """
+    with open(path, "rb") as f:
+        if start > 0:
+            # Si el rango arranca a mitad de una línea, ésta es del anterior
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode("utf-8")
+
+
+def _summarize_shard(path: str, start: int, end: int, fmt: str, fieldnames):
+    lines = _read_shard(path, start, end)
+    if fmt == "csv" and start == 0:
+        next(lines, None)  # El encabezado sólo está en el primer fragmento
+    return summarize_orders(read_orders(lines, fmt, fieldnames=fieldnames))
+
+
+def reprice_file(path: str, fmt: str = "jsonl", workers: int = 1) -> PricingTotals:
+    """
+    Recotiza un archivo de pedidos. Con workers > 1 lo reparte en rangos de
+    bytes entre procesos y combina los resúmenes en el orden de los rangos,
+    por lo que el resultado no depende de qué proceso termina primero.
+    """
+    if workers <= 1:
+        with open(path, encoding="utf-8", newline="") as source:
+            return summarize_orders(read_orders(source, fmt))
+
+    fieldnames = None
+    if fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as source:
+            fieldnames = next(csv.reader(source), None)
+
+    ranges = shard_ranges(path, workers * 4)
+    totals = PricingTotals()
+    # Cada proceso carga el menú activo una sola vez al arrancar.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=menu.load_menu,
+        initargs=(menu.active_menu_path(),),
+    ) as pool:
+        futures = [
+            pool.submit(_summarize_shard, path, start, end, fmt, fieldnames)
+            for start, end in ranges
+        ]
+        for future in futures:
+            totals.merge(future.result())
+    return totals
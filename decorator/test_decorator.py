@@ -2,12 +2,28 @@
 # Comprehensive tests for the Decorator pattern implementation
 # Testing costs and descriptions for various combinations including doubles and sizes
 
+import io
+import json
+import pickle
 from decimal import Decimal
 
+import menu
 import pytest
 from beverages import DarkRoast, Decaf, Espresso, HouseBlend, Size
-from builder import build_beverage
-from condiments import Caramel, Milk, Mocha, PrettyDescriptionDecorator, Soy, Whip
+from builder import BASES, CONDIMENTS, build_beverage, price_orders
+from condiments import (
+    Caramel,
+    CondimentDecorator,
+    Milk,
+    Mocha,
+    PrettyDescriptionDecorator,
+    Soy,
+    Whip,
+    compile_beverage,
+)
+from orders import price_orders_stream, read_orders, stream_orders
+from reprice import _read_shard, reprice_file, shard_ranges, summarize_orders
+from utils import CONDIMENT_PRICES, calculate_size_based_cost
 
 
 class TestBasicBeverages:
@@ -372,6 +388,535 @@ class TestErrorHandling:
             build_beverage("espresso", "tall", ["invalid_condiment"])
 
 
+class TestCompiledBeverage:
+    """Test the compiled (flattened) beverage mode against the chained decorators."""
+
+    ORDERS = [
+        ("espresso", []),
+        ("darkroast", ["mocha", "mocha", "whip"]),
+        ("houseblend", ["soy", "mocha", "whip"]),
+        ("decaf", ["milk", "mocha", "soy", "whip", "caramel"]),
+        ("espresso", ["caramel", "caramel", "caramel", "mocha"]),
+    ]
+
+    @pytest.mark.parametrize("base,condiments", ORDERS)
+    @pytest.mark.parametrize("size", ["tall", "grande", "venti"])
+    def test_matches_chained(self, base, size, condiments):
+        """Test that compiled cost, description and size match the chain."""
+        chained = build_beverage(base, size, condiments)
+        compiled = build_beverage(base, size, condiments, compiled=True)
+        assert compiled.cost() == chained.cost()
+        assert compiled.get_description() == chained.get_description()
+        assert compiled.get_size() == chained.get_size()
+
+    def test_set_size_after_compile(self):
+        """Test that changing size on a compiled beverage reprices it."""
+        chained = build_beverage("espresso", "tall", ["soy", "mocha"])
+        compiled = build_beverage("espresso", "tall", ["soy", "mocha"], compiled=True)
+        for size in Size:
+            chained.set_size(size)
+            compiled.set_size(size)
+            assert compiled.cost() == chained.cost()
+
+    def test_compile_manual_chain(self):
+        """Test compiling a chain built by hand."""
+        chain = Whip(Mocha(Soy(Espresso())))
+        compiled = compile_beverage(chain)
+        assert compiled.cost() == chain.cost()
+        assert compiled.get_description() == chain.get_description()
+
+
+class TestPriceCatalog:
+    """Test the precomputed condiment price catalog."""
+
+    def test_catalog_matches_size_based_cost(self):
+        """Test that catalog prices match the original per-size literals."""
+        assert CONDIMENT_PRICES[("soy", Size.TALL)] == calculate_size_based_cost(
+            Size.TALL, "0.10", "0.15", "0.20"
+        )
+        assert CONDIMENT_PRICES[("mocha", Size.VENTI)] == Decimal("0.30")
+        assert CONDIMENT_PRICES[("caramel", Size.GRANDE)] == Decimal("0.25")
+
+    def test_equal_prices_are_interned(self):
+        """Test that equal amounts share the same Decimal instance."""
+        assert CONDIMENT_PRICES[("milk", Size.TALL)] is CONDIMENT_PRICES[("soy", Size.TALL)]
+        assert (
+            CONDIMENT_PRICES[("mocha", Size.VENTI)]
+            is CONDIMENT_PRICES[("caramel", Size.VENTI)]
+        )
+
+    def test_every_condiment_is_priced(self):
+        """Test that each condiment decorator has an entry for every size."""
+        for condiment_cls in (Milk, Mocha, Soy, Whip, Caramel):
+            for size in Size:
+                assert (condiment_cls.price_key, size) in CONDIMENT_PRICES
+
+
+class TestBatchPricing:
+    """Test batch pricing of many orders at once."""
+
+    def test_totals_match_build_beverage(self):
+        """Test that batch totals equal cost() of each built beverage."""
+        orders = [
+            ("espresso", "tall", []),
+            ("darkroast", "grande", ["soy", "caramel", "whip"]),
+            ("HouseBlend", "Venti", ["soy", "soy", "mocha"]),
+            ("decaf", "grande", ["milk", "mocha", "soy", "whip", "caramel"]),
+            ("espresso", "unknown-size", ["mocha"]),
+        ]
+        totals, errors = price_orders(orders)
+        assert errors == {}
+        for order, total in zip(orders, totals):
+            assert total == build_beverage(*order).cost()
+        assert str(totals[0]) == "1.99"
+
+    def test_invalid_rows_are_reported(self):
+        """Test that invalid rows don't abort the rest of the batch."""
+        orders = [
+            ("espresso", "tall", ["mocha"]),
+            ("invalid_beverage", "tall", []),
+            ("espresso", "tall", ["invalid_condiment"]),
+            ("decaf", "venti", None),
+        ]
+        totals, errors = price_orders(orders)
+        assert totals == [Decimal("2.19"), None, None, Decimal("1.05")]
+        assert set(errors) == {1, 2}
+        assert "Bebida base desconocida" in str(errors[1])
+        assert "Condimento desconocido" in str(errors[2])
+
+    def test_malformed_rows_are_reported(self):
+        """Test that rows with wrong types or length land in errors, not exceptions."""
+        orders = [
+            ("espresso", None, []),
+            (None, "tall", []),
+            ("espresso", "tall", [None]),
+            ("espresso", "tall"),
+            None,
+            ("decaf", "tall", ("mocha",)),
+        ]
+        totals, errors = price_orders(orders)
+        assert totals == [None] * 5 + [Decimal("1.25")]
+        assert set(errors) == {0, 1, 2, 3, 4}
+        assert all(isinstance(error, ValueError) for error in errors.values())
+        assert "Pedido ilegible" in str(errors[3])
+
+    def test_accepts_generator(self):
+        """Test that any iterable of orders is accepted."""
+        totals, errors = price_orders(("espresso", "tall", ["soy"]) for _ in range(3))
+        assert totals == [Decimal("2.09")] * 3
+        assert errors == {}
+
+
+class TestDescriptionCache:
+    """Test the shared LRU cache behind PrettyDescriptionDecorator."""
+
+    def test_repeated_descriptions_hit_cache(self):
+        """Test that the same drink configuration is grouped only once."""
+        PrettyDescriptionDecorator.cache_clear()
+        first = build_beverage("darkroast", "tall", ["mocha", "mocha", "whip"])
+        second = build_beverage("darkroast", "venti", ["mocha", "mocha", "whip"])
+
+        assert first.get_description() == "Café Dark Roast, Double Mocha, Crema"
+        assert second.get_description() == first.get_description()
+        first.get_description()
+
+        info = PrettyDescriptionDecorator.cache_info()
+        assert info.misses == 1
+        assert info.hits == 3
+
+    def test_condiment_order_is_preserved(self):
+        """Test that drinks with the same condiments in another order don't collide."""
+        a = build_beverage("espresso", "tall", ["soy", "mocha", "mocha"])
+        b = build_beverage("espresso", "tall", ["mocha", "soy", "mocha"])
+        assert a.get_description() == "Espresso, Soja, Double Mocha"
+        assert b.get_description() == "Espresso, Double Mocha, Soja"
+
+    def test_set_size_keeps_description(self):
+        """Test that changing size doesn't affect the cached description."""
+        beverage = build_beverage("houseblend", "tall", ["soy", "soy"])
+        before = beverage.get_description()
+        beverage.set_size(Size.VENTI)
+        assert beverage.get_description() == before == "Café de la Casa, Double Soja"
+
+    def test_rewrapping(self):
+        """Test that wrapping a pretty beverage again groups the full text."""
+        inner = PrettyDescriptionDecorator(Mocha(Mocha(Espresso())))
+        outer = PrettyDescriptionDecorator(Whip(Mocha(inner)))
+        assert inner.get_description() == "Espresso, Double Mocha"
+        assert outer.get_description() == "Espresso, Double Mocha, Mocha, Crema"
+
+
+class TestInternedBeverage:
+    """Test the flyweight (interned) build mode."""
+
+    def test_identical_orders_share_instance(self):
+        """Test that equal configurations return the same object."""
+        a = build_beverage("DarkRoast", "grande", ["mocha", "soy", "mocha"], interned=True)
+        b = build_beverage("darkroast", "Grande", ["mocha", "mocha", "soy"], interned=True)
+        assert a is b
+        assert a.get_description() == "Café Dark Roast, Double Mocha, Soja"
+        assert a.cost() == build_beverage("darkroast", "grande", ["mocha", "soy", "mocha"]).cost()
+
+    def test_different_orders_dont_share(self):
+        """Test that size and first-appearance order are part of the key."""
+        tall = build_beverage("espresso", "tall", ["soy", "mocha"], interned=True)
+        venti = build_beverage("espresso", "venti", ["soy", "mocha"], interned=True)
+        swapped = build_beverage("espresso", "tall", ["mocha", "soy"], interned=True)
+        assert tall is not venti
+        assert tall is not swapped
+        assert swapped.get_description() == "Espresso, Mocha, Soja"
+
+    def test_interned_beverage_is_immutable(self):
+        """Test that a shared beverage can't be resized."""
+        beverage = build_beverage("espresso", "tall", ["mocha"], interned=True)
+        with pytest.raises(TypeError):
+            beverage.set_size(Size.VENTI)
+        assert beverage.get_size() == Size.TALL
+
+    def test_unused_configurations_are_collected(self):
+        """Test that the weak registry drops beverages nobody holds."""
+        import gc
+
+        from builder import _INTERNED
+
+        beverage = build_beverage("decaf", "venti", ["whip", "whip", "whip"], interned=True)
+        key = ("decaf", Size.VENTI, (("whip", 3),))
+        assert _INTERNED[key] is beverage
+        del beverage
+        gc.collect()
+        assert key not in _INTERNED
+
+    def test_interned_validation(self):
+        """Test that interned mode reports the same builder errors."""
+        with pytest.raises(ValueError, match="Condimento desconocido"):
+            build_beverage("espresso", "tall", ["invalid_condiment"], interned=True)
+
+
+class TestSlots:
+    """Test that beverages and decorators don't carry a per-instance __dict__."""
+
+    def test_built_chain_has_no_dict(self):
+        """Test every layer of a built beverage is slotted."""
+        component = build_beverage("decaf", "tall", ["milk", "mocha", "soy", "whip", "caramel"])
+        while isinstance(component, CondimentDecorator):
+            assert not hasattr(component, "__dict__")
+            component = component._beverage
+        assert not hasattr(component, "__dict__")
+        assert component.get_description() == "Café Descafeinado"
+
+    def test_compiled_beverage_has_no_dict(self):
+        """Test compiled beverages are slotted too."""
+        compiled = build_beverage("espresso", "venti", ["mocha"], compiled=True)
+        assert not hasattr(compiled, "__dict__")
+        assert compiled.get_description() == "Espresso, Mocha"
+
+
+class TestDeepChains:
+    """Test that chain evaluation is iterative and not bound by recursion."""
+
+    DEPTH = 5000  # well above the default recursion limit
+
+    def test_deep_chain_cost_and_description(self):
+        """Test cost, description and size on a chain deeper than the recursion limit."""
+        beverage = Espresso()
+        for _ in range(self.DEPTH):
+            beverage = Mocha(beverage)
+
+        assert beverage.cost() == Decimal("1.99") + self.DEPTH * Decimal("0.20")
+        assert beverage.get_description() == "Espresso" + ", Mocha" * self.DEPTH
+
+        beverage.set_size(Size.VENTI)
+        assert beverage.get_size() == Size.VENTI
+        assert beverage.cost() == Decimal("1.99") + self.DEPTH * Decimal("0.30")
+
+    def test_deep_built_beverage(self):
+        """Test a deep beverage built through build_beverage."""
+        beverage = build_beverage("houseblend", "grande", ["soy"] * self.DEPTH)
+        assert beverage.get_description() == f"Café de la Casa, {self.DEPTH}x Soja"
+        assert beverage.cost() == Decimal("0.89") + self.DEPTH * Decimal("0.15")
+        assert compile_beverage(beverage).cost() == beverage.cost()
+
+    def test_custom_layer_is_respected(self):
+        """Test that a decorator overriding a method still takes part in the chain."""
+
+        class Discount(CondimentDecorator):
+            __slots__ = ()
+
+            def cost(self) -> Decimal:
+                return super().cost() - Decimal("0.50")
+
+        beverage = Mocha(Discount(Mocha(Espresso())))
+        assert beverage.cost() == Decimal("1.99") + 2 * Decimal("0.20") - Decimal("0.50")
+        assert beverage.get_description() == "Espresso, Mocha, Mocha"
+        assert "cost" not in Discount._generic
+        assert "get_description" in Discount._generic
+        assert "get_description" not in PrettyDescriptionDecorator._generic
+
+
+class TestOrderStream:
+    """Test the streaming order pipeline used by the command line."""
+
+    def test_jsonl_stream(self):
+        """Test that JSONL orders are priced one receipt per line."""
+        source = io.StringIO(
+            '{"base": "espresso"}\n'
+            "\n"
+            '{"base": "darkroast", "size": "grande", "condiments": ["mocha", "mocha"]}\n'
+        )
+        out = io.StringIO()
+        assert stream_orders(source, out, "jsonl") == 2
+        assert out.getvalue() == (
+            "Pedido 1: Espresso (Tall) $1.99\n"
+            "Pedido 2: Café Dark Roast, Double Mocha (Grande) $1.49\n"
+        )
+
+    def test_csv_stream(self):
+        """Test that CSV orders use ';' separated condiments."""
+        source = io.StringIO("base,size,condiments\nhouseblend,venti,soy;mocha\n")
+        receipts = list(price_orders_stream(read_orders(source, "csv")))
+        assert receipts == ["Pedido 1: Café de la Casa, Soja, Mocha (Venti) $1.39\n"]
+
+    def test_invalid_orders_dont_stop_the_stream(self):
+        """Test that unknown items and unreadable lines produce error receipts."""
+        source = io.StringIO('{"base": "foo"}\nnot json\n{"base": "decaf"}\n')
+        receipts = list(price_orders_stream(read_orders(source)))
+        assert receipts[0] == "Pedido 1: ERROR Bebida base desconocida: foo\n"
+        assert receipts[1].startswith("Pedido 2: ERROR Pedido ilegible")
+        assert receipts[2] == "Pedido 3: Café Descafeinado (Tall) $1.05\n"
+
+    def test_wrong_field_types_are_unreadable(self):
+        """Test that non-string fields produce error receipts, not crashes."""
+        source = io.StringIO(
+            '{"base": 5}\n'
+            '{"base": "decaf", "size": null}\n'
+            '{"base": "decaf", "condiments": ["mocha", 3]}\n'
+            '{"base": "decaf", "condiments": "mocha"}\n'
+            '{"base": "decaf"}\n'
+        )
+        receipts = list(price_orders_stream(read_orders(source)))
+        assert len(receipts) == 5
+        for number, receipt in enumerate(receipts[:4], start=1):
+            assert receipt.startswith(f"Pedido {number}: ERROR Pedido ilegible")
+        assert receipts[4] == "Pedido 5: Café Descafeinado (Tall) $1.05\n"
+
+    def test_wrong_types_in_tuples_are_errors(self):
+        """Test that tuples built in code are type-checked too."""
+        receipts = list(price_orders_stream([("espresso", None, []), ("espresso", "tall", [1])]))
+        assert receipts[0].startswith("Pedido 1: ERROR size debe ser texto")
+        assert receipts[1].startswith("Pedido 2: ERROR condiments debe ser")
+
+    def test_reading_is_lazy(self):
+        """Test that orders are read only as receipts are consumed."""
+        lines = iter(['{"base": "espresso"}\n'] * 3)
+        receipts = price_orders_stream(read_orders(lines))
+        next(receipts)
+        assert len(list(lines)) == 2
+
+
+class TestReprice:
+    """Test single-process and sharded repricing of order logs."""
+
+    ORDERS = [
+        '{"base": "espresso", "size": "venti", "condiments": ["soy", "mocha"]}',
+        '{"base": "darkroast", "size": "grande", "condiments": ["soy", "caramel", "whip"]}',
+        '{"base": "foo"}',
+        '{"base": "houseblend", "condiments": ["soy", "soy"]}',
+        "not json",
+        '{"base": "decaf", "size": "grande", "condiments": ["milk", "mocha"]}',
+        '{"base": "espresso", "size": 3, "condiments": ["soy"]}',
+    ]
+
+    def test_summary_totals(self):
+        """Test totals and per-condiment revenue of a small log."""
+        totals = summarize_orders(read_orders(io.StringIO("\n".join(self.ORDERS))))
+        assert totals.orders == 7
+        assert totals.errors == 3
+        assert totals.revenue == Decimal("2.49") + Decimal("1.54") + Decimal("1.09") + Decimal("1.45")
+        assert totals.condiment_revenue["soy"] == Decimal("0.20") + Decimal("0.15") + Decimal("0.20")
+        assert totals.condiment_revenue["mocha"] == Decimal("0.30") + Decimal("0.25")
+
+    def test_parallel_output_is_identical(self, tmp_path):
+        """Test that sharded repricing renders byte-identical output."""
+        path = tmp_path / "orders.jsonl"
+        path.write_text("\n".join(self.ORDERS * 50) + "\n", encoding="utf-8")
+        single = reprice_file(str(path)).render()
+        assert reprice_file(str(path), workers=3).render() == single
+        assert "Pedidos: 350" in single
+
+    def test_parallel_csv(self, tmp_path):
+        """Test that CSV shards reuse the header of the first shard."""
+        path = tmp_path / "orders.csv"
+        rows = ["houseblend,venti,soy;mocha", "decaf,tall,", "espresso,grande,whip"] * 40
+        path.write_text("base,size,condiments\n" + "\n".join(rows) + "\n", encoding="utf-8")
+        single = reprice_file(str(path), "csv")
+        parallel = reprice_file(str(path), "csv", workers=2)
+        assert parallel.render() == single.render()
+        assert single.orders == 120
+        assert single.errors == 0
+
+    def test_shards_cover_every_line_once(self, tmp_path):
+        """Test that byte-range shards split lines without loss or overlap."""
+        path = tmp_path / "lines.txt"
+        lines = [f"line {i}\n" for i in range(100)]
+        path.write_text("".join(lines), encoding="utf-8")
+        for shards in (1, 3, 7, 1000):
+            seen = []
+            for start, end in shard_ranges(str(path), shards):
+                seen.extend(_read_shard(str(path), start, end))
+            assert seen == lines
+
+
+class TestMenuCatalog:
+    """Test the menu catalog loader and hot reload."""
+
+    MENU = {
+        "bases": {"espresso": {"description": "Espresso Doble", "price": "2.50"}},
+        "condiments": {
+            "mocha": {
+                "label": "Moka",
+                "prices": {"tall": "0.40", "grande": "0.45", "venti": "0.50"},
+            }
+        },
+    }
+
+    @pytest.fixture(autouse=True)
+    def restore_default_menu(self):
+        yield
+        menu.load_menu()
+
+    def write_menu(self, path, catalog):
+        path.write_text(json.dumps(catalog), encoding="utf-8")
+        return str(path)
+
+    def test_default_menu_matches_builtin_classes(self):
+        """Test that menu.json keeps the prices and texts of the built-in classes."""
+        for base_cls in (Espresso, DarkRoast, HouseBlend, Decaf):
+            beverage = build_beverage(base_cls.price_key)
+            assert beverage.get_description() == base_cls.description
+            assert beverage.cost() == base_cls().cost()
+        for condiment_cls in (Milk, Mocha, Soy, Whip, Caramel):
+            assert CONDIMENTS[condiment_cls.price_key].label == condiment_cls.label
+
+    def test_load_custom_menu(self, tmp_path):
+        """Test that a loaded menu drives build_beverage and price_orders."""
+        menu.load_menu(self.write_menu(tmp_path / "menu.json", self.MENU))
+        beverage = build_beverage("espresso", "grande", ["mocha", "mocha"])
+        assert beverage.get_description() == "Espresso Doble, Double Moka"
+        assert beverage.cost() == Decimal("3.40")
+        assert price_orders([("espresso", "grande", ["mocha", "mocha"])]) == (
+            [Decimal("3.40")],
+            {},
+        )
+        with pytest.raises(ValueError, match="Bebida base desconocida"):
+            build_beverage("decaf")
+
+    def test_toml_menu(self, tmp_path):
+        """Test loading a TOML catalog."""
+        path = tmp_path / "menu.toml"
+        path.write_text(
+            '[bases.decaf]\ndescription = "Descafeinado"\nprice = "1.00"\n'
+            '[condiments.whip]\nlabel = "Crema"\n'
+            'prices = { tall = "0.05", grande = "0.10", venti = "0.15" }\n',
+            encoding="utf-8",
+        )
+        menu.load_menu(str(path))
+        assert build_beverage("decaf", "venti", ["whip"]).cost() == Decimal("1.15")
+
+    def test_hot_reload(self, tmp_path):
+        """Test that reload_menu picks up file changes without restarting."""
+        path = self.write_menu(tmp_path / "menu.json", self.MENU)
+        menu.load_menu(path)
+        interned = build_beverage("espresso", "tall", ["mocha"], interned=True)
+        assert interned.cost() == Decimal("2.90")
+        assert menu.reload_menu() is False
+
+        changed = json.loads(json.dumps(self.MENU))
+        changed["bases"]["espresso"]["price"] = "3.00"
+        changed["bases"]["espresso"]["description"] = "Espresso Triple"
+        changed["condiments"]["mocha"]["prices"]["tall"] = "0.55"
+        self.write_menu(tmp_path / "menu.json", changed)
+        assert menu.reload_menu() is True
+
+        assert build_beverage("espresso", "tall", ["mocha"]).cost() == Decimal("3.55")
+        assert build_beverage("espresso", "tall", ["mocha"], interned=True) is not interned
+        assert price_orders([("espresso", "tall", ["mocha"])])[0] == [Decimal("3.55")]
+
+    def test_binary_cache_is_reused(self, tmp_path, monkeypatch):
+        """Test that an unchanged catalog is read from the marshal cache."""
+        path = self.write_menu(tmp_path / "menu.json", self.MENU)
+        parsed = menu.load_catalog(path)
+        assert (tmp_path / "__pycache__" / "menu.json.marshal").exists()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("the catalog should come from the cache")
+
+        monkeypatch.setattr(menu.json, "load", fail)
+        assert menu.load_catalog(path) == parsed
+
+    def test_invalid_menu(self, tmp_path):
+        """Test that a catalog missing fields is rejected."""
+        path = self.write_menu(tmp_path / "menu.json", {"bases": {"espresso": {}}})
+        with pytest.raises(ValueError, match="Menú inválido"):
+            menu.load_menu(path)
+
+    def test_classes_are_generated_once(self):
+        """Test that menu classes are created on demand and reused."""
+        assert CONDIMENTS["mocha"] is CONDIMENTS["mocha"]
+        assert issubclass(CONDIMENTS["mocha"], CondimentDecorator)
+        assert "unknown" not in CONDIMENTS
+
+    @pytest.mark.parametrize("price", ["abc", "1.999", "-1.00", "NaN", None, True, [1]])
+    def test_invalid_prices_keep_the_active_menu(self, tmp_path, price):
+        """Test that a bad price is rejected and the previous menu stays active."""
+        catalog = json.loads(json.dumps(self.MENU))
+        catalog["condiments"]["mocha"]["prices"]["grande"] = price
+        path = self.write_menu(tmp_path / "menu.json", catalog)
+        with pytest.raises(ValueError, match="Menú inválido: precio de mocha"):
+            menu.load_menu(path)
+        assert menu.active_menu_path() == menu.DEFAULT_MENU_PATH
+        assert build_beverage("decaf", "grande", ["mocha"]).cost() == Decimal("1.30")
+
+    def test_failing_subscriber_rolls_back(self, tmp_path, monkeypatch):
+        """Test that subscribers return to the previous menu if one of them fails."""
+        def reject(catalog):
+            if "decaf" not in catalog["bases"]:
+                raise RuntimeError("menú rechazado")
+
+        monkeypatch.setattr(menu, "_listeners", menu._listeners + [reject])
+        with pytest.raises(RuntimeError):
+            menu.load_menu(self.write_menu(tmp_path / "menu.json", self.MENU))
+        assert menu.active_menu_path() == menu.DEFAULT_MENU_PATH
+        assert build_beverage("decaf").cost() == Decimal("1.05")
+        assert price_orders([("espresso", "tall", ["mocha"])])[0] == [Decimal("2.19")]
+
+    def test_builtin_classes_are_reused(self, tmp_path):
+        """Test that menu entries matching a hand-written class resolve to it."""
+        assert BASES["espresso"] is Espresso
+        assert CONDIMENTS["mocha"] is Mocha
+        beverage = build_beverage("espresso", "grande", ["mocha"])
+        assert pickle.loads(pickle.dumps(beverage)).cost() == beverage.cost()
+
+        menu.load_menu(self.write_menu(tmp_path / "menu.json", self.MENU))
+        generated = BASES["espresso"]
+        assert generated is not Espresso and issubclass(generated, Espresso)
+        assert isinstance(generated(), Espresso)
+
+    def test_generated_classes_pickle_by_menu_entry(self, tmp_path):
+        """Test that beverages using menu-generated classes survive pickling."""
+        catalog = json.loads(json.dumps(self.MENU))
+        catalog["condiments"]["vanilla"] = {
+            "label": "Vainilla",
+            "prices": {"tall": "0.35", "grande": "0.40", "venti": "0.45"},
+        }
+        menu.load_menu(self.write_menu(tmp_path / "menu.json", catalog))
+        beverage = build_beverage("espresso", "venti", ["vanilla", "mocha"])
+        copy = pickle.loads(pickle.dumps(beverage))
+        assert type(copy._beverage) is CONDIMENTS["mocha"]
+        assert copy.get_description() == "Espresso Doble, Vainilla, Moka"
+        assert copy.get_size() == Size.VENTI
+        assert copy.cost() == beverage.cost() == Decimal("3.45")
+
+
 if __name__ == "__main__":
     # Run tests if executed directly
     pytest.main([__file__, "-v"])
@@ -1,5 +1,6 @@
 from decimal import Decimal
 
+import menu
 from beverages import Size
 
 
@@ -26,3 +27,40 @@ def calculate_size_based_cost(
         return Decimal(venti_cost)
     else:
         return Decimal(grande_cost)  # Fallback por defecto
+
+
+# --- Catálogo de precios de condimentos ---
+def build_price_catalog(spec: dict) -> dict:
+    """
+    Construye el catálogo de precios {(condimento, Size): Decimal}.
+    Los Decimal se internan: montos iguales comparten la misma instancia.
+
+    Args:
+        spec: {nombre: (tall_cost, grande_cost, venti_cost)} como strings
+
+    Returns:
+        dict: Catálogo listo para búsquedas sin parsear strings
+    """
+    interned = {}
+    catalog = {}
+    for name, costs in spec.items():
+        for size, amount in zip((Size.TALL, Size.GRANDE, Size.VENTI), costs):
+            if amount not in interned:
+                interned[amount] = Decimal(amount)
+            catalog[(name, size)] = interned[amount]
+    return catalog
+
+
+# Se construye desde el menú al importar el módulo y se actualiza en el
+# lugar cuando el menú se recarga.
+CONDIMENT_PRICES = {}
+
+
+def _load_condiment_prices(catalog: dict) -> None:
+    spec = {name: prices for name, (_, prices) in catalog["condiments"].items()}
+    prices = build_price_catalog(spec)
+    CONDIMENT_PRICES.clear()
+    CONDIMENT_PRICES.update(prices)
+
+
+menu.subscribe(_load_condiment_prices)
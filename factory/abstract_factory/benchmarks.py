@@ -0,0 +1,34 @@
+# Benchmark of NYPizzaStore.order_pizza with shared vs. per-pizza ingredients.
+# Usage: python -m factory.abstract_factory.benchmarks [pizzas]
+
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+from .store import NYPizzaStore
+
+KINDS = ("cheese", "clam", "veggie", "pepperoni")
+
+
+def bench_order_pizza(pizzas: int = 100_000) -> None:
+    print(f"NYPizzaStore.order_pizza x {pizzas}:")
+    for label, shared in (("shared ingredients", True), ("per-pizza ingredients", False)):
+        store = NYPizzaStore(shared_ingredients=shared)
+        # prepare/bake/cut/box print: discard it so I/O and buffers stay out of the numbers
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i in range(pizzas):
+                store.order_pizza(KINDS[i % 4])
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            kept = [store.order_pizza(KINDS[i % 4]) for i in range(10_000)]
+            retained = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+        print(f"  {label:<24} {pizzas / elapsed:10,.0f} pizzas/s  {retained / len(kept):7.1f} bytes/pizza")
+
+
+if __name__ == "__main__":
+    bench_order_pizza(*map(int, sys.argv[1:]))
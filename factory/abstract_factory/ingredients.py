@@ -2,58 +2,75 @@ from abc import ABC, abstractmethod
 
 # Ingredient products
 
+# Shared (interned) ingredients, keyed by (class, name)
+_SHARED = {}
 
-class Dough:
-    def __init__(self, name):
-        self.name = name
 
-    def __str__(self):
-        return self.name
+class Ingredient:
+    """
+    Slotted ingredient. Ingredient.shared() hands out one frozen instance per
+    (class, name) that every pizza reuses; calling the class directly still
+    builds a fresh, mutable ingredient for pizzas that need their own copy.
+    """
+    __slots__ = ("name", "_frozen")
 
-
-class Sauce:
     def __init__(self, name):
-        self.name = name
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "_frozen", False)
+
+    @classmethod
+    def shared(cls, name):
+        ingredient = _SHARED.get((cls, name))
+        if ingredient is None:
+            ingredient = _SHARED[(cls, name)] = cls(name)
+            object.__setattr__(ingredient, "_frozen", True)
+        return ingredient
+
+    def __setattr__(self, attr, value):
+        if self._frozen:
+            raise AttributeError(
+                f"Shared {type(self).__name__} is immutable; use a factory with shared=False")
+        object.__setattr__(self, attr, value)
 
     def __str__(self):
         return self.name
 
 
-class Cheese:
-    def __init__(self, name):
-        self.name = name
+class Dough(Ingredient):
+    __slots__ = ()
 
-    def __str__(self):
-        return self.name
 
+class Sauce(Ingredient):
+    __slots__ = ()
 
-class Clams:
-    def __init__(self, name):
-        self.name = name
 
-    def __str__(self):
-        return self.name
+class Cheese(Ingredient):
+    __slots__ = ()
 
 
-class Veggies:
-    def __init__(self, name):
-        self.name = name
+class Clams(Ingredient):
+    __slots__ = ()
 
-    def __str__(self):
-        return self.name
 
+class Veggies(Ingredient):
+    __slots__ = ()
 
-class Pepperoni:
-    def __init__(self, name):
-        self.name = name
 
-    def __str__(self):
-        return self.name
+class Pepperoni(Ingredient):
+    __slots__ = ()
 
 # Abstract Factory
 
 
 class PizzaIngredientFactory(ABC):
+    def __init__(self, shared: bool = True):
+        # shared=False opts out of the flyweights: every call builds new,
+        # mutable ingredients for the pizza being prepared
+        self.shared = shared
+
+    def _ingredient(self, cls, name):
+        return cls.shared(name) if self.shared else cls(name)
+
     @abstractmethod
     def create_dough(self) -> Dough: ...
     @abstractmethod
@@ -72,39 +89,39 @@ class PizzaIngredientFactory(ABC):
 
 class NYPizzaIngredientFactory(PizzaIngredientFactory):
     def create_dough(self) -> Dough:
-        return Dough("Thin Crust Dough")
+        return self._ingredient(Dough, "Thin Crust Dough")
 
     def create_sauce(self) -> Sauce:
-        return Sauce("Marinara Sauce")
+        return self._ingredient(Sauce, "Marinara Sauce")
 
     def create_cheese(self) -> Cheese:
-        return Cheese("Reggiano Cheese")
+        return self._ingredient(Cheese, "Reggiano Cheese")
 
     def create_clam(self) -> Clams:
-        return Clams("Fresh Clams")
+        return self._ingredient(Clams, "Fresh Clams")
 
     def create_veggies(self) -> Veggies:
-        return Veggies("Mushroom, Onion, Red Pepper")
+        return self._ingredient(Veggies, "Mushroom, Onion, Red Pepper")
 
     def create_pepperoni(self) -> Pepperoni:
-        return Pepperoni("Sliced Pepperoni")
+        return self._ingredient(Pepperoni, "Sliced Pepperoni")
 
 
 class ChicagoPizzaIngredientFactory(PizzaIngredientFactory):
     def create_dough(self) -> Dough:
-        return Dough("Thick Crust Dough")
+        return self._ingredient(Dough, "Thick Crust Dough")
 
     def create_sauce(self) -> Sauce:
-        return Sauce("Plum Tomato Sauce")
+        return self._ingredient(Sauce, "Plum Tomato Sauce")
 
     def create_cheese(self) -> Cheese:
-        return Cheese("Mozzarella Cheese")
+        return self._ingredient(Cheese, "Mozzarella Cheese")
 
     def create_clam(self) -> Clams:
-        return Clams("Frozen Clams")
+        return self._ingredient(Clams, "Frozen Clams")
 
     def create_veggies(self) -> Veggies:
-        return Veggies("Mushroom, Onion, Red Pepper, Olives")
+        return self._ingredient(Veggies, "Mushroom, Onion, Red Pepper, Olives")
 
     def create_pepperoni(self) -> Pepperoni:
-        return Pepperoni("Sliced Pepperoni")
+        return self._ingredient(Pepperoni, "Sliced Pepperoni")
@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
+from ..registry import PizzaRegistry
 from .ingredients import PizzaIngredientFactory
 
+# kind -> pizza class and regional name; create() also takes the ingredient factory
+NY_PIZZAS = PizzaRegistry("No NY pizza for kind: {kind}")
+CHICAGO_PIZZAS = PizzaRegistry("No Chicago pizza for kind: {kind}")
+
 
 class Pizza(ABC):
+    __slots__ = ("name", "f", "dough", "sauce", "cheese", "clam", "veggies", "pepperoni")
+
     def __init__(self, name: str, ing_factory: PizzaIngredientFactory):
         self.name = name
         self.f = ing_factory
@@ -21,7 +28,11 @@ class Pizza(ABC):
     def __str__(self): return self.name
 
 
+@NY_PIZZAS.register("cheese", "NY Style Cheese Pizza")
+@CHICAGO_PIZZAS.register("cheese", "Chicago Style Cheese Pizza")
 class CheesePizza(Pizza):
+    __slots__ = ()
+
     def prepare(self):
         print(f"Preparing {self.name}")
         self.dough = self.f.create_dough()
@@ -30,7 +41,11 @@ class CheesePizza(Pizza):
         print(" ->", self.dough, "/", self.sauce, "/", self.cheese)
 
 
+@NY_PIZZAS.register("clam", "NY Style Clam Pizza")
+@CHICAGO_PIZZAS.register("clam", "Chicago Style Clam Pizza")
 class ClamPizza(Pizza):
+    __slots__ = ()
+
     def prepare(self):
         print(f"Preparing {self.name}")
         self.dough = self.f.create_dough()
@@ -41,7 +56,11 @@ class ClamPizza(Pizza):
               "/", self.cheese, "/", self.clam)
 
 
+@NY_PIZZAS.register("veggie", "NY Style Veggie Pizza")
+@CHICAGO_PIZZAS.register("veggie", "Chicago Style Veggie Pizza")
 class VeggiePizza(Pizza):
+    __slots__ = ()
+
     def prepare(self):
         print(f"Preparing {self.name}")
         self.dough = self.f.create_dough()
@@ -52,7 +71,11 @@ class VeggiePizza(Pizza):
               "/", self.cheese, "/", self.veggies)
 
 
+@NY_PIZZAS.register("pepperoni", "NY Style Pepperoni Pizza")
+@CHICAGO_PIZZAS.register("pepperoni", "Chicago Style Pepperoni Pizza")
 class PepperoniPizza(Pizza):
+    __slots__ = ()
+
     def prepare(self):
         print(f"Preparing {self.name}")
         self.dough = self.f.create_dough()
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from .ingredients import NYPizzaIngredientFactory, ChicagoPizzaIngredientFactory, PizzaIngredientFactory
-from .pizza import Pizza, CheesePizza, ClamPizza, VeggiePizza, PepperoniPizza
+from .pizza import Pizza, NY_PIZZAS, CHICAGO_PIZZAS
 
 
 class PizzaStore(ABC):
@@ -17,34 +17,16 @@ class PizzaStore(ABC):
 
 
 class NYPizzaStore(PizzaStore):
-    def __init__(self):
-        self.factory: PizzaIngredientFactory = NYPizzaIngredientFactory()
+    def __init__(self, shared_ingredients: bool = True):
+        self.factory: PizzaIngredientFactory = NYPizzaIngredientFactory(shared_ingredients)
 
     def create_pizza(self, kind: str) -> Pizza:
-        k = kind.lower()
-        if k == "cheese":
-            return CheesePizza("NY Style Cheese Pizza", self.factory)
-        if k == "clam":
-            return ClamPizza("NY Style Clam Pizza", self.factory)
-        if k == "veggie":
-            return VeggiePizza("NY Style Veggie Pizza", self.factory)
-        if k == "pepperoni":
-            return PepperoniPizza("NY Style Pepperoni Pizza", self.factory)
-        raise ValueError(f"No NY pizza for kind: {kind}")
+        return NY_PIZZAS.create(kind, self.factory)
 
 
 class ChicagoPizzaStore(PizzaStore):
-    def __init__(self): 
-        self.factory: PizzaIngredientFactory = ChicagoPizzaIngredientFactory()
+    def __init__(self, shared_ingredients: bool = True):
+        self.factory: PizzaIngredientFactory = ChicagoPizzaIngredientFactory(shared_ingredients)
 
     def create_pizza(self, kind: str) -> Pizza:
-        k = kind.lower()
-        if k == "cheese":
-            return CheesePizza("Chicago Style Cheese Pizza", self.factory)
-        if k == "clam":
-            return ClamPizza("Chicago Style Clam Pizza", self.factory)
-        if k == "veggie":
-            return VeggiePizza("Chicago Style Veggie Pizza", self.factory)
-        if k == "pepperoni":
-            return PepperoniPizza("Chicago Style Pepperoni Pizza", self.factory)
-        raise ValueError(f"No Chicago pizza for kind: {kind}")
+        return CHICAGO_PIZZAS.create(kind, self.factory)
@@ -50,4 +50,30 @@ def test_chicago_pepperoni_pizza():
 def test_invalid_pizza_type():
     store = NYPizzaStore()
     with pytest.raises(ValueError, match="No NY pizza for kind: invalid_type"):
-        store.order_pizza("invalid_type")
\ No newline at end of file
+        store.order_pizza("invalid_type")
+
+def test_ingredients_are_shared_and_immutable():
+    first = NYPizzaStore().order_pizza("cheese")
+    second = NYPizzaStore().order_pizza("clam")
+    assert first.dough is second.dough
+    assert first.cheese is second.cheese
+    assert not hasattr(first.dough, "__dict__")
+    with pytest.raises(AttributeError):
+        first.dough.name = "Deep Dish Dough"
+
+
+def test_ingredients_shared_by_class_and_name():
+    ny = NYPizzaStore().order_pizza("pepperoni")
+    chicago = ChicagoPizzaStore().order_pizza("pepperoni")
+    assert ny.pepperoni is chicago.pepperoni  # same class and name, across regions
+    assert ny.dough is not chicago.dough  # same class, different name
+
+
+def test_unshared_ingredients_are_fresh_and_mutable():
+    store = NYPizzaStore(shared_ingredients=False)
+    first = store.order_pizza("cheese")
+    second = store.order_pizza("cheese")
+    assert first.dough is not second.dough
+    first.dough.name = "Extra Thin Crust Dough"
+    assert second.dough.name == "Thin Crust Dough"
+    assert NYPizzaStore().order_pizza("cheese").dough.name == "Thin Crust Dough"
@@ -1,5 +1,10 @@
 from abc import ABC, abstractmethod
 
+from ..registry import PizzaRegistry
+
+NY_PIZZAS = PizzaRegistry("No NY pizza for kind: {kind}")
+CHICAGO_PIZZAS = PizzaRegistry("No Chicago pizza for kind: {kind}")
+
 class Pizza(ABC):
     name: str = "Generic Pizza"
     toppings: list[str] = []
@@ -13,29 +18,35 @@ class Pizza(ABC):
     def box(self):  print("Place pizza in official box")
     def __str__(self): return self.name
 
+@NY_PIZZAS.register("cheese")
 class NYStyleCheesePizza(Pizza):
     def __init__(self):
         self.name="NY Style Sauce & Cheese"; self.toppings=["Reggiano cheese"]
 
+@NY_PIZZAS.register("veggie")
 class NYStyleVeggiePizza(Pizza):
     def __init__(self):
         self.name='NY Style Veggie Pizza' ; self.toppings=[''] ; self.toppings = ["Mushroom", "Onion", "Red Pepper"]
 
+@NY_PIZZAS.register("pepperoni")
 class NYStylePepperoniPizza(Pizza):
     def __init__(self):
         self.name = "NY Style Pepperoni Pizza" ; self.toppings = ["Sliced Pepperoni", "Onion", "Cheese"]
 
+@CHICAGO_PIZZAS.register("cheese")
 class ChicagoStyleCheesePizza(Pizza):
     def __init__(self):
         self.name="Chicago Style Deep Dish Cheese"; self.toppings=["Shredded Mozzarella"]
     def cut(self): print("Cutting the pizza into square slices")
 
+@CHICAGO_PIZZAS.register("veggie")
 class ChicagoStyleVeggiePizza(Pizza):
     def __init__(self):
         self.name = "Chicago Style Veggie Pizza" ; self.toppings = ["Mushroom", "Onion", "Red Pepper", "Olives"]
 
     def cut(self): print("Cutting the pizza into square slices")
 
+@CHICAGO_PIZZAS.register("pepperoni")
 class ChicagoStylePepperoniPizza(Pizza):
     def __init__(self):
         self.name = "Chicago Style Pepperoni Pizza" ; self.toppings = ["Sliced Pepperoni", "Onion", "Shredded Mozzarella"]
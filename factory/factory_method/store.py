@@ -1,10 +1,5 @@
 from abc import ABC, abstractmethod
-from .pizza import (
-    Pizza,
-    NYStyleCheesePizza, ChicagoStyleCheesePizza,
-    NYStyleVeggiePizza, ChicagoStyleVeggiePizza,
-    NYStylePepperoniPizza, ChicagoStylePepperoniPizza,
-)
+from .pizza import Pizza, NY_PIZZAS, CHICAGO_PIZZAS
 
 class PizzaStore(ABC):
     def order_pizza(self, kind: str) -> Pizza:
@@ -16,24 +11,8 @@ class PizzaStore(ABC):
 
 class NYPizzaStore(PizzaStore):
     def create_pizza(self, kind: str) -> Pizza:
-        k = kind.lower()
-        if k == "cheese":
-            return NYStyleCheesePizza()
-        elif k == "veggie":
-            return NYStyleVeggiePizza()
-        elif k == "pepperoni":
-            return NYStylePepperoniPizza()
-        else:
-            raise ValueError(f"No NY pizza for kind: {kind}")
+        return NY_PIZZAS.create(kind)
 
 class ChicagoPizzaStore(PizzaStore):
     def create_pizza(self, kind: str) -> Pizza:
-        k = kind.lower()
-        if k == "cheese":
-            return ChicagoStyleCheesePizza()
-        elif k == "veggie":
-            return ChicagoStyleVeggiePizza()
-        elif k == "pepperoni":
-            return ChicagoStylePepperoniPizza()
-        else:
-            raise ValueError(f"No Chicago pizza for kind: {kind}")
+        return CHICAGO_PIZZAS.create(kind)
@@ -0,0 +1,39 @@
+from functools import partial
+
+
+class PizzaRegistry:
+    """
+    Maps a pizza kind to its constructor for one store or region.
+
+    Kinds are lowercased once, at registration; lookups try the kind as
+    given first, so already-normalized orders cost a single dict lookup.
+    Unknown kinds raise ValueError with `error`, formatted with the kind
+    exactly as it was ordered.
+    """
+
+    def __init__(self, error: str):
+        self._constructors = {}
+        self._error = error
+
+    def register(self, kind: str, *args):
+        """
+        Class decorator: @REGISTRY.register("cheese") registers the class for
+        that kind. Extra args are passed to the constructor before the ones
+        given to create().
+        """
+        def decorator(cls):
+            self._constructors[kind.lower()] = partial(cls, *args) if args else cls
+            return cls
+        return decorator
+
+    def create(self, kind: str, *args):
+        constructor = self._constructors.get(kind) or self._constructors.get(kind.lower())
+        if constructor is None:
+            raise ValueError(self._error.format(kind=kind))
+        return constructor(*args)
+
+    def kinds(self) -> tuple:
+        return tuple(self._constructors)
+
+    def __contains__(self, kind: str) -> bool:
+        return kind.lower() in self._constructors
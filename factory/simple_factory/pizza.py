@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 
+from ..registry import PizzaRegistry
+
+PIZZAS = PizzaRegistry("Tipo inválido: {kind}")
+
 class Pizza(ABC):
     name: str = "Generic Pizza"
     dough: str = ""
@@ -19,18 +23,22 @@ class Pizza(ABC):
     def box(self):  print("Place pizza in official box")
     def __str__(self): return self.name
 
+@PIZZAS.register("cheese")
 class CheesePizza(Pizza):
     def __init__(self):
         self.name="Cheese Pizza"; self.dough="Regular"; self.sauce="Marinara"; self.toppings=["Reggiano cheese"]
 
+@PIZZAS.register("veggie")
 class VeggiePizza(Pizza):
     def __init__(self):
         self.name="Veggie Pizza"; self.dough="Thin"; self.sauce="Marinara"; self.toppings=["Mushroom","Onion","Red Pepper"]
 
+@PIZZAS.register("clam")
 class ClamPizza(Pizza):
     def __init__(self):
         self.name="Clam Pizza"; self.dough="Thin"; self.sauce="White"; self.toppings=["Fresh Clams","Grated Cheese"]
 
+@PIZZAS.register("pepperoni")
 class PepperoniPizza(Pizza):
     def __init__(self):
         self.name="Pepperoni Pizza"; self.dough="Regular"; self.sauce="Marinara"; self.toppings=["Sliced Pepperoni","Onion","Cheese"]
@@ -0,0 +1,37 @@
+import pytest
+
+from factory.registry import PizzaRegistry
+from factory.simple_factory.simple_factory import SimplePizzaFactory
+from factory.simple_factory.pizza import ClamPizza
+from factory.factory_method.store import NYPizzaStore, ChicagoPizzaStore
+from factory.factory_method.pizza import ChicagoStyleVeggiePizza
+from factory.abstract_factory.store import NYPizzaStore as NYIngredientStore
+
+
+def test_dispatch_is_case_insensitive():
+    assert isinstance(SimplePizzaFactory().create_pizza("CLAM"), ClamPizza)
+    assert isinstance(ChicagoPizzaStore().create_pizza("Veggie"), ChicagoStyleVeggiePizza)
+    assert NYIngredientStore().create_pizza("Cheese").name == "NY Style Cheese Pizza"
+
+
+def test_unknown_kind_errors_are_unchanged():
+    with pytest.raises(ValueError, match="^Tipo inválido: Hawaiian$"):
+        SimplePizzaFactory().create_pizza("Hawaiian")
+    with pytest.raises(ValueError, match="^No NY pizza for kind: clam$"):
+        NYPizzaStore().create_pizza("clam")
+    with pytest.raises(ValueError, match="^No Chicago pizza for kind: Hawaiian$"):
+        ChicagoPizzaStore().create_pizza("Hawaiian")
+
+
+def test_register_new_kind_with_constructor_args():
+    registry = PizzaRegistry("No pizza for kind: {kind}")
+
+    @registry.register("Margherita", "Margherita Pizza")
+    class Margherita:
+        def __init__(self, name, size):
+            self.name, self.size = name, size
+
+    pizza = registry.create("margherita", "large")
+    assert (pizza.name, pizza.size) == ("Margherita Pizza", "large")
+    assert "MARGHERITA" in registry
+    assert registry.kinds() == ("margherita",)
@@ -1,33 +1,161 @@
-from clases_base_abstractas import Observer, Subject
+import time
+from array import array
+from typing import NamedTuple
+
+from clases_base_abstractas import BatchObserver, Observer, Subject
+from instrumentation import NotificationStats
+from registry import ObserverRegistry
+
+
+class Measurement(NamedTuple):
+    # Foto de una medición, para observadores que no leen del sujeto en vivo
+    temperature: float
+    humidity: float
+    pressure: float
+    timestamp: float
+
+
+class MeasurementBatch:
+    # Lote columnar de mediciones: un array('d') por campo, sin un objeto
+    # Python por muestra
+    __slots__ = ("temperature", "humidity", "pressure", "timestamp")
+
+    def __init__(self, temperature, humidity, pressure, timestamp=None):
+        self.temperature = array("d", temperature)
+        self.humidity = array("d", humidity)
+        self.pressure = array("d", pressure)
+        if timestamp is None:
+            timestamp = [time.time()] * len(self.temperature)
+        self.timestamp = array("d", timestamp)
+        if not len(self.temperature) == len(self.humidity) == len(self.pressure) == len(self.timestamp):
+            raise ValueError("Todas las columnas del lote deben tener el mismo largo")
+
+    def __len__(self) -> int:
+        return len(self.temperature)
+
+    def __iter__(self):
+        return map(Measurement, self.temperature, self.humidity, self.pressure, self.timestamp)
+
+
+# Campo de interés -> atributo de WeatherData
+_FILTER_FIELDS = {"temperature": "_temperature", "humidity": "_humidity", "pressure": "_pressure"}
 
 
 class WeatherData(Subject):
-    def __init__(self):
-        self._observers = []
+    # Con change_filter=True respeta los `interests` de cada observador y no
+    # lo notifica si ninguno de sus campos cambió más que su banda muerta.
+    def __init__(self, weak_observers: bool = False, change_filter: bool = False):
+        self._observers = ObserverRegistry(weak=weak_observers, on_reap=self._forget_id)
+        self._change_filter = change_filter
+        self._delivered = {}  # id(observador) -> valores de su última notificación
+        self.skipped_notifications = 0
         self._temperature = 0.0
         self._humidity = 0.0
         self._pressure = 0.0
+        self._timestamp = 0.0
+        self._history = None
+        self._stats = None
 
     def register_observer(self, observer: Observer):
-        if observer not in self._observers:
-            self._observers.append(observer)
+        unknown = set(getattr(observer, "interests", None) or ()) - _FILTER_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"Campos de interés desconocidos: {sorted(unknown)}")
+        self._observers.add(observer)
 
     def remove_observer(self, observer: Observer):
-        if observer in self._observers:
-            self._observers.remove(observer)
+        self._observers.discard(observer)
+        self._forget_id(id(observer))
+
+    def _forget_id(self, key: int):
+        # También la llama el registro cuando libera un observador débil
+        self._delivered.pop(key, None)
+        if self._stats is not None:
+            self._stats.forget_id(key)
 
     def notify_observers(self):
+        if not self._change_filter and self._stats is None:
+            for observer in self._observers:
+                observer.update()
+            return
         for observer in self._observers:
-            observer.update()
+            if not self._change_filter or self._wants_update(observer):
+                self._deliver(observer, observer.update)
+
+    def _deliver(self, observer, method, *args):
+        if self._stats is None:
+            method(*args)
+        else:
+            self._stats.call(observer, method, *args)
+
+    def enable_instrumentation(self, window: int = 1_024) -> NotificationStats:
+        # Mide cada notificación por observador y aísla sus excepciones;
+        # desactivada, notify_observers no paga más que un if
+        self._stats = NotificationStats(window)
+        return self._stats
+
+    def disable_instrumentation(self):
+        self._stats = None
+
+    def get_instrumentation(self) -> NotificationStats:
+        return self._stats
+
+    def _wants_update(self, observer) -> bool:
+        interests = getattr(observer, "interests", None)
+        if not interests:
+            return True
+        last = self._delivered.get(id(observer))
+        if last is not None:
+            for field, band in interests.items():
+                if abs(getattr(self, _FILTER_FIELDS[field]) - last[field]) > band:
+                    break
+            else:
+                self.skipped_notifications += 1
+                return False
+        self._delivered[id(observer)] = {field: getattr(self, _FILTER_FIELDS[field]) for field in interests}
+        return True
 
     def measurements_changed(self):
         self.notify_observers()
 
     def set_measurements(self, temperature: float, humidity: float, pressure: float):
+        self._store_measurement(temperature, humidity, pressure)
+        self.measurements_changed()
+
+    def _store_measurement(self, temperature: float, humidity: float, pressure: float):
         self._temperature = temperature
         self._humidity = humidity
         self._pressure = pressure
-        self.measurements_changed()
+        self._timestamp = time.time()
+        if self._history is not None:
+            self._history.append(temperature, humidity, pressure, self._timestamp)
+
+    def _store_batch(self, batch: MeasurementBatch):
+        # Guarda el lote en el historial y deja cada muestra como la medición
+        # actual, de a una, mientras se recorre
+        if self._history is not None:
+            self._history.extend(batch)
+        for measurement in batch:
+            self._temperature, self._humidity, self._pressure, self._timestamp = measurement
+            yield measurement
+
+    def attach_history(self, history):
+        # Guarda cada medición en `history` (un history.MeasurementHistory)
+        self._history = history
+
+    def get_history(self):
+        return self._history
+
+    def set_measurements_batch(self, batch: MeasurementBatch):
+        # Los observadores de lotes reciben todo en un solo update_batch(); el
+        # resto recibe un update() por muestra, como con set_measurements.
+        pull_observers = [o for o in self._observers if not isinstance(o, BatchObserver)]
+        batch_observers = [o for o in self._observers if isinstance(o, BatchObserver)]
+        for _ in self._store_batch(batch):
+            for observer in pull_observers:
+                if not self._change_filter or self._wants_update(observer):
+                    self._deliver(observer, observer.update)
+        for observer in batch_observers:
+            self._deliver(observer, observer.update_batch, batch)
 
     # Getters (opcional, para el modelo Pull)
     def get_temperature(self) -> float:
@@ -38,3 +166,6 @@ class WeatherData(Subject):
 
     def get_pressure(self) -> float:
         return self._pressure
+
+    def get_measurement(self) -> Measurement:
+        return Measurement(self._temperature, self._humidity, self._pressure, self._timestamp)
@@ -0,0 +1,187 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum
+
+from Subject import Measurement, WeatherData
+from metrics import percentiles
+
+
+class AsyncObserver(ABC):
+    # Recibe una foto de la medición: cuando corre, el sujeto puede haber cambiado
+    @abstractmethod
+    async def update(self, measurement: Measurement):
+        pass
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop-oldest"  # descarta la notificación pendiente más vieja
+    COALESCE = "coalesce"  # la nueva reemplaza a la última pendiente
+    BLOCK = "block"  # publish() espera lugar en la cola
+
+
+_STOP = object()
+
+
+class _Mailbox:
+    # Cola acotada por observador con política de desborde configurable
+    def __init__(self, maxsize: int, policy: OverflowPolicy):
+        self._items = deque()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.dropped = 0
+
+    def full(self) -> bool:
+        return len(self._items) >= self._maxsize
+
+    def blocks(self, count: int = 1) -> bool:
+        # put_nowait lanzaría QueueFull antes de encolar `count` items más
+        return self._policy is OverflowPolicy.BLOCK and len(self._items) + count > self._maxsize
+
+    def put_nowait(self, item):
+        if self.full():
+            if self._policy is OverflowPolicy.DROP_OLDEST:
+                self._items.popleft()
+                self.dropped += 1
+            elif self._policy is OverflowPolicy.COALESCE:
+                self._items[-1] = item
+                self.dropped += 1
+                return
+            else:
+                raise asyncio.QueueFull
+        self._items.append(item)
+        self._not_empty.set()
+
+    async def put(self, item):
+        while self._policy is OverflowPolicy.BLOCK and self.full():
+            self._not_full.clear()
+            await self._not_full.wait()
+        self.put_nowait(item)
+
+    def close(self):
+        # El aviso de cierre entra siempre, aunque la cola esté llena
+        self._items.append(_STOP)
+        self._not_empty.set()
+
+    async def get(self):
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._items.popleft()
+        self._not_full.set()
+        return item
+
+
+class _Subscription:
+    def __init__(self, observer: AsyncObserver, mailbox: _Mailbox):
+        self.observer = observer
+        self.mailbox = mailbox
+        self.latencies = deque(maxlen=10_000)  # segundos desde set_measurements
+        self.errors = 0
+        self.last_error = None
+        self.task = None
+
+    async def run(self):
+        while True:
+            item = await self.mailbox.get()
+            if item is _STOP:
+                return
+            measurement, enqueued_at = item
+            self.latencies.append(time.perf_counter() - enqueued_at)
+            # Una excepción en update se cuenta y no corta la suscripción
+            try:
+                await self.observer.update(measurement)
+            except Exception as exc:
+                self.errors += 1
+                self.last_error = repr(exc)
+
+
+class AsyncWeatherData(WeatherData):
+    # Variante asíncrona: set_measurements sólo encola la medición para cada
+    # observador y vuelve enseguida; cada observador la procesa en su propia
+    # tarea, así uno lento no frena a los demás ni a la estación.
+    def __init__(self, maxsize: int = 16, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        super().__init__()
+        self._maxsize = maxsize
+        self._policy = policy
+        self._subscriptions = {}
+        self._retired = []  # tareas de observadores dados de baja
+
+    def register_observer(self, observer: AsyncObserver, maxsize: int = None, policy: OverflowPolicy = None):
+        if observer in self._subscriptions:
+            return
+        mailbox = _Mailbox(maxsize or self._maxsize, policy or self._policy)
+        subscription = _Subscription(observer, mailbox)
+        subscription.task = asyncio.get_running_loop().create_task(subscription.run())
+        self._subscriptions[observer] = subscription
+
+    def remove_observer(self, observer: AsyncObserver):
+        subscription = self._subscriptions.pop(observer, None)
+        if subscription is not None:
+            subscription.mailbox.close()
+            self._retired.append(subscription.task)
+
+    def enable_instrumentation(self, window: int = 1_024):
+        # Los updates corren en la tarea de cada suscripción, fuera de
+        # _deliver: NotificationStats quedaría vacío. Sus métricas son
+        # errors(), dropped() y latency_percentiles().
+        raise NotImplementedError("AsyncWeatherData no admite instrumentación: ver errors() y latency_percentiles()")
+
+    def _check_room(self, count: int = 1):
+        # Del lado sincrónico no se puede esperar: si alguna cola BLOCK no
+        # tiene lugar se rechaza la medición entera con QueueFull, antes de
+        # guardarla y de encolarla en ninguna otra cola (usar publish)
+        for subscription in self._subscriptions.values():
+            if subscription.mailbox.blocks(count):
+                raise asyncio.QueueFull
+
+    def set_measurements(self, temperature: float, humidity: float, pressure: float):
+        self._check_room()
+        super().set_measurements(temperature, humidity, pressure)
+
+    def notify_observers(self):
+        self._check_room()
+        item = (self.get_measurement(), time.perf_counter())
+        for subscription in self._subscriptions.values():
+            subscription.mailbox.put_nowait(item)
+
+    def set_measurements_batch(self, batch):
+        # Cada muestra del lote entra en las colas como con set_measurements
+        self._check_room(len(batch))
+        for measurement in self._store_batch(batch):
+            item = (measurement, time.perf_counter())
+            for subscription in self._subscriptions.values():
+                subscription.mailbox.put_nowait(item)
+
+    async def publish(self, temperature: float, humidity: float, pressure: float):
+        # Como set_measurements, pero espera lugar en las colas con política BLOCK
+        self._store_measurement(temperature, humidity, pressure)
+        item = (self.get_measurement(), time.perf_counter())
+        for subscription in list(self._subscriptions.values()):
+            await subscription.mailbox.put(item)
+
+    async def close(self):
+        # Entrega lo pendiente y termina las tareas de los observadores
+        subscriptions = list(self._subscriptions.values())
+        self._subscriptions.clear()
+        for subscription in subscriptions:
+            subscription.mailbox.close()
+        retired, self._retired = self._retired, []
+        await asyncio.gather(*(s.task for s in subscriptions), *retired)
+
+    def dropped(self) -> dict:
+        return {s.observer: s.mailbox.dropped for s in self._subscriptions.values()}
+
+    def errors(self) -> dict:
+        # Excepciones de update por observador: (cantidad, repr de la última)
+        return {s.observer: (s.errors, s.last_error) for s in self._subscriptions.values()}
+
+    def latency_percentiles(self, qs=(50, 95, 99)) -> dict:
+        # Latencia de despacho (desde que se encoló hasta que arranca update)
+        return {
+            s.observer: percentiles(s.latencies, qs) for s in self._subscriptions.values()
+        }
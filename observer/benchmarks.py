@@ -0,0 +1,533 @@
+# benchmarks.py
+# Benchmarks de la estación meteorológica.
+# Uso: python benchmarks.py [nombre ...]  (sin argumentos corre todos)
+
+import asyncio
+import collections
+import contextlib
+import io
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+
+from async_subject import AsyncObserver, AsyncWeatherData, OverflowPolicy
+from clases_base_abstractas import Observer
+from coalescing_subject import CoalescingWeatherData
+from displays import CurrentConditionsDisplay, ForecastDisplay, StatisticsDisplay
+from forecast import ForecastEngine
+from history import MeasurementHistory
+from metrics import percentiles
+from output import BufferedSink, NullOutput
+from parallel_subject import ParallelWeatherData
+from registry import ObserverRegistry
+from replay import MeasurementLog, MeasurementRecorder, replay
+from rolling import RollingStatistics
+from station_hub import StationHub, default_displays, synthetic_feed
+from Subject import Measurement, MeasurementBatch, WeatherData
+
+
+def _fmt_latencies(stats: dict) -> str:
+    return "  ".join(f"{name}={value * 1e3:.3f} ms" for name, value in stats.items())
+
+
+class _SleepyObserver(Observer):
+    # Observador síncrono que tarda `delay` segundos (simula un print lento)
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def update(self):
+        time.sleep(self.delay)
+
+
+class _AsyncSleepyObserver(AsyncObserver):
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def update(self, measurement):
+        await asyncio.sleep(self.delay)
+
+
+def bench_async_dispatch(samples: int = 200, slow_delay: float = 0.002) -> None:
+    # Un observador lento y cuatro rápidos: costo de set_measurements y
+    # percentiles de latencia de despacho en la variante asíncrona.
+    print(f"set_measurements con un observador lento ({slow_delay * 1e3:.0f} ms), {samples} muestras:")
+
+    weather_data = WeatherData()
+    weather_data.register_observer(_SleepyObserver(slow_delay))
+    for _ in range(4):
+        weather_data.register_observer(_SleepyObserver(0))
+    start = time.perf_counter()
+    for i in range(samples):
+        weather_data.set_measurements(20.0 + i % 5, 50, 30.0)
+    per_call = (time.perf_counter() - start) / samples
+    print(f"  {'WeatherData (síncrono)':<32} {per_call * 1e6:10.1f} us/llamada")
+
+    async def scenario(policy: OverflowPolicy):
+        weather_data = AsyncWeatherData(maxsize=8, policy=policy)
+        slow = _AsyncSleepyObserver(slow_delay)
+        fast = _AsyncSleepyObserver(0)
+        weather_data.register_observer(slow)
+        weather_data.register_observer(fast)
+        elapsed = 0.0
+        for i in range(samples):
+            start = time.perf_counter()
+            weather_data.set_measurements(20.0 + i % 5, 50, 30.0)
+            elapsed += time.perf_counter() - start
+            await asyncio.sleep(0)  # la estación sigue produciendo
+        latencies = weather_data.latency_percentiles()
+        dropped = weather_data.dropped()
+        await weather_data.close()
+        label = f"AsyncWeatherData ({policy.value})"
+        print(f"  {label:<32} {elapsed / samples * 1e6:10.1f} us/llamada")
+        print(f"    lento:  {_fmt_latencies(latencies[slow])}  descartadas={dropped[slow]}")
+        print(f"    rápido: {_fmt_latencies(latencies[fast])}  descartadas={dropped[fast]}")
+
+    for policy in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.COALESCE):
+        asyncio.run(scenario(policy))
+
+
+class _WorkObserver(Observer):
+    # Observador sintético: espera `io_delay` segundos (E/S) y hace `cpu_loops`
+    # iteraciones de cálculo con la presión leída.
+    def __init__(self, weather_data: WeatherData, io_delay: float, cpu_loops: int):
+        self._weather_data = weather_data
+        self.io_delay = io_delay
+        self.cpu_loops = cpu_loops
+        weather_data.register_observer(self)
+
+    def update(self):
+        if self.io_delay:
+            time.sleep(self.io_delay)
+        pressure = self._weather_data.get_pressure()
+        total = 0.0
+        for i in range(self.cpu_loops):
+            total += pressure * i
+        return total
+
+
+def bench_parallel_dispatch(counts: tuple = (1, 10, 100), io_delay: float = 0.002, cpu_loops: int = 2_000) -> None:
+    # Latencia de una notificación con N observadores: serie, hilos y procesos.
+    print(f"Una notificación, observadores con {io_delay * 1e3:.0f} ms de E/S y {cpu_loops} iteraciones de cálculo:")
+    for count in counts:
+        subjects = [("serie", WeatherData())]
+        subjects.append(("hilos", ParallelWeatherData("thread", max_workers=min(count, 32), timeout=30)))
+        subjects.append(("procesos", ParallelWeatherData("process", timeout=30)))
+        timings = []
+        for label, weather_data in subjects:
+            for _ in range(count):
+                _WorkObserver(weather_data, io_delay, cpu_loops)
+            weather_data.set_measurements(20.0, 50, 30.0)  # calienta el pool
+            rounds = 5
+            start = time.perf_counter()
+            for _ in range(rounds):
+                weather_data.set_measurements(20.0, 50, 30.0)
+            timings.append(f"{label} {(time.perf_counter() - start) / rounds * 1e3:8.1f} ms")
+            if isinstance(weather_data, ParallelWeatherData):
+                weather_data.shutdown()
+        print(f"  N={count:<4} " + "   ".join(timings))
+
+
+class _CountingClock:
+    # Reloj simulado que avanza 1/rate segundos por muestra
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _synthetic_feed(seconds: float, rate: int):
+    # Señal suave con ruido determinístico: (t, temperatura, humedad, presión)
+    for i in range(int(seconds * rate)):
+        t = i / rate
+        yield t, 20 + 5 * math.sin(t / 10) + (i % 7) * 0.01, 60 + (i % 5), 29.9 + math.sin(t) * 0.1
+
+
+def _count_updates(weather_data: WeatherData) -> list:
+    counter = [0]
+    for observer in list(weather_data._observers):
+        original = observer.update
+
+        def counted(original=original):
+            counter[0] += 1
+            return original()
+
+        observer.update = counted
+    return counter
+
+
+def bench_coalescing(seconds: float = 10.0, rate: int = 1_000) -> None:
+    # Feed sintético de 1 kHz con los tres displays: llamadas a update() y
+    # tiempo de CPU con notificación inmediata vs. ventanas de 250 ms.
+    print(f"Feed de {rate} Hz durante {seconds:.0f} s simulados, tres displays:")
+    for label, factory in (
+        ("WeatherData", lambda clock: WeatherData()),
+        ("Coalescing (ventana 250 ms)", lambda clock: CoalescingWeatherData(window=0.25, clock=clock)),
+        ("Coalescing (100 muestras)", lambda clock: CoalescingWeatherData(window=60, max_samples=100, clock=clock)),
+    ):
+        clock = _CountingClock()
+        weather_data = factory(clock)
+        CurrentConditionsDisplay(weather_data)
+        StatisticsDisplay(weather_data)
+        ForecastDisplay(weather_data)
+        counter = _count_updates(weather_data)
+        start = time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t, temperature, humidity, pressure in _synthetic_feed(seconds, rate):
+                clock.now = t
+                weather_data.set_measurements(temperature, humidity, pressure)
+            if isinstance(weather_data, CoalescingWeatherData):
+                weather_data.flush()
+        cpu = time.process_time() - start
+        print(f"  {label:<32} {counter[0]:>7} updates   CPU {cpu * 1e3:8.1f} ms")
+
+
+def bench_batch_delivery(samples: int = 100_000, batch_size: int = 5_000) -> None:
+    # StatisticsDisplay alimentado muestra a muestra vs. en lotes columnares
+    print(f"StatisticsDisplay con {samples} muestras:")
+    feed = list(_synthetic_feed(samples / 1_000, 1_000))
+    temperatures = [temperature for _, temperature, _, _ in feed]
+    humidities = [humidity for _, _, humidity, _ in feed]
+    pressures = [pressure for _, _, _, pressure in feed]
+
+    weather_data = WeatherData()
+    StatisticsDisplay(weather_data)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for temperature, humidity, pressure in zip(temperatures, humidities, pressures):
+            weather_data.set_measurements(temperature, humidity, pressure)
+    elapsed = time.perf_counter() - start
+    print(f"  {'set_measurements':<32} {samples / elapsed:12,.0f} muestras/s")
+
+    weather_data = WeatherData()
+    StatisticsDisplay(weather_data)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(0, samples, batch_size):
+            end = i + batch_size
+            batch = MeasurementBatch(temperatures[i:end], humidities[i:end], pressures[i:end])
+            weather_data.set_measurements_batch(batch)
+    elapsed = time.perf_counter() - start
+    print(f"  {f'set_measurements_batch ({batch_size})':<32} {samples / elapsed:12,.0f} muestras/s")
+
+
+class _ListRegistry:
+    # Registro original (lista con búsquedas lineales), como referencia
+    def __init__(self):
+        self._observers = []
+
+    def add(self, observer):
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def discard(self, observer):
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+
+def bench_registry(cycles: int = 10_000, sizes: tuple = (100, 1_000, 10_000)) -> None:
+    # Altas y bajas de `cycles` clientes sobre un registro con `size` observadores
+    print(f"{cycles} ciclos alta/baja:")
+    for size in sizes:
+        for label, registry_cls in (("lista", _ListRegistry), ("ObserverRegistry", ObserverRegistry)):
+            registry = registry_cls()
+            resident = [_SleepyObserver(0) for _ in range(size)]
+            for observer in resident:
+                registry.add(observer)
+            clients = [_SleepyObserver(0) for _ in range(cycles)]
+            start = time.perf_counter()
+            for observer in clients:
+                registry.add(observer)
+            for observer in clients:
+                registry.discard(observer)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<18} {size:>6} registrados {elapsed * 1e3:10.1f} ms")
+
+
+def bench_rolling(samples: int = 1_000_000, rate: int = 10) -> None:
+    # Ventanas de 1 min, 1 h y 24 h sobre un feed de `rate` Hz: costo por
+    # muestra, costo de consulta y memoria retenida
+    print(f"Ventanas 60 s / 1 h / 24 h, {samples} muestras a {rate} Hz:")
+    feed = [(t, temperature) for t, temperature, _, _ in _synthetic_feed(samples / rate, rate)]
+    rolling = RollingStatistics()
+    start = time.perf_counter()
+    for t, temperature in feed:
+        rolling.add(t, temperature)
+    elapsed = time.perf_counter() - start
+    print(f"  add                {samples / elapsed:12,.0f} muestras/s ({elapsed / samples * 1e6:.2f} us/muestra)")
+    start = time.perf_counter()
+    snapshot = rolling.snapshot()
+    print(f"  snapshot           {(time.perf_counter() - start) * 1e3:12.2f} ms")
+    for span, stats in snapshot.items():
+        print(f"  {span:>6} s: n={stats['count']:<8} avg={stats['avg']:.2f} p50={stats['p50']:.2f} p99={stats['p99']:.2f}")
+
+    # La memoria depende de la cantidad de tramos, no de la tasa: a 1 Hz
+    # alcanza con unos días simulados para llenar la ventana de 24 h
+    for days in (1, 2):
+        tracemalloc.start()
+        rolling = RollingStatistics()
+        for t, temperature, _, _ in _synthetic_feed(days * 86400, 1):
+            rolling.add(t, temperature)
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"  memoria tras {days} día(s) {retained / 1024:10.1f} KiB")
+
+
+def bench_history(capacity: int = 100_000, queries: int = 1_000, window: int = 3_600) -> None:
+    # Historial de `capacity` muestras: deque de Measurement vs. buffer circular
+    print(f"Historial de {capacity} muestras, {queries} consultas 'últimas {window}':")
+    feed = [Measurement(temperature, humidity, pressure, t) for t, temperature, humidity, pressure in _synthetic_feed(capacity / 10, 10)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    recent = collections.deque(maxlen=capacity)
+    for measurement in feed:
+        recent.append(Measurement(*measurement))
+    append_time = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(queries):
+        temperatures = [m.temperature for m in itertools.islice(recent, capacity - window, None)]
+    query_time = time.perf_counter() - start
+    print(f"  {'deque de Measurement':<22} append {append_time / capacity * 1e6:6.2f} us   "
+          f"consulta {query_time / queries * 1e6:9.1f} us   {retained / capacity:6.1f} B/muestra")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    history = MeasurementHistory(capacity)
+    for temperature, humidity, pressure, t in feed:
+        history.append(temperature, humidity, pressure, t)
+    append_time = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(queries):
+        temperatures = history.last(window).temperature
+    query_time = time.perf_counter() - start
+    print(f"  {'MeasurementHistory':<22} append {append_time / capacity * 1e6:6.2f} us   "
+          f"consulta {query_time / queries * 1e6:9.1f} us   {retained / capacity:6.1f} B/muestra")
+    del temperatures
+
+
+def bench_replay(samples: int = 200_000, batch_size: int = 4_096) -> None:
+    # Graba un log sintético y lo reproduce a toda velocidad con los tres
+    # displays, registro por registro y en lotes
+    print(f"Replay de un log de {samples} muestras con los tres displays:")
+    feed = list(_synthetic_feed(samples / 10, 10))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "station.log")
+        source = WeatherData()
+        recorder = MeasurementRecorder(source, path)
+        start = time.perf_counter()
+        for i in range(0, samples, batch_size):
+            chunk = feed[i:i + batch_size]
+            source.set_measurements_batch(MeasurementBatch(
+                [row[1] for row in chunk], [row[2] for row in chunk], [row[3] for row in chunk], [row[0] for row in chunk],
+            ))
+        recorder.close()
+        elapsed = time.perf_counter() - start
+        print(f"  {'grabación (lotes)':<28} {samples / elapsed:12,.0f} muestras/s   {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        for label, size in (("replay por registro", None), (f"replay en lotes ({batch_size})", batch_size)):
+            weather_data = WeatherData()
+            CurrentConditionsDisplay(weather_data)
+            StatisticsDisplay(weather_data)
+            ForecastDisplay(weather_data)
+            with MeasurementLog(path) as log, contextlib.redirect_stdout(io.StringIO()):
+                stats = replay(log, weather_data, batch_size=size)
+            print(f"  {label:<28} {stats.samples_per_second:12,.0f} muestras/s")
+
+
+def _sensor_feed(samples: int, seed: int = 1):
+    # Lecturas de sensor a 1 Hz con ruido y la resolución de cada instrumento
+    rng = random.Random(seed)
+    for i in range(samples):
+        yield (
+            round(20 + 3 * math.sin(i / 600) + rng.gauss(0, 0.03), 1),
+            round(60 + 10 * math.sin(i / 1800) + rng.gauss(0, 0.3)),
+            round(29.92 + 0.1 * math.sin(i / 3600) + rng.gauss(0, 0.002), 2),
+        )
+
+
+def bench_change_filter(samples: int = 86_400) -> None:
+    # Un día de lecturas con los tres displays: notificaciones entregadas y
+    # evitadas con el filtro de cambios (bandas por defecto y más anchas)
+    print(f"{samples} lecturas de sensor, tres displays:")
+    feed = list(_sensor_feed(samples))
+    for label, change_filter, bands in (
+        ("sin filtro", False, None),
+        ("filtro, banda 0", True, None),
+        ("filtro, banda 0.2 °C / 1 %", True, {"temperature": 0.2, "humidity": 1}),
+    ):
+        weather_data = WeatherData(change_filter=change_filter)
+        current = CurrentConditionsDisplay(weather_data)
+        StatisticsDisplay(weather_data)
+        ForecastDisplay(weather_data)
+        if bands:
+            current.interests = bands
+        counter = _count_updates(weather_data)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for reading in feed:
+                weather_data.set_measurements(*reading)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<34} {counter[0]:>7} updates   {weather_data.skipped_notifications:>7} evitadas   {elapsed * 1e3:8.1f} ms")
+
+
+class _SlowStream:
+    # Terminal lenta: cada write tarda `delay` segundos
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        time.sleep(self.delay)
+
+    def flush(self):
+        pass
+
+
+def bench_buffered_output(samples: int = 500, write_delay: float = 0.0002, rate: int = 1_000) -> None:
+    # Latencia de set_measurements con los tres displays imprimiendo en una
+    # terminal lenta: print directo vs. BufferedSink (con y sin límite de tasa)
+    print(f"{samples} mediciones a {rate} Hz, escrituras de {write_delay * 1e6:.0f} us:")
+    for label, make_sink in (
+        ("print directo", None),
+        ("BufferedSink", lambda stream: BufferedSink(stream)),
+        ("BufferedSink (10 redibujos/s)", lambda stream: BufferedSink(stream, max_rate=10)),
+    ):
+        stream = _SlowStream(write_delay)
+        sink = make_sink(stream) if make_sink else None
+        weather_data = WeatherData()
+        CurrentConditionsDisplay(weather_data, output=sink)
+        StatisticsDisplay(weather_data, output=sink)
+        ForecastDisplay(weather_data, output=sink)
+        latencies = []
+        with contextlib.redirect_stdout(stream):
+            for i in range(samples):
+                start = time.perf_counter()
+                weather_data.set_measurements(20.0 + i % 7, 50, 30.0 + i % 3)
+                latencies.append(time.perf_counter() - start)
+                time.sleep(max(0.0, 1 / rate - latencies[-1]))
+            if sink is not None:
+                sink.close()
+        print(f"  {label:<30} {_fmt_latencies(percentiles(latencies))}   {stream.writes:>5} writes")
+
+
+def bench_station_hub(stations: int = 200, readings: int = 250, shard_counts: tuple = (1, 2, 4)) -> None:
+    # Cientos de estaciones con sus tres displays: serie en un proceso vs.
+    # StationHub con N workers (la mejora depende de los núcleos disponibles)
+    feed = list(synthetic_feed(stations, readings))
+    print(f"{stations} estaciones x {readings} lecturas ({len(feed)} mediciones), {os.cpu_count()} CPU:")
+
+    weather = {}
+    for station_id in range(stations):
+        weather[station_id] = WeatherData()
+        default_displays(weather[station_id])
+    start = time.perf_counter()
+    for station_id, temperature, humidity, pressure in feed:
+        weather[station_id].set_measurements(temperature, humidity, pressure)
+    elapsed = time.perf_counter() - start
+    print(f"  {'serie (un proceso)':<22} {len(feed) / elapsed:12,.0f} mediciones/s")
+
+    for shards in shard_counts:
+        with StationHub(shards=shards) as hub:
+            start = time.perf_counter()
+            for reading in feed:
+                hub.set_measurements(*reading)
+            hub.drain()
+            elapsed = time.perf_counter() - start
+            metrics = hub.metrics()
+        max_lag = max(shard["max_lag"] for shard in metrics["shards"])
+        print(f"  {f'StationHub ({shards} shards)':<22} {len(feed) / elapsed:12,.0f} mediciones/s   lag máx {max_lag * 1e3:8.1f} ms")
+
+
+def bench_forecast(samples: int = 2_000_000) -> None:
+    # Pronóstico sobre una serie de presiones: ForecastDisplay muestra a
+    # muestra vs. ForecastEngine (el pedido original hablaba de 10M muestras;
+    # el camino por muestra tarda varios segundos por millón)
+    print(f"Pronóstico de {samples} presiones:")
+    rng = random.Random(2)
+    pressures = array("d", (round(29.9 + 0.1 * math.sin(i / 5_000) + rng.gauss(0, 0.005), 2) for i in range(samples)))
+
+    weather_data = WeatherData()
+    ForecastDisplay(weather_data, output=NullOutput())
+    start = time.perf_counter()
+    for pressure in pressures:
+        weather_data.set_measurements(20.0, 50, pressure)
+    elapsed = time.perf_counter() - start
+    print(f"  {'ForecastDisplay.update':<28} {samples / elapsed:14,.0f} muestras/s")
+
+    for label, engine in (
+        ("ForecastEngine", ForecastEngine()),
+        ("ForecastEngine (EMA 0.05)", ForecastEngine(ema_alpha=0.05, threshold=0.0005)),
+    ):
+        start = time.perf_counter()
+        engine.trends(pressures)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<28} {samples / elapsed:14,.0f} muestras/s")
+
+
+class _BareWeatherData(WeatherData):
+    # notify_observers como era antes de la instrumentación
+    def notify_observers(self):
+        for observer in self._observers:
+            observer.update()
+
+
+def bench_instrumentation(samples: int = 200_000) -> None:
+    # Costo de set_measurements con los tres displays: bucle original,
+    # instrumentación desactivada y activada
+    print(f"{samples} mediciones, tres displays sin salida:")
+    for label, factory, enabled in (
+        ("bucle original", _BareWeatherData, False),
+        ("instrumentación desactivada", WeatherData, False),
+        ("instrumentación activada", WeatherData, True),
+    ):
+        weather_data = factory()
+        output = NullOutput()
+        CurrentConditionsDisplay(weather_data, output=output)
+        StatisticsDisplay(weather_data, output=output)
+        ForecastDisplay(weather_data, output=output)
+        if enabled:
+            weather_data.enable_instrumentation()
+        start = time.perf_counter()
+        for i in range(samples):
+            weather_data.set_measurements(20.0 + i % 7, 50, 30.0)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<30} {elapsed / samples * 1e9:8.0f} ns/llamada")
+
+
+BENCHMARKS = {
+    "async_dispatch": bench_async_dispatch,
+    "parallel_dispatch": bench_parallel_dispatch,
+    "coalescing": bench_coalescing,
+    "batch_delivery": bench_batch_delivery,
+    "registry": bench_registry,
+    "rolling": bench_rolling,
+    "history": bench_history,
+    "replay": bench_replay,
+    "change_filter": bench_change_filter,
+    "buffered_output": bench_buffered_output,
+    "station_hub": bench_station_hub,
+    "forecast": bench_forecast,
+    "instrumentation": bench_instrumentation,
+}
+
+
+def main(names: list) -> None:
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -14,11 +14,34 @@ class Subject(ABC):
         pass
 
 class Observer(ABC):
+    # Campos que le importan al observador y su banda muerta, p. ej.
+    # {"pressure": 0.01}. Con el filtro de cambios del sujeto activo, update()
+    # sólo se llama cuando alguno se movió más que su banda desde la última
+    # notificación entregada. None: todos los cambios (sin filtro).
+    interests = None
+
     @abstractmethod
     def update(self):
         pass
 
+class BatchObserver(Observer):
+    # Canal push adicional: recibe muchas muestras juntas (MeasurementBatch)
+    # en una sola llamada. update() sigue usándose para mediciones sueltas.
+    @abstractmethod
+    def update_batch(self, batch):
+        pass
+
 class DisplayElement(ABC):
+    # Adónde van las líneas de display(): None las imprime en el momento;
+    # un output.BufferedSink las escribe desde otro hilo
+    output = None
+
     @abstractmethod
     def display(self):
         pass
+
+    def render(self, text: str):
+        if self.output is None:
+            print(text)
+        else:
+            self.output.write(self, text)
@@ -0,0 +1,57 @@
+import time
+
+from Subject import Measurement, WeatherData
+
+
+class CoalescingWeatherData(WeatherData):
+    # Junta las mediciones que llegan en ráfaga y notifica una sola vez por
+    # ventana: cuando pasan `window` segundos desde la primera muestra
+    # pendiente o cuando se juntan `max_samples` muestras. Durante update()
+    # los getters devuelven la última medición y get_window_samples() todas
+    # las de la ventana.
+    #
+    # No hay temporizador: la ventana se cierra con la primera muestra que
+    # llega después de vencida. flush() entrega lo pendiente (p. ej. al
+    # terminar el flujo).
+    def __init__(self, window: float = 0.25, max_samples: int = None, clock=time.monotonic):
+        super().__init__()
+        self._window = window
+        self._max_samples = max_samples
+        self._clock = clock
+        self._pending = []
+        self._window_start = None
+        self._window_samples = ()
+
+    def set_measurements(self, temperature: float, humidity: float, pressure: float):
+        now = self._clock()
+        if self._pending and now - self._window_start >= self._window:
+            self.flush()
+        self._store_measurement(temperature, humidity, pressure)
+        if not self._pending:
+            self._window_start = now
+        self._pending.append(Measurement(temperature, humidity, pressure, self._timestamp))
+        if self._max_samples is not None and len(self._pending) >= self._max_samples:
+            self.flush()
+
+    def set_measurements_batch(self, batch):
+        # Un lote ya es una ráfaga: cierra la ventana pendiente y lo entrega
+        # como ventanas propias (de a max_samples muestras si hay límite)
+        self.flush()
+        samples = tuple(self._store_batch(batch))
+        step = self._max_samples or len(samples) or 1
+        for start in range(0, len(samples), step):
+            window = samples[start:start + step]
+            self._temperature, self._humidity, self._pressure, self._timestamp = window[-1]
+            self._window_samples = window
+            self.measurements_changed()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._window_samples = tuple(self._pending)
+        self._pending = []
+        self._window_start = None
+        self.measurements_changed()
+
+    def get_window_samples(self) -> tuple:
+        return self._window_samples
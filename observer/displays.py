@@ -1,11 +1,18 @@
+from functools import reduce
+from operator import add
+
+from rolling import RollingStatistics
 from Subject import WeatherData
-from clases_base_abstractas import DisplayElement, Observer
+from clases_base_abstractas import BatchObserver, DisplayElement, Observer
 
 
 class CurrentConditionsDisplay(Observer, DisplayElement):
-    def __init__(self, weather_data: WeatherData):
+    interests = {"temperature": 0.0, "humidity": 0.0}
+
+    def __init__(self, weather_data: WeatherData, output=None):
         self._temperature = 0.0
         self._humidity = 0.0
+        self.output = output
         self._weather_data = weather_data # Mantiene una referencia al sujeto
         weather_data.register_observer(self)
 
@@ -15,14 +22,18 @@ class CurrentConditionsDisplay(Observer, DisplayElement):
         self.display()
 
     def display(self):
-        print(f"Current conditions: {self._temperature}°C degrees and {self._humidity}% humidity")
+        self.render(f"Current conditions: {self._temperature}°C degrees and {self._humidity}% humidity")
 
-class StatisticsDisplay(Observer, DisplayElement):
-    def __init__(self, weather_data: WeatherData):
+class StatisticsDisplay(BatchObserver, DisplayElement):
+    # Con `windows` (segundos, p. ej. (60, 3600, 86400)) además muestra
+    # estadísticas de ventanas móviles sobre los timestamps de las mediciones
+    def __init__(self, weather_data: WeatherData, windows=None, output=None):
         self._max_temp = -float('inf')
         self._min_temp = float('inf')
         self._temp_sum = 0.0
         self._num_readings = 0
+        self._rolling = RollingStatistics(windows) if windows else None
+        self.output = output
         self._weather_data = weather_data
         weather_data.register_observer(self)
 
@@ -32,16 +43,45 @@ class StatisticsDisplay(Observer, DisplayElement):
         self._num_readings += 1
         self._max_temp = max(self._max_temp, temperature)
         self._min_temp = min(self._min_temp, temperature)
+        if self._rolling is not None:
+            self._rolling.add(self._weather_data.get_measurement().timestamp, temperature)
+        self.display()
+
+    def update_batch(self, batch):
+        temperatures = batch.temperature
+        if not temperatures:
+            return
+        # reduce suma en el mismo orden que update(), con el mismo resultado
+        self._temp_sum = reduce(add, temperatures, self._temp_sum)
+        self._num_readings += len(temperatures)
+        self._max_temp = max(self._max_temp, max(temperatures))
+        self._min_temp = min(self._min_temp, min(temperatures))
+        if self._rolling is not None:
+            self._rolling.add_many(batch.timestamp, temperatures)
         self.display()
 
+    def get_rolling_statistics(self) -> dict:
+        return self._rolling.snapshot() if self._rolling is not None else {}
+
     def display(self):
         avg_temp = self._temp_sum / self._num_readings if self._num_readings > 0 else "N/A"
-        print(f"Avg/Max/Min temperature = {avg_temp}/{self._max_temp}/{self._min_temp}")
+        lines = [f"Avg/Max/Min temperature = {avg_temp}/{self._max_temp}/{self._min_temp}"]
+        for span, stats in self.get_rolling_statistics().items():
+            # Ventana vacía: p. ej. sólo lecturas NaN de un sensor fallado
+            values = (
+                f"{stats['avg']:.2f}/{stats['max']}/{stats['min']}/{stats['p95']:.2f}"
+                if stats["count"] else "N/A"
+            )
+            lines.append(f"  Last {span:g}s: Avg/Max/Min/p95 temperature = {values}")
+        self.render("\n".join(lines))
 
-class ForecastDisplay(Observer, DisplayElement):
-    def __init__(self, weather_data: WeatherData):
+class ForecastDisplay(BatchObserver, DisplayElement):
+    # Sin interests: una presión que no cambió también es un dato ("More of
+    # the same"), así que el filtro de cambios no debe saltearla
+    def __init__(self, weather_data: WeatherData, output=None):
         self._current_pressure = 29.92 # Presión por defecto
         self._last_pressure = 29.92
+        self.output = output
         self._weather_data = weather_data
         weather_data.register_observer(self)
 
@@ -50,6 +90,16 @@ class ForecastDisplay(Observer, DisplayElement):
         self._current_pressure = self._weather_data.get_pressure()
         self.display()
 
+    def update_batch(self, batch):
+        # El pronóstico sólo depende de las dos últimas presiones; para la
+        # serie completa ver forecast.ForecastEngine
+        pressures = batch.pressure
+        if not pressures:
+            return
+        self._last_pressure = pressures[-2] if len(pressures) > 1 else self._current_pressure
+        self._current_pressure = pressures[-1]
+        self.display()
+
     def display(self):
         forecast = ""
         if self._current_pressure > self._last_pressure:
@@ -58,5 +108,5 @@ class ForecastDisplay(Observer, DisplayElement):
             forecast = "More of the same"
         elif self._current_pressure < self._last_pressure:
             forecast = "Watch out for cooler, rainy weather"
-        print(f"Forecast: {forecast}")
+        self.render(f"Forecast: {forecast}")
 
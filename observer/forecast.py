@@ -0,0 +1,80 @@
+import math
+from array import array
+from itertools import accumulate, chain, repeat
+from operator import gt, lt, sub
+
+# Tendencias, con el mismo texto que ForecastDisplay
+IMPROVING = 1
+SAME = 0
+COOLER = -1
+UNKNOWN = 2  # alguna presión NaN: ForecastDisplay no muestra pronóstico
+
+FORECASTS = {
+    IMPROVING: "Improving weather on the way!",
+    SAME: "More of the same",
+    COOLER: "Watch out for cooler, rainy weather",
+    UNKNOWN: "",
+}
+
+
+def _classify(values, previous) -> array:
+    # signo(valor - anterior) con map sobre operadores de C: sin bytecode por muestra
+    return array("b", map(sub, map(gt, values, previous), map(lt, values, previous)))
+
+
+class ForecastEngine:
+    # Pronóstico de ForecastDisplay sobre series enteras de presión. Guarda
+    # el último valor entre llamadas, así una serie larga se puede procesar
+    # por tramos con el mismo resultado que de una vez.
+    #
+    # Por defecto compara cada presión con la anterior, igual que
+    # ForecastDisplay.update(). Con ema_alpha compara la media móvil
+    # exponencial con su valor anterior (pendiente suavizada) y sólo la
+    # cuenta si supera `threshold`, para que el ruido no cambie el pronóstico.
+    def __init__(self, initial_pressure: float = 29.92, ema_alpha: float = None, threshold: float = 0.0):
+        if ema_alpha is not None and not 0 < ema_alpha <= 1:
+            raise ValueError("ema_alpha debe estar en (0, 1]")
+        self._last = initial_pressure
+        self._ema = initial_pressure
+        self._alpha = ema_alpha
+        self._threshold = threshold
+
+    def trends(self, pressures) -> array:
+        pressures = array("d", pressures)
+        if not pressures:
+            return array("b")
+        if self._alpha is None:
+            result = self._raw_trends(pressures)
+        else:
+            result = self._ema_trends(pressures)
+        self._last = pressures[-1]
+        return result
+
+    def _raw_trends(self, pressures: array) -> array:
+        previous = array("d", [self._last])
+        previous.extend(pressures[:-1])
+        if not any(map(math.isnan, chain(pressures, previous))):
+            return _classify(pressures, previous)
+        # Con NaN ninguna comparación da verdadero: va muestra por muestra
+        return array("b", map(_classify_one, pressures, previous))
+
+    def _ema_trends(self, pressures: array) -> array:
+        alpha = self._alpha
+        ema = array("d", accumulate(pressures, lambda average, value: average + alpha * (value - average), initial=self._ema))
+        self._ema = ema[-1]
+        slopes = array("d", map(sub, ema[1:], ema[:-1]))
+        threshold = self._threshold
+        return array("b", map(sub, map(gt, slopes, repeat(threshold)), map(lt, slopes, repeat(-threshold))))
+
+    def forecasts(self, pressures) -> list:
+        return [FORECASTS[trend] for trend in self.trends(pressures)]
+
+
+def _classify_one(value: float, previous: float) -> int:
+    if value > previous:
+        return IMPROVING
+    if value == previous:
+        return SAME
+    if value < previous:
+        return COOLER
+    return UNKNOWN
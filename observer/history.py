@@ -0,0 +1,153 @@
+import bisect
+import mmap
+import os
+import struct
+
+from Subject import Measurement, MeasurementBatch
+
+_MAGIC = b"WDHIST01"
+_HEADER = struct.Struct("<8sqq")  # magic, capacidad, muestras escritas
+_HEADER_SIZE = 32  # el encabezado se rellena hasta 32 bytes
+_COLUMNS = ("timestamp", "temperature", "humidity", "pressure")
+
+
+class HistoryView:
+    # Vista sin copia de un tramo del historial: un memoryview('d') por
+    # columna, con la misma interfaz que MeasurementBatch (sirve para
+    # update_batch). Refleja la memoria del buffer: si se siguen agregando
+    # muestras, las más viejas de la vista se pisan; to_batch() la copia.
+    __slots__ = _COLUMNS
+
+    def __init__(self, timestamp, temperature, humidity, pressure):
+        self.timestamp = timestamp
+        self.temperature = temperature
+        self.humidity = humidity
+        self.pressure = pressure
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __iter__(self):
+        return map(Measurement, self.temperature, self.humidity, self.pressure, self.timestamp)
+
+    def to_batch(self) -> MeasurementBatch:
+        return MeasurementBatch(self.temperature, self.humidity, self.pressure, self.timestamp)
+
+
+class MeasurementHistory:
+    # Historial de capacidad fija en un buffer circular de doubles, sin un
+    # objeto Python por muestra.
+    #
+    # Cada columna guarda cada muestra dos veces (en i y en i + capacidad):
+    # así las últimas n muestras siempre son un tramo contiguo y last() /
+    # since() devuelven memoryviews sin copiar, a costa de duplicar escrituras
+    # y memoria.
+    #
+    # Con spill_path el buffer vive en un archivo mapeado en memoria en lugar
+    # de la RAM del proceso: admite capacidades grandes (el sistema operativo
+    # pagina a disco) y el historial sobrevive a un reinicio.
+    def __init__(self, capacity: int, spill_path: str = None):
+        if capacity < 1:
+            raise ValueError("La capacidad del historial debe ser positiva")
+        self.capacity = capacity
+        self._mmap = None
+        column_bytes = 2 * capacity * 8
+        if spill_path is None:
+            self._buffer = memoryview(bytearray(_HEADER_SIZE + len(_COLUMNS) * column_bytes))
+            self._count = 0
+        else:
+            self._buffer = self._open_spill(spill_path, _HEADER_SIZE + len(_COLUMNS) * column_bytes)
+        self._columns = tuple(
+            self._buffer[_HEADER_SIZE + i * column_bytes:_HEADER_SIZE + (i + 1) * column_bytes].cast("d")
+            for i in range(len(_COLUMNS))
+        )
+
+    def _open_spill(self, path: str, size: int) -> memoryview:
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT)
+        try:
+            if exists:
+                if os.path.getsize(path) != size:
+                    raise ValueError(f"Historial con otra capacidad: {path}")
+            else:
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        buffer = memoryview(self._mmap)
+        if exists:
+            magic, capacity, count = _HEADER.unpack_from(buffer)
+            if magic != _MAGIC or capacity != self.capacity:
+                buffer.release()
+                self._mmap.close()
+                raise ValueError(f"Historial con otra capacidad: {path}")
+            self._count = count
+        else:
+            self._count = 0
+            _HEADER.pack_into(buffer, 0, _MAGIC, self.capacity, 0)
+        return buffer
+
+    def append(self, temperature: float, humidity: float, pressure: float, timestamp: float):
+        capacity = self.capacity
+        index = self._count % capacity
+        mirror = index + capacity
+        timestamps, temperatures, humidities, pressures = self._columns
+        timestamps[index] = timestamps[mirror] = timestamp
+        temperatures[index] = temperatures[mirror] = temperature
+        humidities[index] = humidities[mirror] = humidity
+        pressures[index] = pressures[mirror] = pressure
+        self._count += 1
+        if self._mmap is not None:
+            _HEADER.pack_into(self._buffer, 0, _MAGIC, capacity, self._count)
+
+    def extend(self, batch):
+        # Copia columnas enteras por tramos en lugar de muestra por muestra
+        capacity = self.capacity
+        sources = [memoryview(getattr(batch, name)) for name in _COLUMNS]
+        n = len(batch)
+        skipped = max(0, n - capacity)  # se pisarían en esta misma llamada
+        self._count += skipped
+        position = skipped
+        while position < n:
+            index = self._count % capacity
+            run = min(capacity - index, n - position)
+            for column, source in zip(self._columns, sources):
+                chunk = source[position:position + run]
+                column[index:index + run] = chunk
+                column[index + capacity:index + capacity + run] = chunk
+            self._count += run
+            position += run
+        if self._mmap is not None:
+            _HEADER.pack_into(self._buffer, 0, _MAGIC, capacity, self._count)
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def total(self) -> int:
+        # Muestras agregadas desde el principio, incluidas las ya pisadas
+        return self._count
+
+    def last(self, n: int) -> HistoryView:
+        n = max(0, min(n, len(self)))
+        end = self._count % self.capacity
+        if end < n:
+            end += self.capacity
+        return HistoryView(*(column[end - n:end] for column in self._columns))
+
+    def since(self, timestamp: float) -> HistoryView:
+        # Muestras con timestamp >= `timestamp` (el historial está en orden)
+        view = self.last(len(self))
+        start = bisect.bisect_left(view.timestamp, timestamp)
+        return HistoryView(*(getattr(view, name)[start:] for name in _COLUMNS))
+
+    def flush(self):
+        if self._mmap is not None:
+            self._mmap.flush()
+
+    def close(self):
+        # Las vistas entregadas deben liberarse antes (memoryview.release())
+        for column in self._columns:
+            column.release()
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
@@ -0,0 +1,95 @@
+import time
+from collections import deque
+
+from metrics import percentiles
+
+
+class _ObserverStats:
+    __slots__ = ("name", "calls", "errors", "total_seconds", "latencies", "last_error")
+
+    def __init__(self, name: str, window: int):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latencies = deque(maxlen=window)
+        self.last_error = None
+
+
+class NotificationStats:
+    # Métricas de notificación por observador: llamadas, errores, tiempo
+    # acumulado y percentiles de latencia sobre las últimas `window` llamadas.
+    # call() además aísla las excepciones: se cuentan y la notificación sigue
+    # con el próximo observador.
+    def __init__(self, window: int = 1_024, clock=time.perf_counter):
+        self._window = window
+        self._clock = clock
+        self._observers = {}  # id(observador) -> _ObserverStats
+
+    def _stats_for(self, observer) -> _ObserverStats:
+        stats = self._observers.get(id(observer))
+        if stats is None:
+            name = f"{type(observer).__name__}@{id(observer):x}"
+            stats = self._observers[id(observer)] = _ObserverStats(name, self._window)
+        return stats
+
+    def call(self, observer, method, *args):
+        stats = self._stats_for(observer)
+        clock = self._clock
+        start = clock()
+        try:
+            method(*args)
+        except Exception as exc:
+            stats.errors += 1
+            stats.last_error = repr(exc)
+        finally:
+            elapsed = clock() - start
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            stats.latencies.append(elapsed)
+
+    def forget(self, observer):
+        self.forget_id(id(observer))
+
+    def forget_id(self, key: int):
+        # Para observadores ya liberados, de los que sólo queda el id
+        self._observers.pop(key, None)
+
+    def snapshot(self, qs=(50, 95, 99)) -> dict:
+        return {
+            stats.name: {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "total_seconds": stats.total_seconds,
+                "last_error": stats.last_error,
+                **percentiles(stats.latencies, qs),
+            }
+            for stats in self._observers.values()
+        }
+
+    def to_prometheus(self, prefix: str = "weather_observer", qs=(50, 95, 99)) -> str:
+        # Formato de texto de Prometheus: contadores y un summary por observador
+        lines = [
+            f"# HELP {prefix}_calls_total Llamadas de notificación por observador.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        snapshot = self.snapshot(qs)
+        for name, stats in snapshot.items():
+            lines.append(f'{prefix}_calls_total{{observer="{name}"}} {stats["calls"]}')
+        lines += [
+            f"# HELP {prefix}_errors_total Excepciones aisladas por observador.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for name, stats in snapshot.items():
+            lines.append(f'{prefix}_errors_total{{observer="{name}"}} {stats["errors"]}')
+        lines += [
+            f"# HELP {prefix}_update_seconds Latencia de notificación por observador.",
+            f"# TYPE {prefix}_update_seconds summary",
+        ]
+        for name, stats in snapshot.items():
+            for q in qs:
+                if f"p{q}" in stats:
+                    lines.append(f'{prefix}_update_seconds{{observer="{name}",quantile="{q / 100:g}"}} {stats[f"p{q}"]!r}')
+            lines.append(f'{prefix}_update_seconds_sum{{observer="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'{prefix}_update_seconds_count{{observer="{name}"}} {stats["calls"]}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,13 @@
+import math
+
+
+def percentiles(samples, qs=(50, 95, 99)) -> dict:
+    # Percentiles por rango más cercano; {} si no hay muestras
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {}
+    for q in qs:
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        result[f"p{q}"] = ordered[rank - 1]
+    return result
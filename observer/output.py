@@ -0,0 +1,82 @@
+import sys
+import threading
+import time
+
+
+class NullOutput:
+    # Descarta lo que dibujan los displays (benchmarks, workers sin pantalla)
+    def write(self, display, text: str):
+        pass
+
+
+class BufferedSink:
+    # Salida de los displays fuera del camino de notificación: render() sólo
+    # deja el texto en memoria y un hilo escritor lo vuelca cada
+    # `flush_interval` segundos con una sola escritura.
+    #
+    # Con max_rate cada display se redibuja como mucho max_rate veces por
+    # segundo: si vuelve a dibujar antes, el texto nuevo reemplaza al
+    # pendiente (se muestra siempre el último estado) y se cuenta en dropped.
+    #
+    # stream=None escribe en el sys.stdout vigente al momento de volcar.
+    def __init__(self, stream=None, max_rate: float = None, flush_interval: float = 0.05, clock=time.monotonic):
+        self._stream = stream
+        self._min_gap = 1 / max_rate if max_rate else 0.0
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # mantiene el orden entre volcados
+        self._queue = []  # textos en orden de llegada (sin límite de tasa)
+        self._pending = {}  # display -> último texto sin escribir
+        self._last_drawn = {}  # display -> momento del último redibujo
+        self._wake = threading.Event()
+        self._closed = False
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="display-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, display, text: str):
+        with self._lock:
+            if not self._min_gap:
+                self._queue.append(text)
+            else:
+                if display in self._pending:
+                    self.dropped += 1
+                self._pending[display] = text
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush(force=True)
+
+    def flush(self, force: bool = False):
+        # Vuelca lo pendiente; con force ignora el límite de tasa
+        with self._write_lock:
+            now = self._clock()
+            with self._lock:
+                texts, self._queue = self._queue, []
+                for display, text in list(self._pending.items()):
+                    if force or now - self._last_drawn.get(display, -float("inf")) >= self._min_gap:
+                        texts.append(text)
+                        self._last_drawn[display] = now
+                        del self._pending[display]
+            if texts:
+                stream = self._stream or sys.stdout
+                stream.write("\n".join(texts) + "\n")
+                stream.flush()
+
+    def close(self):
+        # Escribe todo lo pendiente y termina el hilo escritor
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from registry import ObserverRegistry
+from Subject import WeatherData
+
+
+def _run_update(observer):
+    return observer.update()
+
+
+class ParallelWeatherData(WeatherData):
+    # Llama a update() de todos los observadores en paralelo sobre un pool de
+    # hilos o de procesos y espera como máximo `timeout` segundos. Los que no
+    # terminan a tiempo quedan en last_timed_out en vez de demorar al resto.
+    # Mientras un update vencido siga corriendo, las notificaciones nuevas no
+    # le mandan otro (también figura en last_timed_out); si todavía no había
+    # empezado, se cancela.
+    #
+    # Con executor="process" cada observador corre sobre una copia (pickle)
+    # de sí mismo y del sujeto: sus cambios de estado no vuelven al proceso
+    # principal, sólo lo que devuelve update() (en last_results).
+    def __init__(self, executor: str = "thread", max_workers: int = None, timeout: float = 1.0):
+        super().__init__()
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Executor desconocido: {executor}")
+        pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        self._executor = pool_cls(max_workers=max_workers)
+        self._timeout = timeout
+        self.last_results = {}
+        self.last_errors = {}
+        self.last_timed_out = []
+        self.timeouts = {}  # observador -> cantidad de vencimientos acumulados
+        self._pending = {}  # observador -> future vencido que sigue corriendo
+
+    def __getstate__(self):
+        # Lo que viaja a otro proceso: sólo las mediciones. El historial, las
+        # métricas y el filtro de cambios son del proceso principal.
+        state = self.__dict__.copy()
+        for name in (
+            "_executor", "_observers", "last_results", "last_errors", "last_timed_out", "timeouts", "_pending",
+            "_history", "_stats", "_delivered",
+        ):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor = None
+        self._observers = ObserverRegistry()
+        self._pending = {}
+        self._history = None
+        self._stats = None
+        self._delivered = {}
+
+    def remove_observer(self, observer):
+        super().remove_observer(observer)
+        self._pending.pop(observer, None)
+
+    def enable_instrumentation(self, window: int = 1_024):
+        # Los updates corren en el pool, fuera de _deliver: NotificationStats
+        # quedaría vacío. Sus métricas son last_errors, last_timed_out y timeouts.
+        raise NotImplementedError("ParallelWeatherData no admite instrumentación: ver last_errors y timeouts")
+
+    def notify_observers(self):
+        busy = []
+        futures = {}
+        for observer in self._observers:
+            pending = self._pending.get(observer)
+            if pending is not None:
+                if not pending.done():
+                    busy.append(observer)
+                    continue
+                del self._pending[observer]
+            futures[self._executor.submit(_run_update, observer)] = observer
+        done, not_done = wait_futures(futures, timeout=self._timeout)
+
+        self.last_results = {}
+        self.last_errors = {}
+        for future in done:
+            observer = futures[future]
+            error = future.exception()
+            if error is None:
+                self.last_results[observer] = future.result()
+            else:
+                self.last_errors[observer] = error
+
+        # Los que siguen corriendo no se pueden interrumpir: se reportan y no
+        # reciben otro update hasta que terminen. Los que no empezaron se cancelan.
+        self.last_timed_out = busy
+        for future, observer in futures.items():
+            if future not in not_done:
+                continue
+            if not future.cancel():
+                self._pending[observer] = future
+            self.last_timed_out.append(observer)
+        for observer in self.last_timed_out:
+            self.timeouts[observer] = self.timeouts.get(observer, 0) + 1
+
+    def set_measurements_batch(self, batch):
+        # Una notificación en paralelo por muestra, como con set_measurements:
+        # last_results y compañía quedan con los de la última muestra
+        for _ in self._store_batch(batch):
+            self.notify_observers()
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
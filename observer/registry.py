@@ -0,0 +1,61 @@
+import weakref
+
+
+class ObserverRegistry:
+    # Registro ordenado de observadores con alta, baja y pertenencia en O(1)
+    # (un dict indexado por id, que conserva el orden de alta).
+    #
+    # Recorrerlo devuelve una foto que sólo se rearma cuando el registro
+    # cambia: un observador puede darse de baja, o dar de alta a otro, dentro
+    # de update() sin romper la notificación en curso. El cambio rige desde
+    # la notificación siguiente.
+    #
+    # Con weak=True guarda referencias débiles: un display que ya nadie usa
+    # se da de baja solo cuando se libera, y on_reap(id) avisa al dueño para
+    # que limpie lo que guardaba de él (antes de que el id se reutilice).
+    __slots__ = ("_entries", "_weak", "_snapshot", "_on_reap")
+
+    def __init__(self, weak: bool = False, on_reap=None):
+        self._entries = {}
+        self._weak = weak
+        self._snapshot = None
+        self._on_reap = on_reap
+
+    def add(self, observer) -> bool:
+        key = id(observer)
+        if key in self._entries:
+            return False
+        if self._weak:
+            self._entries[key] = weakref.ref(observer, lambda ref, key=key: self._reap(key, ref))
+        else:
+            self._entries[key] = observer
+        self._snapshot = None
+        return True
+
+    def discard(self, observer) -> bool:
+        if self._entries.pop(id(observer), None) is None:
+            return False
+        self._snapshot = None
+        return True
+
+    def _reap(self, key, ref):
+        # Callback de weakref: el observador se liberó
+        if self._entries.get(key) is ref:
+            del self._entries[key]
+            self._snapshot = None
+            if self._on_reap is not None:
+                self._on_reap(key)
+
+    def __contains__(self, observer) -> bool:
+        return id(observer) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self._entries.values())
+        if self._weak:
+            return (observer for observer in (ref() for ref in snapshot) if observer is not None)
+        return iter(snapshot)
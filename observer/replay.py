@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import NamedTuple
+
+from clases_base_abstractas import BatchObserver
+from Subject import MeasurementBatch, WeatherData
+
+# Formato del log: encabezado de 16 bytes y registros fijos de 32 bytes
+# (timestamp, temperatura, humedad, presión) como doubles little-endian.
+_MAGIC = b"WDLOG001"
+_HEADER_SIZE = 16
+RECORD = struct.Struct("<dddd")
+_FIELDS = 4
+
+
+class MeasurementRecorder(BatchObserver):
+    # Observador que agrega cada medición del sujeto al log binario. Si el
+    # log ya existe y termina en un registro incompleto (la estación se cortó
+    # a mitad de una escritura), lo descarta antes de agregar, para que los
+    # registros nuevos queden alineados.
+    def __init__(self, weather_data: WeatherData, path: str):
+        header = _MAGIC.ljust(_HEADER_SIZE, b"\0")
+        with open(path, "ab+") as f:
+            f.seek(0)
+            existing = f.read(_HEADER_SIZE)
+        if not header.startswith(existing) and existing[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"No es un log de mediciones: {path}")
+        self._file = open(path, "ab")
+        size = self._file.seek(0, os.SEEK_END)
+        if size < _HEADER_SIZE:
+            # Log nuevo, o cortado antes de terminar el encabezado
+            self._file.truncate(0)
+            self._file.write(header)
+        else:
+            end = _HEADER_SIZE + (size - _HEADER_SIZE) // RECORD.size * RECORD.size
+            if end != size:
+                self._file.truncate(end)
+        self._weather_data = weather_data
+        weather_data.register_observer(self)
+
+    def update(self):
+        m = self._weather_data.get_measurement()
+        self._file.write(RECORD.pack(m.timestamp, m.temperature, m.humidity, m.pressure))
+
+    def update_batch(self, batch):
+        # Intercala las columnas en un solo array en vez de empaquetar fila por fila
+        records = array("d", bytes(len(batch) * RECORD.size))
+        for offset, name in enumerate(("timestamp", "temperature", "humidity", "pressure")):
+            records[offset::_FIELDS] = array("d", getattr(batch, name))
+        if sys.byteorder != "little":
+            records.byteswap()
+        self._file.write(records)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._weather_data.remove_observer(self)
+        self._file.close()
+
+
+class MeasurementLog:
+    # Log mapeado en memoria (sólo lectura). Un registro incompleto al final
+    # (p. ej. si la estación se cortó a mitad de una escritura) se ignora.
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"No es un log de mediciones: {path}")
+        count = (len(self._mmap) - _HEADER_SIZE) // RECORD.size
+        end = _HEADER_SIZE + count * RECORD.size
+        if sys.byteorder == "little":
+            self._values = memoryview(self._mmap)[_HEADER_SIZE:end].cast("d")
+        else:
+            values = array("d", self._mmap[_HEADER_SIZE:end])
+            values.byteswap()
+            self._values = memoryview(values)
+
+    def __len__(self) -> int:
+        return len(self._values) // _FIELDS
+
+    def batch(self, start: int = 0, stop: int = None) -> MeasurementBatch:
+        # Registros [start, stop) como lote columnar (copia cada columna)
+        values = self._values[start * _FIELDS:(len(self) if stop is None else stop) * _FIELDS]
+        return MeasurementBatch(values[1::_FIELDS], values[2::_FIELDS], values[3::_FIELDS], values[0::_FIELDS])
+
+    def close(self):
+        self._values.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ReplayStats(NamedTuple):
+    samples: int
+    seconds: float
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds else float("inf")
+
+
+def replay(log: MeasurementLog, weather_data: WeatherData, speed: float = None, batch_size: int = None,
+           clock=time.monotonic, sleep=time.sleep) -> ReplayStats:
+    # Reproduce el log sobre `weather_data`. Sin `speed` va a toda velocidad;
+    # con speed=60 una hora grabada dura un minuto.
+    #
+    # Sin batch_size llama a set_measurements por registro (los timestamps
+    # son los de la reproducción). Con batch_size entrega lotes por
+    # set_measurements_batch, que conservan los timestamps grabados; el ritmo
+    # se respeta al comienzo de cada lote.
+    total = len(log)
+    step = batch_size or 4_096
+    started = clock()
+    first_timestamp = None
+    for start in range(0, total, step):
+        batch = log.batch(start, min(start + step, total))
+        timestamps = batch.timestamp
+        if first_timestamp is None:
+            first_timestamp = timestamps[0]
+        if batch_size:
+            if speed:
+                _wait_until(started + (timestamps[0] - first_timestamp) / speed, clock, sleep)
+            weather_data.set_measurements_batch(batch)
+            continue
+        set_measurements = weather_data.set_measurements
+        for timestamp, temperature, humidity, pressure in zip(timestamps, batch.temperature, batch.humidity, batch.pressure):
+            if speed:
+                _wait_until(started + (timestamp - first_timestamp) / speed, clock, sleep)
+            set_measurements(temperature, humidity, pressure)
+    return ReplayStats(total, clock() - started)
+
+
+def _wait_until(deadline: float, clock, sleep):
+    delay = deadline - clock()
+    if delay > 0:
+        sleep(delay)
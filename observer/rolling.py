@@ -0,0 +1,166 @@
+import math
+from collections import deque
+
+
+class _Bucket:
+    # Resumen de las muestras de un tramo del tiempo de la ventana
+    __slots__ = ("index", "count", "total", "min", "max", "bins")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bins = {}
+
+
+class RollingWindow:
+    # Estadísticas de los últimos `span` segundos, actualizadas en O(1)
+    # amortizado por muestra y con memoria acotada sin importar la tasa.
+    #
+    # La ventana se parte en `buckets` tramos de span / buckets segundos; cada
+    # tramo guarda su cantidad, suma, mínimo, máximo y un histograma de
+    # resolución `resolution`. Al avanzar el tiempo el tramo más viejo sale
+    # entero, así que el borde de la ventana tiene la precisión de un tramo.
+    #
+    # - promedio: suma y cantidad corrientes (se resta el tramo que sale)
+    # - mín/máx: deques monótonas sobre los tramos cerrados más el tramo actual
+    # - percentiles: histograma agregado de la ventana (error <= resolution / 2)
+    #
+    # Las muestras que llegan con un timestamp anterior al tramo actual se
+    # cuentan en el tramo actual. Las que traen un valor o un timestamp NaN o
+    # infinito (un sensor fallado) se descartan y se cuentan en `rejected`.
+    def __init__(self, span: float, buckets: int = 60, resolution: float = 0.1):
+        if span <= 0 or buckets < 1 or resolution <= 0:
+            raise ValueError("span, buckets y resolution deben ser positivos")
+        self.span = span
+        self._buckets = buckets
+        self._width = span / buckets
+        self._resolution = resolution
+        self._current = None
+        self._closed = deque()
+        self._max_queue = deque()  # (tramo, máximo) con máximos decrecientes
+        self._min_queue = deque()  # (tramo, mínimo) con mínimos crecientes
+        self._count = 0
+        self._total = 0.0
+        self._bins = {}
+        self.rejected = 0
+
+    def add(self, timestamp: float, value: float):
+        if not (math.isfinite(value) and math.isfinite(timestamp)):
+            self.rejected += 1
+            return
+        index = int(timestamp // self._width)
+        current = self._current
+        if current is None or index > current.index:
+            self._advance(index)
+            current = self._current
+        current.count += 1
+        current.total += value
+        if value < current.min:
+            current.min = value
+        if value > current.max:
+            current.max = value
+        key = math.floor(value / self._resolution)
+        current.bins[key] = current.bins.get(key, 0) + 1
+        self._count += 1
+        self._total += value
+        self._bins[key] = self._bins.get(key, 0) + 1
+
+    def _advance(self, index: int):
+        current = self._current
+        if current is not None and current.count:
+            self._closed.append(current)
+            max_queue = self._max_queue
+            while max_queue and max_queue[-1][1] <= current.max:
+                max_queue.pop()
+            max_queue.append((current.index, current.max))
+            min_queue = self._min_queue
+            while min_queue and min_queue[-1][1] >= current.min:
+                min_queue.pop()
+            min_queue.append((current.index, current.min))
+        self._current = _Bucket(index)
+
+        oldest = index - self._buckets
+        closed = self._closed
+        while closed and closed[0].index <= oldest:
+            self._expire(closed.popleft())
+        while self._max_queue and self._max_queue[0][0] <= oldest:
+            self._max_queue.popleft()
+        while self._min_queue and self._min_queue[0][0] <= oldest:
+            self._min_queue.popleft()
+
+    def _expire(self, bucket: _Bucket):
+        self._count -= bucket.count
+        self._total -= bucket.total
+        bins = self._bins
+        for key, count in bucket.bins.items():
+            remaining = bins[key] - count
+            if remaining:
+                bins[key] = remaining
+            else:
+                del bins[key]
+        if not self._count:
+            self._total = 0.0  # descarta el error de redondeo acumulado
+
+    def count(self) -> int:
+        return self._count
+
+    def mean(self) -> float:
+        return self._total / self._count if self._count else math.nan
+
+    def max(self) -> float:
+        current = self._current.max if self._current is not None else -math.inf
+        return max(self._max_queue[0][1], current) if self._max_queue else current
+
+    def min(self) -> float:
+        current = self._current.min if self._current is not None else math.inf
+        return min(self._min_queue[0][1], current) if self._min_queue else current
+
+    def percentiles(self, qs=(50, 95, 99)) -> dict:
+        # Rango más cercano, como metrics.percentiles, sobre el centro de cada
+        # celda del histograma; {} si la ventana está vacía
+        if not self._count:
+            return {}
+        ranks = sorted((max(1, math.ceil(q / 100 * self._count)), q) for q in qs)
+        result = {}
+        seen = 0
+        pending = iter(ranks)
+        rank, q = next(pending)
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            while seen >= rank:
+                result[f"p{q}"] = (key + 0.5) * self._resolution
+                rank, q = next(pending, (math.inf, None))
+            if rank == math.inf:
+                break
+        return {f"p{q}": result[f"p{q}"] for q in qs}
+
+    def snapshot(self, qs=(50, 95, 99)) -> dict:
+        return {
+            "count": self.count(),
+            "avg": self.mean(),
+            "min": self.min(),
+            "max": self.max(),
+            **self.percentiles(qs),
+        }
+
+
+class RollingStatistics:
+    # Varias ventanas (por defecto 1 min, 1 h y 24 h) alimentadas a la vez
+    def __init__(self, spans=(60, 3600, 86400), buckets: int = 60, resolution: float = 0.1):
+        self.windows = {span: RollingWindow(span, buckets, resolution) for span in spans}
+
+    def add(self, timestamp: float, value: float):
+        for window in self.windows.values():
+            window.add(timestamp, value)
+
+    def add_many(self, timestamps, values):
+        for window in self.windows.values():
+            add = window.add
+            for timestamp, value in zip(timestamps, values):
+                add(timestamp, value)
+
+    def snapshot(self, qs=(50, 95, 99)) -> dict:
+        return {span: window.snapshot(qs) for span, window in self.windows.items()}
@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import random
+import struct
+import time
+from multiprocessing import shared_memory
+
+from displays import CurrentConditionsDisplay, ForecastDisplay, StatisticsDisplay
+from output import NullOutput
+from Subject import WeatherData
+
+# Cola de un productor (el hub) y un consumidor (el shard) en memoria
+# compartida: encabezado de 64 bytes y registros fijos
+# (estación, temperatura, humedad, presión, momento de encolado).
+_HEADER = struct.Struct("<qqqddq")  # leídos, escritos, procesados, último lag, lag máximo, errores
+_CONSUMER = struct.Struct("<qddq")  # la parte del encabezado que escribe el worker (desde el byte 16)
+_HEADER_SIZE = 64
+_RECORD = struct.Struct("<qdddd")
+_IDLE_SLEEP = 0.0005
+
+
+def default_displays(weather_data: WeatherData):
+    # Los tres displays de siempre, sin salida por pantalla
+    output = NullOutput()
+    CurrentConditionsDisplay(weather_data, output=output)
+    StatisticsDisplay(weather_data, output=output)
+    ForecastDisplay(weather_data, output=output)
+
+
+class _ShardQueue:
+    def __init__(self, capacity: int, name: str = None):
+        size = _HEADER_SIZE + capacity * _RECORD.size
+        self.capacity = capacity
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            _HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, 0.0, 0.0, 0)
+        else:
+            # Los workers comparten el resource tracker del hub, que es quien
+            # la libera con unlink al cerrar
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.buf = self.shm.buf
+
+    def counters(self) -> tuple:
+        return _HEADER.unpack_from(self.buf, 0)
+
+    def put(self, station_id: int, temperature: float, humidity: float, pressure: float) -> bool:
+        head, tail = struct.unpack_from("<qq", self.buf, 0)
+        if tail - head >= self.capacity:
+            return False
+        _RECORD.pack_into(
+            self.buf, _HEADER_SIZE + (tail % self.capacity) * _RECORD.size,
+            station_id, temperature, humidity, pressure, time.monotonic(),
+        )
+        # El registro queda escrito antes de publicarlo moviendo `tail`
+        struct.pack_into("<q", self.buf, 8, tail + 1)
+        return True
+
+    def close(self, unlink: bool = False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _shard_worker(name: str, capacity: int, display_factory, stop, results):
+    queue = _ShardQueue(capacity, name)
+    buf = queue.buf
+    stations = {}
+    readings = {}
+    errors = {}  # estación -> lecturas cuyo procesamiento lanzó una excepción
+    failed = 0
+    processed = 0
+    max_lag = 0.0
+    try:
+        while True:
+            head, tail = struct.unpack_from("<qq", buf, 0)
+            if head == tail:
+                if stop.is_set():
+                    break
+                time.sleep(_IDLE_SLEEP)
+                continue
+            lag = 0.0
+            first = head
+            while head < tail:
+                station_id, temperature, humidity, pressure, enqueued = _RECORD.unpack_from(
+                    buf, _HEADER_SIZE + (head % capacity) * _RECORD.size
+                )
+                # Un display que falla en una estación no tira abajo el shard
+                try:
+                    weather_data = stations.get(station_id)
+                    if weather_data is None:
+                        weather_data = WeatherData()
+                        display_factory(weather_data)
+                        stations[station_id] = weather_data
+                        readings[station_id] = 0
+                    weather_data.set_measurements(temperature, humidity, pressure)
+                    readings[station_id] += 1
+                except Exception:
+                    errors[station_id] = errors.get(station_id, 0) + 1
+                    failed += 1
+                lag = time.monotonic() - enqueued
+                head += 1
+            processed += head - first
+            max_lag = max(max_lag, lag)
+            # Sólo el worker escribe `head` y sus métricas; `tail` es del hub
+            _CONSUMER.pack_into(buf, 16, processed, lag, max_lag, failed)
+            struct.pack_into("<q", buf, 0, head)
+    finally:
+        results.send((readings, errors))
+        results.close()
+        buf = None
+        queue.close()
+
+
+class StationHub:
+    # Reparte estaciones entre procesos worker: cada estación (por id) vive
+    # siempre en el mismo shard, con su WeatherData y sus displays, y
+    # set_measurements() sólo encola la medición en la cola compartida de ese
+    # shard. Si la cola está llena, set_measurements espera a que haya lugar
+    # (o lanza RuntimeError si el worker de ese shard murió).
+    #
+    # display_factory(weather_data) arma los displays de cada estación nueva
+    # dentro del worker (con spawn tiene que ser una función de módulo).
+    def __init__(self, shards: int = None, capacity: int = 65_536, display_factory=default_displays):
+        self.shards = shards or os.cpu_count() or 1
+        self._capacity = capacity
+        self._display_factory = display_factory
+        self._queues = []
+        self._workers = []
+        self._results = []
+        self._stop = multiprocessing.Event()
+        self._published = 0
+        self._started_at = None
+        self.station_readings = {}  # estación -> lecturas procesadas (al cerrar)
+        self.station_errors = {}  # estación -> lecturas que fallaron (al cerrar)
+
+    def start(self):
+        for _ in range(self.shards):
+            queue = _ShardQueue(self._capacity)
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            worker = multiprocessing.Process(
+                target=_shard_worker,
+                args=(queue.shm.name, self._capacity, self._display_factory, self._stop, sender),
+                daemon=True,
+            )
+            worker.start()
+            sender.close()
+            self._queues.append(queue)
+            self._workers.append(worker)
+            self._results.append(receiver)
+        self._started_at = time.monotonic()
+        return self
+
+    def route(self, station_id: int) -> int:
+        return station_id % self.shards
+
+    def _check_alive(self, shards):
+        # Un worker muerto no vacía su cola: esperarlo sería colgarse
+        for index in shards:
+            worker = self._workers[index]
+            if not worker.is_alive():
+                raise RuntimeError(f"El shard {index} terminó inesperadamente (exitcode {worker.exitcode})")
+
+    def set_measurements(self, station_id: int, temperature: float, humidity: float, pressure: float):
+        index = station_id % self.shards
+        queue = self._queues[index]
+        while not queue.put(station_id, temperature, humidity, pressure):
+            self._check_alive((index,))
+            time.sleep(_IDLE_SLEEP)
+        self._published += 1
+
+    def drain(self, timeout: float = None) -> bool:
+        # Espera a que los workers procesen todo lo publicado
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while sum(queue.counters()[2] for queue in self._queues) < self._published:
+            self._check_alive(range(len(self._workers)))
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(_IDLE_SLEEP)
+        return True
+
+    def metrics(self) -> dict:
+        shards = []
+        processed = 0
+        for index, (queue, worker) in enumerate(zip(self._queues, self._workers)):
+            head, tail, done, lag, max_lag, errors = queue.counters()
+            processed += done
+            shards.append({
+                "shard": index,
+                "alive": worker.is_alive(),
+                "queued": tail - head,
+                "processed": done,
+                "errors": errors,
+                "lag": lag,
+                "max_lag": max_lag,
+            })
+        elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+        return {
+            "published": self._published,
+            "processed": processed,
+            "throughput": processed / elapsed if elapsed else 0.0,
+            "dead_shards": [shard["shard"] for shard in shards if not shard["alive"]],
+            "shards": shards,
+        }
+
+    def close(self):
+        # Procesa lo pendiente, detiene los workers y libera la memoria compartida
+        self._stop.set()
+        for receiver in self._results:
+            try:
+                readings, errors = receiver.recv()
+            except EOFError:
+                pass  # el worker murió sin poder mandar sus resultados
+            else:
+                self.station_readings.update(readings)
+                self.station_errors.update(errors)
+            receiver.close()
+        for worker in self._workers:
+            worker.join()
+        for queue in self._queues:
+            queue.close(unlink=True)
+        self._queues = []
+        self._workers = []
+        self._results = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def synthetic_feed(stations: int, readings: int, seed: int = 0):
+    # Feed local para pruebas: (estación, temperatura, humedad, presión),
+    # intercalando las estaciones como llegarían en vivo
+    rng = random.Random(seed)
+    for i in range(readings):
+        for station_id in range(stations):
+            yield (
+                station_id,
+                round(15 + station_id % 20 + rng.gauss(0, 0.5), 1),
+                rng.randint(30, 90),
+                round(29.9 + rng.gauss(0, 0.05), 2),
+            )
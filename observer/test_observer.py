@@ -0,0 +1,1011 @@
+# test_observer.py
+# Tests for the Observer pattern implementation (weather station)
+
+import asyncio
+import gc
+import math
+import random
+import time
+
+import pytest
+from async_subject import AsyncObserver, AsyncWeatherData, OverflowPolicy
+from clases_base_abstractas import Observer
+from coalescing_subject import CoalescingWeatherData
+from displays import CurrentConditionsDisplay, ForecastDisplay, StatisticsDisplay
+from forecast import FORECASTS, IMPROVING, SAME, ForecastEngine
+from history import MeasurementHistory
+from metrics import percentiles
+from output import BufferedSink
+from parallel_subject import ParallelWeatherData
+from registry import ObserverRegistry
+from replay import MeasurementLog, MeasurementRecorder, replay
+from rolling import RollingStatistics, RollingWindow
+from station_hub import StationHub, synthetic_feed
+from Subject import Measurement, MeasurementBatch, WeatherData
+
+
+class RecordingObserver(Observer):
+    """Pull observer that records what it reads on every update."""
+
+    def __init__(self, weather_data: WeatherData):
+        self.weather_data = weather_data
+        self.readings = []
+        weather_data.register_observer(self)
+
+    def update(self):
+        self.readings.append(
+            (
+                self.weather_data.get_temperature(),
+                self.weather_data.get_humidity(),
+                self.weather_data.get_pressure(),
+            )
+        )
+
+
+class TestWeatherData:
+    """Test the synchronous pull-model subject."""
+
+    def test_notifies_registered_observers(self):
+        """Test that every registered observer pulls the new values."""
+        weather_data = WeatherData()
+        first = RecordingObserver(weather_data)
+        second = RecordingObserver(weather_data)
+        weather_data.set_measurements(26.6, 65, 30.4)
+        assert first.readings == second.readings == [(26.6, 65, 30.4)]
+
+    def test_register_twice_and_remove(self):
+        """Test that registering twice notifies once and removal stops updates."""
+        weather_data = WeatherData()
+        observer = RecordingObserver(weather_data)
+        weather_data.register_observer(observer)
+        weather_data.set_measurements(1, 2, 3)
+        weather_data.remove_observer(observer)
+        weather_data.set_measurements(4, 5, 6)
+        assert observer.readings == [(1, 2, 3)]
+
+    def test_displays(self, capsys):
+        """Test the output of the three displays."""
+        weather_data = WeatherData()
+        CurrentConditionsDisplay(weather_data)
+        StatisticsDisplay(weather_data)
+        ForecastDisplay(weather_data)
+        weather_data.set_measurements(26.6, 65, 30.4)
+        assert capsys.readouterr().out.splitlines() == [
+            "Current conditions: 26.6°C degrees and 65% humidity",
+            "Avg/Max/Min temperature = 26.6/26.6/26.6",
+            "Forecast: Improving weather on the way!",
+        ]
+
+    def test_get_measurement(self):
+        """Test the snapshot getter."""
+        weather_data = WeatherData()
+        weather_data.set_measurements(20.0, 50.0, 29.9)
+        measurement = weather_data.get_measurement()
+        assert isinstance(measurement, Measurement)
+        assert measurement[:3] == (20.0, 50.0, 29.9)
+        assert measurement.timestamp > 0
+
+
+class AsyncRecorder(AsyncObserver):
+    """Async observer that records temperatures, optionally slowly."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.temperatures = []
+
+    async def update(self, measurement):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.temperatures.append(measurement.temperature)
+
+
+class TestAsyncWeatherData:
+    """Test asynchronous observer dispatch."""
+
+    def test_set_measurements_returns_before_updates(self):
+        """Test that set_measurements only enqueues and observers run later."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            observer = AsyncRecorder()
+            weather_data.register_observer(observer)
+            weather_data.set_measurements(20.0, 50, 30.0)
+            assert observer.temperatures == []
+            await weather_data.close()
+            return observer.temperatures
+
+        assert asyncio.run(scenario()) == [20.0]
+
+    def test_slow_observer_does_not_delay_fast_one(self):
+        """Test that observers run concurrently."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            slow, fast = AsyncRecorder(delay=0.05), AsyncRecorder()
+            weather_data.register_observer(slow)
+            weather_data.register_observer(fast)
+            weather_data.set_measurements(20.0, 50, 30.0)
+            await asyncio.sleep(0.01)
+            assert fast.temperatures == [20.0]
+            assert slow.temperatures == []
+            await weather_data.close()
+            assert slow.temperatures == [20.0]
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize(
+        "policy,expected,dropped",
+        [
+            (OverflowPolicy.DROP_OLDEST, [3.0, 4.0], 2),
+            (OverflowPolicy.COALESCE, [1.0, 4.0], 2),
+        ],
+    )
+    def test_overflow_policies(self, policy, expected, dropped):
+        """Test drop-oldest and coalesce on a full queue."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData(maxsize=2, policy=policy)
+            observer = AsyncRecorder()
+            weather_data.register_observer(observer)
+            for temperature in (1.0, 2.0, 3.0, 4.0):
+                weather_data.set_measurements(temperature, 50, 30.0)
+            assert weather_data.dropped()[observer] == dropped
+            await weather_data.close()
+            return observer.temperatures
+
+        assert asyncio.run(scenario()) == expected
+
+    def test_block_policy(self):
+        """Test that publish waits for room and set_measurements refuses to block."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData(maxsize=1, policy=OverflowPolicy.BLOCK)
+            observer = AsyncRecorder(delay=0.001)
+            weather_data.register_observer(observer)
+            for temperature in (1.0, 2.0, 3.0):
+                await weather_data.publish(temperature, 50, 30.0)
+            with pytest.raises(asyncio.QueueFull):
+                weather_data.set_measurements(4.0, 50, 30.0)
+            await weather_data.close()
+            return observer.temperatures
+
+        assert asyncio.run(scenario()) == [1.0, 2.0, 3.0]
+
+    def test_full_block_queue_rejects_the_whole_measurement(self):
+        """Test that a full BLOCK subscriber stops the sample for everyone, before storing it."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            blocking, dropping = AsyncRecorder(), AsyncRecorder()
+            weather_data.register_observer(blocking, maxsize=1, policy=OverflowPolicy.BLOCK)
+            weather_data.register_observer(dropping, policy=OverflowPolicy.DROP_OLDEST)
+            weather_data.set_measurements(1.0, 50, 30.0)
+            with pytest.raises(asyncio.QueueFull):
+                weather_data.set_measurements(2.0, 50, 30.0)
+            with pytest.raises(asyncio.QueueFull):
+                weather_data.set_measurements_batch(MeasurementBatch([3.0], [50], [30.0]))
+            assert weather_data.get_temperature() == 1.0
+            await weather_data.publish(4.0, 50, 30.0)
+            await weather_data.close()
+            return blocking.temperatures, dropping.temperatures
+
+        assert asyncio.run(scenario()) == ([1.0, 4.0], [1.0, 4.0])
+
+    def test_latency_percentiles(self):
+        """Test that dispatch latency is recorded per observer."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            observer = AsyncRecorder()
+            weather_data.register_observer(observer)
+            for temperature in range(10):
+                weather_data.set_measurements(float(temperature), 50, 30.0)
+            await asyncio.sleep(0.01)
+            stats = weather_data.latency_percentiles()[observer]
+            await weather_data.close()
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert set(stats) == {"p50", "p95", "p99"}
+        assert 0 <= stats["p50"] <= stats["p95"] <= stats["p99"]
+
+    def test_failing_update_does_not_stop_the_subscription(self):
+        """Test that an exception in update is counted and later items still arrive."""
+
+        class Flaky(AsyncRecorder):
+            async def update(self, measurement):
+                if measurement.temperature == 2.0:
+                    raise RuntimeError("sensor roto")
+                await super().update(measurement)
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            flaky, healthy = Flaky(), AsyncRecorder()
+            weather_data.register_observer(flaky)
+            weather_data.register_observer(healthy)
+            for temperature in (1.0, 2.0, 3.0):
+                weather_data.set_measurements(temperature, 50, 30.0)
+            await asyncio.sleep(0.01)
+            errors = weather_data.errors()
+            await weather_data.close()
+            return flaky, healthy, errors
+
+        flaky, healthy, errors = asyncio.run(scenario())
+        assert flaky.temperatures == [1.0, 3.0]
+        assert healthy.temperatures == [1.0, 2.0, 3.0]
+        assert errors[flaky] == (1, "RuntimeError('sensor roto')")
+        assert errors[healthy] == (0, None)
+
+    def test_batch_is_queued_per_sample(self):
+        """Test that set_measurements_batch enqueues every sample for async observers."""
+
+        async def scenario():
+            weather_data = AsyncWeatherData()
+            observer = AsyncRecorder()
+            weather_data.register_observer(observer)
+            weather_data.set_measurements_batch(MeasurementBatch([20.0, 21.0, 22.0], [50] * 3, [30.0] * 3))
+            assert observer.temperatures == []
+            await weather_data.close()
+            return observer.temperatures, weather_data.get_temperature()
+
+        assert asyncio.run(scenario()) == ([20.0, 21.0, 22.0], 22.0)
+
+
+def test_percentiles():
+    """Test nearest-rank percentiles."""
+    assert percentiles(range(1, 101)) == {"p50": 50, "p95": 95, "p99": 99}
+    assert percentiles([]) == {}
+
+
+class SleepyObserver(Observer):
+    """Pull observer that sleeps, then returns the temperature it read."""
+
+    def __init__(self, weather_data: WeatherData, delay: float = 0.0, fail: bool = False):
+        self.weather_data = weather_data
+        self.delay = delay
+        self.fail = fail
+        weather_data.register_observer(self)
+
+    def update(self):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("display broken")
+        return self.weather_data.get_temperature()
+
+
+class TestParallelWeatherData:
+    """Test executor-backed parallel dispatch."""
+
+    def test_thread_pool_reports_timeouts(self):
+        """Test that a slow observer times out without delaying the others."""
+        weather_data = ParallelWeatherData("thread", max_workers=4, timeout=0.1)
+        fast = [SleepyObserver(weather_data) for _ in range(3)]
+        slow = SleepyObserver(weather_data, delay=0.5)
+        broken = SleepyObserver(weather_data, fail=True)
+
+        start = time.perf_counter()
+        weather_data.set_measurements(21.5, 60, 30.1)
+        assert time.perf_counter() - start < 0.4
+
+        assert weather_data.last_timed_out == [slow]
+        assert weather_data.timeouts == {slow: 1}
+        assert {weather_data.last_results[o] for o in fast} == {21.5}
+        assert isinstance(weather_data.last_errors[broken], RuntimeError)
+        weather_data.shutdown(wait=False)
+
+    def test_thread_pool_runs_in_parallel(self):
+        """Test that total latency is close to the slowest observer, not the sum."""
+        weather_data = ParallelWeatherData("thread", max_workers=10, timeout=2)
+        for _ in range(10):
+            SleepyObserver(weather_data, delay=0.05)
+        start = time.perf_counter()
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert time.perf_counter() - start < 0.3
+        assert weather_data.last_timed_out == []
+        weather_data.shutdown()
+
+    def test_process_pool(self):
+        """Test process dispatch: observers run on a copy and return their result."""
+        weather_data = ParallelWeatherData("process", max_workers=2, timeout=10)
+        observers = [SleepyObserver(weather_data) for _ in range(3)]
+        weather_data.set_measurements(18.25, 40, 29.0)
+        assert [weather_data.last_results[o] for o in observers] == [18.25] * 3
+        weather_data.shutdown()
+
+    def test_running_observer_is_not_resubmitted(self):
+        """Test that a timed-out update still running is skipped, not queued again."""
+        weather_data = ParallelWeatherData("thread", max_workers=2, timeout=0.05)
+        slow = SleepyObserver(weather_data, delay=0.3)
+        fast = SleepyObserver(weather_data)
+        calls = []
+        slow_update = slow.update
+        slow.update = lambda: calls.append(1) or slow_update()
+
+        weather_data.set_measurements(20.0, 50, 30.0)
+        weather_data.set_measurements(21.0, 50, 30.0)
+        assert weather_data.last_timed_out == [slow]
+        assert weather_data.last_results == {fast: 21.0}
+        assert weather_data.timeouts == {slow: 2}
+        assert len(calls) == 1
+
+        time.sleep(0.35)
+        weather_data.set_measurements(22.0, 50, 30.0)
+        assert len(calls) == 2
+        weather_data.shutdown()
+
+    def test_unstarted_updates_are_cancelled(self):
+        """Test that updates still waiting for a worker at the timeout never run."""
+        weather_data = ParallelWeatherData("thread", max_workers=1, timeout=0.05)
+        first = SleepyObserver(weather_data, delay=0.2)
+        second = SleepyObserver(weather_data, delay=0.2)
+        calls = []
+        second.update = lambda: calls.append(1)
+
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert weather_data.last_timed_out == [first, second]
+        weather_data.shutdown()
+        assert calls == []
+
+    def test_batch_notifies_in_parallel_per_sample(self):
+        """Test that each sample of a batch goes through the executor."""
+        weather_data = ParallelWeatherData("thread", max_workers=2, timeout=1)
+        observers = [SleepyObserver(weather_data) for _ in range(2)]
+        seen = []
+        observers[0].update = lambda: seen.append(weather_data.get_temperature())
+        weather_data.set_measurements_batch(MeasurementBatch([20.0, 21.0, 22.0], [50] * 3, [30.0] * 3))
+        assert seen == [20.0, 21.0, 22.0]
+        assert weather_data.last_results[observers[1]] == 22.0
+        weather_data.shutdown()
+
+    def test_process_pool_with_history_attached(self):
+        """Test that process-local state (history, filter, stats) is not sent to the workers."""
+        weather_data = ParallelWeatherData("process", max_workers=2, timeout=10)
+        weather_data.attach_history(MeasurementHistory(capacity=8))
+        observers = [SleepyObserver(weather_data) for _ in range(2)]
+        weather_data.set_measurements(18.25, 40, 29.0)
+        assert weather_data.last_errors == {}
+        assert [weather_data.last_results[o] for o in observers] == [18.25] * 2
+        assert list(weather_data.get_history().last(1).temperature) == [18.25]
+        weather_data.shutdown()
+
+    def test_unknown_executor(self):
+        """Test that only thread and process pools are accepted."""
+        with pytest.raises(ValueError, match="Executor desconocido"):
+            ParallelWeatherData("gpu")
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class WindowObserver(Observer):
+    """Pull observer that records the latest value and the window size."""
+
+    def __init__(self, weather_data):
+        self.weather_data = weather_data
+        self.calls = []
+        weather_data.register_observer(self)
+
+    def update(self):
+        samples = self.weather_data.get_window_samples()
+        self.calls.append((self.weather_data.get_temperature(), [s.temperature for s in samples]))
+
+
+class TestCoalescingWeatherData:
+    """Test coalesced notifications for high-frequency feeds."""
+
+    def test_one_notification_per_time_window(self):
+        """Test that a burst inside the window produces a single update."""
+        clock = FakeClock()
+        weather_data = CoalescingWeatherData(window=0.1, clock=clock)
+        observer = WindowObserver(weather_data)
+        for i in range(25):  # 25 samples at 100 Hz
+            clock.now = i * 0.01
+            weather_data.set_measurements(float(i), 50, 30.0)
+        weather_data.flush()
+        assert [latest for latest, _ in observer.calls] == [9.0, 19.0, 24.0]
+        assert observer.calls[0][1] == [float(i) for i in range(10)]
+        assert observer.calls[-1][1] == [20.0, 21.0, 22.0, 23.0, 24.0]
+
+    def test_count_threshold(self):
+        """Test that max_samples closes a window early."""
+        clock = FakeClock()
+        weather_data = CoalescingWeatherData(window=60, max_samples=3, clock=clock)
+        observer = WindowObserver(weather_data)
+        for i in range(7):
+            weather_data.set_measurements(float(i), 50, 30.0)
+        assert [samples for _, samples in observer.calls] == [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+        weather_data.flush()
+        weather_data.flush()  # nothing pending: no extra update
+        assert observer.calls[-1] == (6.0, [6.0])
+        assert len(observer.calls) == 3
+
+    def test_existing_displays_work_unchanged(self, capsys):
+        """Test that pull displays see the latest value of each window."""
+        weather_data = CoalescingWeatherData(window=60, max_samples=2)
+        CurrentConditionsDisplay(weather_data)
+        weather_data.set_measurements(20.0, 50, 30.0)
+        weather_data.set_measurements(21.0, 55, 30.0)
+        assert capsys.readouterr().out == "Current conditions: 21.0°C degrees and 55% humidity\n"
+
+    def test_batch_is_delivered_as_windows(self):
+        """Test that a batch closes the pending window and is coalesced by max_samples."""
+        weather_data = CoalescingWeatherData(window=60, max_samples=3, clock=FakeClock())
+        observer = WindowObserver(weather_data)
+        weather_data.set_measurements(1.0, 50, 30.0)
+        weather_data.set_measurements_batch(MeasurementBatch([2.0, 3.0, 4.0, 5.0], [50] * 4, [30.0] * 4))
+        assert observer.calls == [(1.0, [1.0]), (4.0, [2.0, 3.0, 4.0]), (5.0, [5.0])]
+
+
+class TestBatchDelivery:
+    """Test the push-mode update_batch channel."""
+
+    def test_batch_columns_and_rows(self):
+        """Test that a batch stores array columns and iterates as measurements."""
+        batch = MeasurementBatch([20.0, 21.0], [50, 55], [30.0, 30.1], [1.0, 2.0])
+        assert len(batch) == 2
+        assert batch.temperature.typecode == "d"
+        assert list(batch) == [Measurement(20.0, 50.0, 30.0, 1.0), Measurement(21.0, 55.0, 30.1, 2.0)]
+        with pytest.raises(ValueError):
+            MeasurementBatch([20.0], [50, 55], [30.0])
+
+    def test_pull_observers_see_every_sample(self):
+        """Test that pull observers get one update() per sample in the batch."""
+        weather_data = WeatherData()
+        observer = RecordingObserver(weather_data)
+        weather_data.set_measurements_batch(MeasurementBatch([20.0, 21.0, 22.0], [50, 51, 52], [30.0] * 3))
+        assert observer.readings == [(20.0, 50.0, 30.0), (21.0, 51.0, 30.0), (22.0, 52.0, 30.0)]
+        assert weather_data.get_temperature() == 22.0
+
+    def test_statistics_display_matches_per_sample(self, capsys):
+        """Test that one update_batch call gives the same statistics as per-sample updates."""
+        temperatures = [20 + (i % 13) * 0.37 for i in range(5_000)]
+        per_sample = StatisticsDisplay(WeatherData())
+        for temperature in temperatures:
+            per_sample._weather_data.set_measurements(temperature, 50, 30.0)
+        capsys.readouterr()
+
+        weather_data = WeatherData()
+        batched = StatisticsDisplay(weather_data)
+        n = len(temperatures)
+        weather_data.set_measurements_batch(MeasurementBatch(temperatures, [50] * n, [30.0] * n))
+        out = capsys.readouterr().out
+        assert out.count("Avg/Max/Min") == 1
+        assert (batched._temp_sum, batched._num_readings, batched._max_temp, batched._min_temp) == (
+            per_sample._temp_sum,
+            per_sample._num_readings,
+            per_sample._max_temp,
+            per_sample._min_temp,
+        )
+
+
+class TestObserverRegistry:
+    """Test the ordered O(1) observer registry."""
+
+    def test_keeps_registration_order_without_duplicates(self):
+        """Test that the registry is ordered and ignores repeated registrations."""
+        registry = ObserverRegistry()
+        a, b, c = object(), object(), object()
+        assert registry.add(a) and registry.add(b) and registry.add(c)
+        assert not registry.add(b)
+        assert list(registry) == [a, b, c]
+        assert registry.discard(b) and not registry.discard(b)
+        assert b not in registry and a in registry
+        assert list(registry) == [a, c]
+
+    def test_mutation_during_notify(self):
+        """Test that observers removed or added inside update() apply from the next notification."""
+        weather_data = WeatherData()
+        calls = []
+
+        class SelfRemoving(Observer):
+            def update(self):
+                calls.append("removing")
+                weather_data.remove_observer(self)
+                weather_data.register_observer(late)
+
+        class Late(Observer):
+            def update(self):
+                calls.append("late")
+
+        late = Late()
+        weather_data.register_observer(SelfRemoving())
+        recorder = RecordingObserver(weather_data)
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert calls == ["removing"]
+        assert len(recorder.readings) == 1
+        weather_data.set_measurements(21.0, 50, 30.0)
+        assert calls == ["removing", "late"]
+
+    def test_weak_observers_unsubscribe_when_dropped(self):
+        """Test that a display nobody references stops being notified."""
+        weather_data = WeatherData(weak_observers=True)
+        kept = RecordingObserver(weather_data)
+        RecordingObserver(weather_data)
+        gc.collect()
+        assert len(weather_data._observers) == 1
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert kept.readings == [(20.0, 50, 30.0)]
+
+    def test_dropped_weak_observers_leave_no_stale_state(self):
+        """Test that filter and instrumentation state of a freed observer is cleared."""
+        weather_data = WeatherData(weak_observers=True, change_filter=True)
+        stats = weather_data.enable_instrumentation()
+        kept = RecordingObserver(weather_data)
+        dropped = RecordingObserver(weather_data)
+        dropped.interests = {"temperature": 0.0}
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert id(dropped) in weather_data._delivered
+        key = id(dropped)
+        del dropped
+        gc.collect()
+        assert key not in weather_data._delivered
+        assert list(stats.snapshot()) == [f"RecordingObserver@{id(kept):x}"]
+
+
+class TestRollingStatistics:
+    """Test the incremental rolling-window statistics engine."""
+
+    def test_matches_brute_force(self):
+        """Test count/avg/min/max exactly and percentiles within half a resolution step."""
+        rng = random.Random(7)
+        window = RollingWindow(span=60, buckets=12, resolution=0.1)
+        history = []
+        t = 0.0
+        for _ in range(3_000):
+            t += rng.expovariate(10)
+            value = 20 + rng.gauss(0, 3)
+            window.add(t, value)
+            history.append((t, value))
+            oldest = int(t // 5) - 12  # bucket index that just left the window
+            live = [v for ts, v in history if int(ts // 5) > oldest]
+            assert window.count() == len(live)
+            assert window.max() == max(live) and window.min() == min(live)
+        assert window.mean() == pytest.approx(sum(live) / len(live))
+        exact = percentiles(live)
+        for name, value in window.percentiles().items():
+            assert abs(value - exact[name]) <= 0.05 + 1e-9
+
+    def test_memory_is_bounded(self):
+        """Test that old buckets expire and the histogram only holds live values."""
+        window = RollingWindow(span=10, buckets=10, resolution=1)
+        for i in range(10_000):
+            window.add(i * 0.01, i % 3)
+        assert len(window._closed) <= 10
+        assert set(window._bins) == {0, 1, 2}
+        window.add(1_000.0, 50.0)  # a long gap empties the window
+        assert window.snapshot(qs=(50,)) == {"count": 1, "avg": 50.0, "min": 50.0, "max": 50.0, "p50": 50.5}
+
+    def test_non_finite_samples_are_rejected(self):
+        """Test that NaN/inf values or timestamps are counted and left out of the statistics."""
+        window = RollingWindow(span=60, buckets=6, resolution=1)
+        window.add(0.0, 20.0)
+        for timestamp, value in ((1.0, math.nan), (2.0, math.inf), (3.0, -math.inf), (math.nan, 21.0), (math.inf, 21.0)):
+            window.add(timestamp, value)
+        window.add(4.0, 22.0)
+        assert window.rejected == 5
+        assert window.snapshot(qs=(50,)) == {"count": 2, "avg": 21.0, "min": 20.0, "max": 22.0, "p50": 20.5}
+
+    def test_statistics_display_with_only_failed_readings(self, capsys):
+        """Test that an empty window (NaN readings only) prints N/A instead of failing."""
+        weather_data = WeatherData()
+        StatisticsDisplay(weather_data, windows=(60,))
+        weather_data.set_measurements(math.nan, 50, 30.0)
+        assert capsys.readouterr().out.splitlines()[1] == "  Last 60s: Avg/Max/Min/p95 temperature = N/A"
+        weather_data.set_measurements(20.0, 50, 30.0)
+        assert capsys.readouterr().out.splitlines()[1] == "  Last 60s: Avg/Max/Min/p95 temperature = 20.00/20.0/20.0/20.05"
+
+    def test_statistics_display_windows(self, capsys):
+        """Test that StatisticsDisplay reports every configured window."""
+        weather_data = WeatherData()
+        display = StatisticsDisplay(weather_data, windows=(60, 3600))
+        rolling = RollingStatistics((60, 3600))
+        batch = MeasurementBatch([20.0, 25.0, 22.0], [50] * 3, [30.0] * 3, [0.0, 1.0, 2.0])
+        weather_data.set_measurements_batch(batch)
+        rolling.add_many(batch.timestamp, batch.temperature)
+        assert display.get_rolling_statistics() == rolling.snapshot()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1:] == [
+            "  Last 60s: Avg/Max/Min/p95 temperature = 22.33/25.0/20.0/25.05",
+            "  Last 3600s: Avg/Max/Min/p95 temperature = 22.33/25.0/20.0/25.05",
+        ]
+
+
+class TestMeasurementHistory:
+    """Test the ring-buffer measurement history."""
+
+    def test_last_and_since_across_wraparound(self):
+        """Test range queries after the ring has wrapped several times."""
+        history = MeasurementHistory(capacity=8)
+        for i in range(21):
+            history.append(float(i), 50.0, 30.0, timestamp=float(i))
+        assert len(history) == 8 and history.total() == 21
+        assert list(history.last(5).temperature) == [16.0, 17.0, 18.0, 19.0, 20.0]
+        assert list(history.last(100).temperature) == [float(i) for i in range(13, 21)]
+        assert list(history.since(17.5).timestamp) == [18.0, 19.0, 20.0]
+        assert len(history.since(100.0)) == 0
+        assert list(history.last(2)) == [Measurement(19.0, 50.0, 30.0, 19.0), Measurement(20.0, 50.0, 30.0, 20.0)]
+
+    def test_views_are_zero_copy(self):
+        """Test that views share memory with the ring and see later writes."""
+        history = MeasurementHistory(capacity=4)
+        for i in range(4):
+            history.append(float(i), 50.0, 30.0, float(i))
+        view = history.last(4)
+        assert isinstance(view.temperature, memoryview)
+        copy = view.to_batch()
+        history.append(99.0, 50.0, 30.0, 4.0)
+        assert view.temperature[0] == 99.0  # the oldest slot was overwritten in place
+        assert list(copy.temperature) == [0.0, 1.0, 2.0, 3.0]
+
+    def test_weather_data_records_single_and_batch(self):
+        """Test that WeatherData records both delivery paths in order."""
+        weather_data = WeatherData()
+        weather_data.attach_history(MeasurementHistory(capacity=5))
+        weather_data.set_measurements(1.0, 50, 30.0)
+        weather_data.set_measurements_batch(MeasurementBatch([2.0, 3.0, 4.0, 5.0, 6.0], [50] * 5, [30.0] * 5))
+        assert list(weather_data.get_history().last(5).temperature) == [2.0, 3.0, 4.0, 5.0, 6.0]
+        coalescing = CoalescingWeatherData(window=60)
+        coalescing.attach_history(MeasurementHistory(capacity=5))
+        coalescing.set_measurements(7.0, 50, 30.0)
+        assert list(coalescing.get_history().last(1).temperature) == [7.0]
+
+    def test_spill_file_survives_reopen(self, tmp_path):
+        """Test that a memory-mapped history is restored when reopened."""
+        path = str(tmp_path / "history.bin")
+        history = MeasurementHistory(capacity=4, spill_path=path)
+        history.extend(MeasurementBatch([1.0, 2.0, 3.0, 4.0, 5.0, 6.0], [50] * 6, [30.0] * 6, range(6)))
+        history.close()
+        reopened = MeasurementHistory(capacity=4, spill_path=path)
+        assert reopened.total() == 6
+        assert list(reopened.last(4).temperature) == [3.0, 4.0, 5.0, 6.0]
+        with pytest.raises(ValueError):
+            MeasurementHistory(capacity=8, spill_path=path)
+
+
+class TestReplay:
+    """Test the binary measurement log and the replay driver."""
+
+    def record(self, path, n=10):
+        weather_data = WeatherData()
+        recorder = MeasurementRecorder(weather_data, path)
+        weather_data.set_measurements_batch(
+            MeasurementBatch([20.0 + i for i in range(n)], [50] * n, [30.0 - i / 10 for i in range(n)], [i * 2.0 for i in range(n)])
+        )
+        recorder.close()
+
+    def test_round_trip_ignores_torn_tail(self, tmp_path):
+        """Test that records read back intact and a partial last record is skipped."""
+        path = str(tmp_path / "station.log")
+        self.record(path, n=3)
+        weather_data = WeatherData()
+        recorder = MeasurementRecorder(weather_data, path)  # appends to the same log
+        weather_data.set_measurements(99.0, 40, 29.0)
+        recorder.close()
+        with open(path, "ab") as f:
+            f.write(b"\0" * 7)
+        with MeasurementLog(path) as log:
+            assert len(log) == 4
+            rows = list(log.batch())
+        assert rows[:2] == [Measurement(20.0, 50.0, 30.0, 0.0), Measurement(21.0, 50.0, 29.9, 2.0)]
+        assert rows[3][:3] == (99.0, 40.0, 29.0)
+
+    def test_append_after_crash_drops_torn_tail(self, tmp_path):
+        """Test that reopening a log with a partial last record keeps new records aligned."""
+        path = str(tmp_path / "station.log")
+        self.record(path, n=3)
+        with open(path, "ab") as f:
+            f.write(b"\xff" * 12)  # crash in the middle of a record
+        weather_data = WeatherData()
+        recorder = MeasurementRecorder(weather_data, path)
+        weather_data.set_measurements(99.0, 40, 29.0)
+        recorder.close()
+        with MeasurementLog(path) as log:
+            rows = list(log.batch())
+        assert len(rows) == 4
+        assert rows[2] == Measurement(22.0, 50.0, 29.8, 4.0)
+        assert rows[3][:3] == (99.0, 40.0, 29.0)
+
+    def test_recorder_refuses_foreign_files(self, tmp_path):
+        """Test that the recorder does not append to a file that is not a measurement log."""
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"not a measurement log")
+        with pytest.raises(ValueError, match="No es un log"):
+            MeasurementRecorder(WeatherData(), str(path))
+        assert path.read_bytes() == b"not a measurement log"
+
+    def test_replay_feeds_displays_at_max_speed(self, tmp_path, capsys):
+        """Test that a replay drives the existing displays like live data."""
+        path = str(tmp_path / "station.log")
+        self.record(path)
+        weather_data = WeatherData()
+        ForecastDisplay(weather_data)
+        with MeasurementLog(path) as log:
+            stats = replay(log, weather_data)
+        assert stats.samples == 10 and stats.samples_per_second > 0
+        assert capsys.readouterr().out.count("Watch out for cooler, rainy weather") == 9
+
+    def test_scaled_real_time_and_batches(self, tmp_path):
+        """Test pacing with a fake clock and that batches keep recorded timestamps."""
+        path = str(tmp_path / "station.log")
+        self.record(path)
+        clock = FakeClock()
+        sleeps = []
+
+        def sleep(delay):
+            sleeps.append(delay)
+            clock.now += delay
+
+        weather_data = WeatherData()
+        weather_data.attach_history(MeasurementHistory(capacity=16))
+        with MeasurementLog(path) as log:
+            stats = replay(log, weather_data, speed=4, batch_size=5, clock=clock, sleep=sleep)
+        assert sleeps == [2.5]  # second batch starts 10 s in, at 4x
+        assert stats.seconds == 2.5
+        assert list(weather_data.get_history().last(10).timestamp) == [i * 2.0 for i in range(10)]
+
+
+class TestChangeFilter:
+    """Test interest fields and dead bands on WeatherData."""
+
+    def test_disabled_by_default(self, capsys):
+        """Test that without change_filter every display is notified as before."""
+        weather_data = WeatherData()
+        ForecastDisplay(weather_data)
+        weather_data.set_measurements(20.0, 50, 30.0)
+        weather_data.set_measurements(21.0, 50, 30.0)
+        assert capsys.readouterr().out.count("Forecast:") == 2
+        assert weather_data.skipped_notifications == 0
+
+    def test_skips_uninteresting_changes(self, capsys):
+        """Test that displays only fire when one of their fields changes."""
+        weather_data = WeatherData(change_filter=True)
+        CurrentConditionsDisplay(weather_data)
+        ForecastDisplay(weather_data)
+        statistics = StatisticsDisplay(weather_data)
+        weather_data.set_measurements(20.0, 50, 30.0)  # first reading reaches everyone
+        weather_data.set_measurements(20.0, 50, 29.9)  # only pressure moved
+        weather_data.set_measurements(21.0, 50, 29.9)  # only temperature moved
+        out = capsys.readouterr().out
+        assert out.count("Current conditions:") == 2
+        # the forecast has no interests: unchanged pressure still means "More of the same"
+        assert out.count("Forecast:") == 3
+        assert out.splitlines()[-2] == "Forecast: More of the same"
+        assert statistics._num_readings == 3  # no interests: sees every reading
+        assert weather_data.skipped_notifications == 1
+
+    def test_dead_band_accumulates_from_last_delivery(self):
+        """Test that small drifts eventually cross the dead band."""
+        weather_data = WeatherData(change_filter=True)
+        observer = RecordingObserver(weather_data)
+        observer.interests = {"temperature": 0.25}
+        for temperature in (20.0, 20.1, 20.2, 20.3, 20.4, 20.5, 20.6):
+            weather_data.set_measurements(temperature, 50, 30.0)
+        assert [reading[0] for reading in observer.readings] == [20.0, 20.3, 20.6]
+
+    def test_rejects_unknown_fields(self):
+        """Test that a typo in interests fails at registration."""
+        observer = RecordingObserver(WeatherData())
+        observer.interests = {"presure": 0.1}
+        with pytest.raises(ValueError):
+            WeatherData(change_filter=True).register_observer(observer)
+
+
+class TestBufferedOutput:
+    """Test the buffered, rate-limited display sink."""
+
+    def test_same_output_off_the_notification_path(self, capsys):
+        """Test that buffered displays print the same lines, in order, once flushed."""
+        weather_data = WeatherData()
+        CurrentConditionsDisplay(weather_data)
+        ForecastDisplay(weather_data)
+        weather_data.set_measurements(20.0, 50, 30.0)
+        weather_data.set_measurements(21.0, 55, 29.0)
+        expected = capsys.readouterr().out
+
+        weather_data = WeatherData()
+        with BufferedSink(flush_interval=3600) as sink:
+            CurrentConditionsDisplay(weather_data, output=sink)
+            ForecastDisplay(weather_data, output=sink)
+            weather_data.set_measurements(20.0, 50, 30.0)
+            weather_data.set_measurements(21.0, 55, 29.0)
+            assert capsys.readouterr().out == ""  # nothing written during notify
+        assert capsys.readouterr().out == expected
+
+    def test_rate_limit_keeps_latest_redraw(self, capsys):
+        """Test that a display redraws at most max_rate times per second, showing its last state."""
+        clock = FakeClock()
+        weather_data = WeatherData()
+        sink = BufferedSink(max_rate=2, flush_interval=3600, clock=clock)
+        CurrentConditionsDisplay(weather_data, output=sink)
+        for i in range(5):
+            weather_data.set_measurements(20.0 + i, 50, 30.0)
+        sink.flush()
+        clock.now = 0.2
+        weather_data.set_measurements(30.0, 50, 30.0)
+        sink.flush()  # too soon: stays pending
+        clock.now = 0.6
+        sink.flush()
+        sink.close()
+        assert capsys.readouterr().out.splitlines() == [
+            "Current conditions: 24.0°C degrees and 50% humidity",
+            "Current conditions: 30.0°C degrees and 50% humidity",
+        ]
+        assert sink.dropped == 4
+
+
+class FreezingDisplay(Observer):
+    """Pull observer that fails on readings below zero."""
+
+    def __init__(self, weather_data):
+        self.weather_data = weather_data
+        weather_data.register_observer(self)
+
+    def update(self):
+        if self.weather_data.get_temperature() < 0:
+            raise RuntimeError("sensor congelado")
+
+
+class TestStationHub:
+    """Test the multi-process station hub."""
+
+    def test_routes_every_reading_to_its_shard(self):
+        """Test that all readings are processed, each station staying on one shard."""
+        feed = list(synthetic_feed(stations=30, readings=20))
+        with StationHub(shards=2, capacity=32) as hub:  # small queues force wraparound and backpressure
+            for reading in feed:
+                hub.set_measurements(*reading)
+            assert hub.drain(timeout=30)
+            metrics = hub.metrics()
+        assert metrics["published"] == metrics["processed"] == 600
+        assert [shard["processed"] for shard in metrics["shards"]] == [300, 300]
+        assert all(shard["queued"] == 0 for shard in metrics["shards"])
+        assert hub.station_readings == {station: 20 for station in range(30)}
+        assert hub.route(7) == 1
+
+    def test_failing_station_does_not_stop_its_shard(self):
+        """Test that an exception in one station's displays is counted per station."""
+        with StationHub(shards=1, capacity=16, display_factory=FreezingDisplay) as hub:
+            for station_id, temperature in ((0, 20.0), (1, -5.0), (0, 21.0), (1, 3.0)):
+                hub.set_measurements(station_id, temperature, 50, 30.0)
+            assert hub.drain(timeout=30)
+            metrics = hub.metrics()
+        assert metrics["processed"] == 4
+        assert metrics["shards"][0]["errors"] == 1
+        assert hub.station_readings == {0: 2, 1: 1}
+        assert hub.station_errors == {1: 1}
+
+    def test_dead_shard_is_reported_instead_of_hanging(self):
+        """Test that set_measurements and drain raise once a worker has died."""
+        hub = StationHub(shards=2, capacity=4).start()
+        try:
+            hub._workers[1].kill()
+            hub._workers[1].join()
+            assert hub.metrics()["dead_shards"] == [1]
+            with pytest.raises(RuntimeError, match="shard 1"):
+                for _ in range(5):
+                    hub.set_measurements(1, 20.0, 50, 30.0)
+            with pytest.raises(RuntimeError, match="shard 1"):
+                hub.drain(timeout=30)
+        finally:
+            hub.close()
+
+
+class TestForecastEngine:
+    """Test the array-at-a-time forecast engine against ForecastDisplay."""
+
+    def per_update_forecasts(self, pressures, capsys):
+        weather_data = WeatherData()
+        ForecastDisplay(weather_data)
+        capsys.readouterr()
+        for pressure in pressures:
+            weather_data.set_measurements(20.0, 50, pressure)
+        return [line[len("Forecast: "):] for line in capsys.readouterr().out.split("\n")[:-1]]
+
+    def test_matches_per_update_logic(self, capsys):
+        """Test identical forecasts, including repeats, the default start and NaN."""
+        rng = random.Random(3)
+        pressures = [29.92] + [round(29.9 + rng.gauss(0, 0.02), 2) for _ in range(2_000)]
+        pressures[500] = pressures[1_000] = float("nan")
+        assert ForecastEngine().forecasts(pressures) == self.per_update_forecasts(pressures, capsys)
+
+    def test_chunks_match_whole_series(self):
+        """Test that the engine carries its state across calls."""
+        rng = random.Random(5)
+        pressures = [round(29.9 + rng.gauss(0, 0.02), 2) for _ in range(1_000)]
+        for make in (ForecastEngine, lambda: ForecastEngine(ema_alpha=0.2, threshold=0.001)):
+            whole = make().trends(pressures)
+            engine = make()
+            chunked = engine.trends(pressures[:300]) + engine.trends(pressures[300:])
+            assert chunked == whole
+
+    def test_ema_slope_ignores_noise(self):
+        """Test that the smoothed mode follows the trend instead of the noise."""
+        rng = random.Random(9)
+        rising = [29.5 + i * 0.001 + rng.gauss(0, 0.01) for i in range(500)]
+        raw = ForecastEngine(initial_pressure=29.5).trends(rising)
+        smoothed = ForecastEngine(initial_pressure=29.5, ema_alpha=0.05, threshold=0.0002).trends(rising)
+        assert raw.count(IMPROVING) < 300  # raw differences flip with the noise
+        assert smoothed[100:].count(IMPROVING) > 350
+        assert set(ForecastEngine(ema_alpha=0.5).trends([29.92] * 10)) == {SAME}
+
+    def test_display_batch_shows_last_forecast(self, capsys):
+        """Test that ForecastDisplay.update_batch prints the forecast of the last sample."""
+        pressures = [30.0, 29.5, 29.5]
+        weather_data = WeatherData()
+        ForecastDisplay(weather_data)
+        weather_data.set_measurements_batch(MeasurementBatch([20.0] * 3, [50] * 3, pressures))
+        assert capsys.readouterr().out == f"Forecast: {FORECASTS[SAME]}\n"
+
+
+class TestInstrumentation:
+    """Test per-observer notification metrics on WeatherData."""
+
+    class Failing(Observer):
+        def update(self):
+            raise RuntimeError("sensor display broke")
+
+    def test_counts_latency_and_isolates_errors(self):
+        """Test that a failing observer is counted and does not stop the others."""
+        weather_data = WeatherData()
+        failing = self.Failing()
+        weather_data.register_observer(failing)
+        recorder = RecordingObserver(weather_data)
+        stats = weather_data.enable_instrumentation()
+        for i in range(3):
+            weather_data.set_measurements(20.0 + i, 50, 30.0)
+        assert len(recorder.readings) == 3
+        snapshot = stats.snapshot()
+        failing_stats = snapshot[f"Failing@{id(failing):x}"]
+        assert failing_stats["calls"] == failing_stats["errors"] == 3
+        assert failing_stats["last_error"] == "RuntimeError('sensor display broke')"
+        recorder_stats = snapshot[f"RecordingObserver@{id(recorder):x}"]
+        assert recorder_stats["errors"] == 0
+        assert 0 < recorder_stats["p50"] <= recorder_stats["p99"] <= recorder_stats["total_seconds"]
+
+    def test_unsupported_on_pool_and_async_subjects(self):
+        """Test that subjects dispatching outside _deliver refuse instead of returning empty stats."""
+        parallel = ParallelWeatherData("thread")
+        with pytest.raises(NotImplementedError):
+            parallel.enable_instrumentation()
+        parallel.shutdown()
+        with pytest.raises(NotImplementedError):
+            AsyncWeatherData().enable_instrumentation()
+        assert parallel.get_instrumentation() is None
+
+    def test_disabled_by_default_and_errors_propagate(self):
+        """Test that without instrumentation the original behavior is kept."""
+        weather_data = WeatherData()
+        weather_data.register_observer(self.Failing())
+        assert weather_data.get_instrumentation() is None
+        with pytest.raises(RuntimeError):
+            weather_data.set_measurements(20.0, 50, 30.0)
+
+    def test_prometheus_text(self):
+        """Test the Prometheus exposition output."""
+        clock = FakeClock()
+        weather_data = WeatherData()
+        recorder = RecordingObserver(weather_data)
+        stats = weather_data.enable_instrumentation()
+        stats._clock = clock
+        original = recorder.update
+
+        def slow_update():
+            clock.now += 0.5
+            original()
+
+        recorder.update = slow_update
+        weather_data.set_measurements_batch(MeasurementBatch([20.0, 21.0], [50] * 2, [30.0] * 2))
+        name = f"RecordingObserver@{id(recorder):x}"
+        text = stats.to_prometheus(qs=(50,))
+        assert f'weather_observer_calls_total{{observer="{name}"}} 2' in text
+        assert f'weather_observer_errors_total{{observer="{name}"}} 0' in text
+        assert f'weather_observer_update_seconds{{observer="{name}",quantile="0.5"}} 0.5' in text
+        assert f'weather_observer_update_seconds_sum{{observer="{name}"}} 1.0' in text
+        assert "# TYPE weather_observer_update_seconds summary" in text